@@ -0,0 +1,169 @@
+"""
+Live investigation events - fan-out Redis pub/sub -> clients SSE / WebSocket
+Un seul abonnement Redis par nœud API (EventHub) : chaque canal n'est suivi
+qu'une fois, quel que soit le nombre de clients connectés, puis redistribué
+aux files locales des clients.
+"""
+import os
+import json
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+from tasks.progress import REDIS_URL, TERMINAL_STATUSES, channel_name, history_key
+
+logger = logging.getLogger(__name__)
+
+# Événements en attente par client : un client trop lent perd des événements
+# (il peut les rattraper en se reconnectant avec Last-Event-ID)
+CLIENT_QUEUE_SIZE = int(os.getenv('EVENT_CLIENT_QUEUE_SIZE', 1000))
+
+# Intervalle des keep-alive envoyés aux clients
+HEARTBEAT_INTERVAL = 15
+
+
+class EventHub:
+    """Abonnements Redis partagés par tous les clients du process"""
+
+    def __init__(self, redis_url: str = REDIS_URL):
+        import redis.asyncio as aioredis
+
+        self._redis = aioredis.from_url(redis_url)
+        self._pubsub = None
+        self._queues: Dict[str, Set[asyncio.Queue]] = {}
+        self._reader: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def subscribe(self, investigation_id: str) -> AsyncIterator[asyncio.Queue]:
+        """File recevant les événements publiés pour une investigation"""
+        channel = channel_name(investigation_id)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+
+        async with self._lock:
+            if self._pubsub is None:
+                self._pubsub = self._redis.pubsub()
+            subscribers = self._queues.setdefault(channel, set())
+            if not subscribers:
+                await self._pubsub.subscribe(channel)
+            subscribers.add(queue)
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read())
+
+        try:
+            yield queue
+        finally:
+            async with self._lock:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._queues[channel]
+                    await self._pubsub.unsubscribe(channel)
+
+    async def _read(self):
+        """Distribue les messages Redis aux files des clients"""
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️  Redis pub/sub error: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            if message is None:
+                continue
+
+            channel = message['channel']
+            if isinstance(channel, bytes):
+                channel = channel.decode('utf-8')
+
+            for queue in list(self._queues.get(channel, ())):
+                try:
+                    queue.put_nowait(message['data'])
+                except asyncio.QueueFull:
+                    pass
+
+    async def history(self, investigation_id: str) -> list:
+        """Événements déjà publiés (historique court)"""
+        return await self._redis.lrange(history_key(investigation_id), 0, -1)
+
+    async def close(self):
+        if self._reader is not None:
+            self._reader.cancel()
+        if self._pubsub is not None:
+            await self._pubsub.close()
+        await self._redis.close()
+
+
+_hub: Optional[EventHub] = None
+
+
+def get_event_hub() -> EventHub:
+    global _hub
+    if _hub is None:
+        _hub = EventHub()
+    return _hub
+
+
+async def close_event_hub():
+    global _hub
+    if _hub is not None:
+        await _hub.close()
+        _hub = None
+
+
+def _decode(payload: Any) -> Dict[str, Any]:
+    if isinstance(payload, bytes):
+        payload = payload.decode('utf-8')
+    return json.loads(payload)
+
+
+def _is_terminal(event: Dict[str, Any]) -> bool:
+    return event.get('type') == 'status' and event.get('status') in TERMINAL_STATUSES
+
+
+async def investigation_events(investigation_id: str, last_seq: int = 0,
+                               heartbeat: float = HEARTBEAT_INTERVAL) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """
+    Événements d'une investigation : historique puis flux en direct
+
+    L'abonnement est pris avant la lecture de l'historique : aucun événement
+    n'est perdu entre les deux, les doublons sont écartés par numéro de séquence.
+    Le flux se termine sur un statut final (completed / failed).
+
+    Args:
+        investigation_id: Investigation suivie
+        last_seq: Dernier événement déjà reçu par le client (Last-Event-ID)
+        heartbeat: Délai sans événement après lequel None est produit (keep-alive)
+
+    Yields:
+        Événements (dict), ou None pour un keep-alive
+    """
+    hub = get_event_hub()
+
+    async with hub.subscribe(investigation_id) as queue:
+        for payload in await hub.history(investigation_id):
+            event = _decode(payload)
+            if event['seq'] <= last_seq:
+                continue
+            last_seq = event['seq']
+            yield event
+            if _is_terminal(event):
+                return
+
+        while True:
+            try:
+                payload = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+
+            event = _decode(payload)
+            if event['seq'] <= last_seq:
+                continue
+            last_seq = event['seq']
+            yield event
+            if _is_terminal(event):
+                return
@@ -0,0 +1,62 @@
+"""
+OSINT Platform HTTP API
+Lancement : uvicorn api.main:app --host 0.0.0.0 --port 8000 --workers 4
+"""
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.types import Receive, Scope, Send
+
+from api.events import close_event_hub
+from api.routes import investigations, events
+from config import settings
+from models.database import get_async_engine
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pool async ouvert au démarrage, fermé proprement à l'arrêt
+    get_async_engine()
+    yield
+    await close_event_hub()
+    await get_async_engine().dispose()
+
+
+class JSONGZipMiddleware(GZipMiddleware):
+    """
+    GZip des réponses, sauf les flux SSE (text/event-stream) : compressés,
+    les événements resteraient dans le tampon gzip au lieu de partir aussitôt
+    """
+
+    def __init__(self, app, excluded_suffixes=('/events',), **kwargs):
+        super().__init__(app, **kwargs)
+        self.excluded_suffixes = tuple(excluded_suffixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] == 'http' and scope['path'].rstrip('/').endswith(self.excluded_suffixes):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+app = FastAPI(title=settings.APP_NAME, version=settings.APP_VERSION, lifespan=lifespan)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=[settings.FRONTEND_URL],
+    allow_methods=['*'],
+    allow_headers=['*'],
+)
+# Pages de résultats volumineuses (processed_data), hors flux SSE
+app.add_middleware(JSONGZipMiddleware, minimum_size=1024)
+
+app.include_router(investigations.router, prefix='/api/investigations', tags=['investigations'])
+app.include_router(events.router, prefix='/api/investigations', tags=['events'])
+
+
+@app.get('/health')
+async def health():
+    """Sonde de vie (ne touche pas la base)"""
+    return {'status': 'ok', 'version': settings.APP_VERSION}
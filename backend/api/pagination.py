@@ -0,0 +1,59 @@
+"""
+Keyset pagination helpers
+Le curseur encode (horodatage, id) de la dernière ligne renvoyée : la page
+suivante reprend par un WHERE (ts, id) < (:ts, :id) servi par l'index, sans
+OFFSET (coût constant quelle que soit la profondeur de page).
+"""
+import base64
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import Select, tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(timestamp: datetime, row_id: uuid.UUID) -> str:
+    """Curseur opaque (base64 url-safe)"""
+    raw = f"{timestamp.isoformat()}|{row_id}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Inverse de encode_cursor (HTTP 400 si invalide)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        timestamp, row_id = base64.urlsafe_b64decode(padded).decode('utf-8').split('|')
+        return datetime.fromisoformat(timestamp), uuid.UUID(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail='Invalid cursor')
+
+
+def keyset_page(query: Select, timestamp_column, id_column, cursor: Optional[str], limit: int) -> Select:
+    """
+    Applique tri décroissant, curseur et limite à une requête
+
+    Une ligne de plus que `limit` est demandée pour savoir s'il existe une
+    page suivante (voir build_page).
+    """
+    # Une ligne sans horodatage n'a pas de place dans l'ordre keyset (et ne
+    # peut pas servir de curseur) ; la migration 0005 les a comblées
+    query = query.where(timestamp_column.is_not(None))
+
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(timestamp_column, id_column) < tuple_(timestamp, row_id))
+
+    return query.order_by(timestamp_column.desc(), id_column.desc()).limit(limit + 1)
+
+
+def build_page(rows: Sequence[Any], limit: int, timestamp_attr: str) -> Tuple[List[Any], Optional[str]]:
+    """(lignes de la page, curseur suivant ou None)"""
+    items = list(rows[:limit])
+    if len(rows) <= limit:
+        return items, None
+    last = items[-1]
+    return items, encode_cursor(getattr(last, timestamp_attr), last.id)
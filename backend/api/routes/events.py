@@ -0,0 +1,105 @@
+"""
+Live progress of an investigation - Server-Sent Events et WebSocket
+Remplace le polling de GET /api/investigations/{id} : les événements publiés
+par les workers (tasks.progress) sont poussés aux clients dès leur arrivée.
+"""
+import json
+import uuid
+from typing import AsyncIterator, Dict, Any, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from api.events import get_event_hub, investigation_events
+from models.database import get_async_session_factory
+from models.models import Investigation
+from tasks.progress import TERMINAL_STATUSES
+
+router = APIRouter()
+
+
+async def _snapshot(investigation_id: uuid.UUID) -> Dict[str, Any]:
+    """
+    Statut courant lu en base (une requête, session fermée aussitôt : aucune
+    connexion n'est gardée pendant la durée du flux)
+    """
+    async with get_async_session_factory()() as db:
+        investigation = await db.get(Investigation, investigation_id)
+    if investigation is None:
+        raise HTTPException(status_code=404, detail='Investigation not found')
+    return {
+        'type': 'snapshot',
+        'investigation_id': str(investigation_id),
+        'status': investigation.status,
+        'risk_score': investigation.risk_score,
+    }
+
+
+async def _events(investigation_id: uuid.UUID, snapshot: Dict[str, Any],
+                  last_seq: int) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """Snapshot, puis historique et flux en direct (ou historique seul si terminée)"""
+    yield snapshot
+
+    if snapshot['status'] in TERMINAL_STATUSES:
+        # Plus rien ne sera publié : on renvoie ce qui reste de l'historique
+        for payload in await get_event_hub().history(str(investigation_id)):
+            event = json.loads(payload)
+            if event['seq'] > last_seq:
+                yield event
+        return
+
+    async for event in investigation_events(str(investigation_id), last_seq):
+        yield event
+
+
+def _format_sse(event: Optional[Dict[str, Any]]) -> str:
+    if event is None:
+        return ': keep-alive\n\n'
+    lines = []
+    if 'seq' in event:
+        lines.append(f"id: {event['seq']}")
+    lines.append(f"event: {event['type']}")
+    lines.append(f"data: {json.dumps(event, default=str)}")
+    return '\n'.join(lines) + '\n\n'
+
+
+@router.get('/{investigation_id}/events')
+async def stream_events(investigation_id: uuid.UUID, request: Request,
+                        last_event_id: Optional[int] = Header(default=None)):
+    """
+    Flux SSE (text/event-stream) de l'avancement d'une investigation
+
+    Événements : snapshot, status, source_started, finding, source_completed,
+    source_error. À la reconnexion, EventSource renvoie Last-Event-ID et le
+    flux reprend après le dernier événement reçu.
+    """
+    snapshot = await _snapshot(investigation_id)
+
+    async def body():
+        async for event in _events(investigation_id, snapshot, last_event_id or 0):
+            if await request.is_disconnected():
+                break
+            yield _format_sse(event)
+
+    return StreamingResponse(body(), media_type='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',  # Pas de buffering par un proxy nginx
+    })
+
+
+@router.websocket('/{investigation_id}/ws')
+async def websocket_events(websocket: WebSocket, investigation_id: uuid.UUID, last_seq: int = 0):
+    """Même flux que /events, en JSON sur WebSocket ({'type': 'ping'} en keep-alive)"""
+    await websocket.accept()
+    try:
+        snapshot = await _snapshot(investigation_id)
+    except HTTPException:
+        await websocket.close(code=4404)
+        return
+
+    try:
+        async for event in _events(investigation_id, snapshot, last_seq):
+            await websocket.send_json(event if event is not None else {'type': 'ping'})
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
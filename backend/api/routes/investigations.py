@@ -0,0 +1,137 @@
+"""
+Investigations API - soumission asynchrone, suivi, résultats paginés
+Aucun scraper ne tourne dans l'API : les investigations sont envoyées aux
+workers Celery (tasks.scraping.run_investigation) et suivies par polling.
+"""
+import uuid
+import logging
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.pagination import keyset_page, build_page, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from api.schemas import (
+    InvestigationCreate, InvestigationOut, InvestigationSubmitted,
+    CollectedDataOut, AlertOut, Page, RelatedInvestigations
+)
+from graph.identity_index import get_identity_index
+from models.database import get_async_db
+from models.models import Investigation, CollectedData, Alert
+from tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+async def _get_investigation(db: AsyncSession, investigation_id: uuid.UUID) -> Investigation:
+    investigation = await db.get(Investigation, investigation_id)
+    if investigation is None:
+        raise HTTPException(status_code=404, detail='Investigation not found')
+    return investigation
+
+
+@router.post('', status_code=202, response_model=InvestigationSubmitted)
+async def create_investigation(body: InvestigationCreate, response: Response,
+                               db: AsyncSession = Depends(get_async_db)):
+    """Crée une investigation et la met en file (202 : à suivre via status_url)"""
+    investigation = Investigation(
+        name=body.name or f"{body.target_type}:{body.target_value}",
+        target_type=body.target_type,
+        target_value=body.target_value.strip(),
+        status='pending'
+    )
+    db.add(investigation)
+    await db.commit()
+
+    investigation_id = str(investigation.id)
+    try:
+        # Envoi par nom : l'API n'importe pas les scrapers. L'envoi au broker
+        # est bloquant, il part dans le threadpool
+        await run_in_threadpool(celery_app.send_task, 'tasks.scraping.run_investigation', args=[investigation_id])
+    except Exception as e:
+        logger.error(f"❌ Failed to enqueue investigation {investigation_id}: {e}")
+        investigation.status = 'failed'
+        investigation.updated_at = datetime.utcnow()
+        await db.commit()
+        raise HTTPException(status_code=503, detail='Task queue unavailable')
+
+    status_url = f"/api/investigations/{investigation_id}"
+    response.headers['Location'] = status_url
+    return InvestigationSubmitted(id=investigation.id, status=investigation.status, status_url=status_url)
+
+
+@router.get('', response_model=Page[InvestigationOut])
+async def list_investigations(status: Optional[str] = None, cursor: Optional[str] = None,
+                              limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                              db: AsyncSession = Depends(get_async_db)):
+    """Investigations, les plus récentes d'abord"""
+    query = select(Investigation)
+    if status:
+        query = query.where(Investigation.status == status)
+
+    query = keyset_page(query, Investigation.created_at, Investigation.id, cursor, limit)
+    rows = (await db.execute(query)).scalars().all()
+    items, next_cursor = build_page(rows, limit, 'created_at')
+    return Page[InvestigationOut](items=items, next_cursor=next_cursor)
+
+
+@router.get('/{investigation_id}', response_model=InvestigationOut)
+async def get_investigation(investigation_id: uuid.UUID, response: Response,
+                            db: AsyncSession = Depends(get_async_db)):
+    """Statut d'une investigation (pending, running, completed, failed)"""
+    investigation = await _get_investigation(db, investigation_id)
+    if investigation.status in ('pending', 'running'):
+        # Indique aux clients l'intervalle de polling conseillé
+        response.headers['Retry-After'] = '2'
+    return investigation
+
+
+@router.get('/{investigation_id}/results', response_model=Page[CollectedDataOut])
+async def list_results(investigation_id: uuid.UUID, source: Optional[str] = None,
+                       risk_level: Optional[str] = None, cursor: Optional[str] = None,
+                       limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                       db: AsyncSession = Depends(get_async_db)):
+    """Données collectées (index investigation_id, collected_at)"""
+    await _get_investigation(db, investigation_id)
+
+    query = select(CollectedData).where(CollectedData.investigation_id == investigation_id)
+    if source:
+        query = query.where(CollectedData.source == source)
+    if risk_level:
+        query = query.where(CollectedData.risk_level == risk_level)
+
+    query = keyset_page(query, CollectedData.collected_at, CollectedData.id, cursor, limit)
+    rows = (await db.execute(query)).scalars().all()
+    items, next_cursor = build_page(rows, limit, 'collected_at')
+    return Page[CollectedDataOut](items=items, next_cursor=next_cursor)
+
+
+@router.get('/{investigation_id}/alerts', response_model=Page[AlertOut])
+async def list_alerts(investigation_id: uuid.UUID, severity: Optional[str] = None,
+                      cursor: Optional[str] = None,
+                      limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                      db: AsyncSession = Depends(get_async_db)):
+    """Alertes (index investigation_id, created_at)"""
+    await _get_investigation(db, investigation_id)
+
+    query = select(Alert).where(Alert.investigation_id == investigation_id)
+    if severity:
+        query = query.where(Alert.severity == severity)
+
+    query = keyset_page(query, Alert.created_at, Alert.id, cursor, limit)
+    rows = (await db.execute(query)).scalars().all()
+    items, next_cursor = build_page(rows, limit, 'created_at')
+    return Page[AlertOut](items=items, next_cursor=next_cursor)
+
+
+@router.get('/{investigation_id}/related', response_model=RelatedInvestigations)
+async def get_related(investigation_id: uuid.UUID):
+    """Autres investigations partageant un email, pseudo, IP ou numéro"""
+    index = get_identity_index()
+    await run_in_threadpool(index.refresh)
+    return RelatedInvestigations(investigation_id=investigation_id, related=index.related(str(investigation_id)))
@@ -0,0 +1,79 @@
+"""
+Pydantic schemas for the HTTP API
+"""
+from datetime import datetime
+from typing import Any, Dict, Generic, List, Literal, Optional, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+T = TypeVar('T')
+
+# Types de cible traités par tasks.scraping.TARGET_TASKS
+TargetType = Literal['ip', 'email', 'phone', 'username']
+
+
+class InvestigationCreate(BaseModel):
+    """Corps de POST /api/investigations"""
+    target_type: TargetType
+    target_value: str = Field(min_length=1, max_length=255)
+    name: Optional[str] = Field(default=None, max_length=255)
+
+
+class InvestigationOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    name: str
+    target_type: str
+    target_value: str
+    status: str
+    risk_score: Optional[float] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+
+class InvestigationSubmitted(BaseModel):
+    """Réponse 202 : l'investigation est en file, à suivre via status_url"""
+    id: UUID
+    status: str
+    status_url: str
+
+
+class CollectedDataOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    investigation_id: UUID
+    source: str
+    data_type: Optional[str] = None
+    processed_data: Optional[Dict[str, Any]] = None
+    raw_hash: Optional[str] = None
+    risk_level: Optional[str] = None
+    ai_confidence: Optional[float] = None
+    collected_at: datetime
+
+
+class AlertOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    investigation_id: UUID
+    severity: str
+    alert_type: str
+    title: str
+    description: Optional[str] = None
+    evidence: Optional[Dict[str, Any]] = None
+    created_at: datetime
+
+
+class Page(BaseModel, Generic[T]):
+    """Page de résultats ; next_cursor à repasser en ?cursor= (None = fin)"""
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+class RelatedInvestigations(BaseModel):
+    """Investigations partageant un identifiant (email, pseudo, IP, numéro)"""
+    investigation_id: UUID
+    related: Dict[str, List[str]]
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Batch investigation runner - Lance les scrapers sur des milliers de cibles
+Usage: python batch_runner.py targets.csv results.jsonl --concurrency 100
+
+Entrée : CSV (colonnes 'target' et optionnellement 'type') ou JSONL
+({"target": ..., "type": ...}). Le type est détecté automatiquement s'il
+n'est pas fourni (ip, email, phone, username). Les types 'github' (enrichissement
+GitHub, requêtes GraphQL groupées), 'domain' et 'url' (VirusTotal) doivent être
+indiqués explicitement.
+Sortie : JSONL, une ligne par cible, écrite au fil de l'eau.
+Avec --graph, les entités trouvées sont aussi écrites dans Neo4j (par lots).
+"""
+import re
+import csv
+import json
+import time
+import asyncio
+import argparse
+import ipaddress
+import logging
+from typing import TYPE_CHECKING, Dict, Any, Iterator, Optional, Set, Tuple
+
+from scrapers.base_scraper import BaseScraper
+from scrapers.email_scraper import EmailScraper
+from scrapers.github_scraper import GitHubScraper
+from scrapers.phone_scraper import PhoneScraper
+from scrapers.shodan_scraper import ShodanScraper
+from scrapers.username_scraper import UsernameScraper
+from scrapers.virustotal_scraper import VirusTotalScraper
+from scrapers.http_client import close_http_client
+
+if TYPE_CHECKING:
+    # Driver neo4j importé seulement avec --graph
+    from graph.writer import GraphWriter
+
+logger = logging.getLogger(__name__)
+
+EMAIL_REGEX = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+PHONE_REGEX = re.compile(r'^\+?[\d\s().-]{7,20}$')
+
+# Scraper utilisé pour chaque type de cible
+SCRAPERS = {
+    'ip': ShodanScraper,
+    'email': EmailScraper,
+    'phone': PhoneScraper,
+    'username': UsernameScraper,
+    'github': GitHubScraper,
+    'domain': VirusTotalScraper,
+    'url': VirusTotalScraper,
+}
+
+
+def detect_target_type(target: str) -> str:
+    """Devine le type d'une cible (ip, email, phone, username)"""
+    try:
+        ipaddress.ip_address(target)
+        return 'ip'
+    except ValueError:
+        pass
+
+    if EMAIL_REGEX.match(target):
+        return 'email'
+
+    if PHONE_REGEX.match(target) and sum(c.isdigit() for c in target) >= 7:
+        return 'phone'
+
+    return 'username'
+
+
+def read_targets(path: str) -> Iterator[Dict[str, str]]:
+    """
+    Lit les cibles une par une (jamais tout le fichier en mémoire)
+
+    Args:
+        path: Fichier .csv ou .jsonl
+
+    Yields:
+        {'target': ..., 'type': ...}
+    """
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.endswith('.csv'):
+            for row in csv.DictReader(f):
+                target = (row.get('target') or row.get('value') or '').strip()
+                if target:
+                    yield {
+                        'target': target,
+                        'type': (row.get('type') or row.get('target_type') or '').strip() or detect_target_type(target)
+                    }
+        else:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    logger.warning(f"⚠️  {path}:{line_number}: invalid JSON, skipped")
+                    continue
+                if isinstance(item, str):
+                    item = {'target': item}
+                if not isinstance(item, dict):
+                    logger.warning(f"⚠️  {path}:{line_number}: not a target object, skipped")
+                    continue
+                target = str(item.get('target') or item.get('value') or '').strip()
+                if target:
+                    yield {
+                        'target': target,
+                        'type': item.get('type') or item.get('target_type') or detect_target_type(target)
+                    }
+
+
+def read_done_targets(path: str) -> Set[Tuple[str, str]]:
+    """
+    Cibles déjà présentes dans un fichier de résultats (reprise)
+
+    Returns:
+        {(type, cible)} : une cible traitée sous un type ne l'est pas sous les autres
+    """
+    done = set()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                    done.add((result['target_type'], result['target']))
+                except (ValueError, KeyError, TypeError):
+                    continue
+    except FileNotFoundError:
+        pass
+    return done
+
+
+class BatchRunner:
+    """Exécute des investigations en masse avec une limite de concurrence globale"""
+
+    def __init__(self, concurrency: int = 50, target_timeout: float = 600, progress_every: int = 100,
+                 graph: Optional['GraphWriter'] = None):
+        self.concurrency = concurrency
+        self.target_timeout = target_timeout
+        self.progress_every = progress_every
+        self.graph = graph
+        self._scrapers: Dict[str, Any] = {}
+        self.stats = {'processed': 0, 'success': 0, 'error': 0, 'skipped': 0}
+
+    def _get_scraper(self, target_type: str) -> BaseScraper:
+        """Une seule instance de scraper par type (les erreurs d'init sont mémorisées)"""
+        if target_type not in self._scrapers:
+            scraper_class = SCRAPERS.get(target_type)
+            if scraper_class is None:
+                self._scrapers[target_type] = ValueError(f'Unsupported target type: {target_type}')
+            else:
+                try:
+                    self._scrapers[target_type] = scraper_class()
+                except Exception as e:
+                    self._scrapers[target_type] = e
+
+        scraper = self._scrapers[target_type]
+        if isinstance(scraper, Exception):
+            raise scraper
+        return scraper
+
+    async def _process(self, item: Dict[str, str]) -> Dict[str, Any]:
+        """Lance le bon scraper sur une cible"""
+        target, target_type = item['target'], item['type']
+
+        try:
+            scraper = self._get_scraper(target_type)
+            result = await asyncio.wait_for(scraper.process(target), timeout=self.target_timeout)
+        except asyncio.TimeoutError:
+            result = {'status': 'error', 'target': target, 'error': f'Timeout ({self.target_timeout}s exceeded)'}
+        except Exception as e:
+            result = {'status': 'error', 'target': target, 'error': str(e)}
+
+        return {'target_type': target_type, **result}
+
+    async def _worker(self, queue: asyncio.Queue, output):
+        while True:
+            item = await queue.get()
+            try:
+                if item is None:
+                    return
+
+                result = await self._process(item)
+
+                output.write(json.dumps(result, ensure_ascii=False, default=str) + '\n')
+                output.flush()
+
+                if self.graph and result.get('status') == 'success':
+                    # Un flush Neo4j ne bloque pas l'event loop
+                    await asyncio.to_thread(self.graph.add, result['data'])
+
+                self.stats['processed'] += 1
+                self.stats['success' if result.get('status') == 'success' else 'error'] += 1
+
+                if self.stats['processed'] % self.progress_every == 0:
+                    logger.info(f"📊 {self.stats['processed']} targets processed "
+                                f"({self.stats['success']} ok, {self.stats['error']} errors)")
+            finally:
+                queue.task_done()
+
+    async def run(self, input_path: str, output_path: str, resume: bool = False) -> Dict[str, int]:
+        """
+        Traite toutes les cibles du fichier d'entrée
+
+        Args:
+            input_path: Fichier de cibles (.csv ou .jsonl)
+            output_path: Fichier de résultats JSONL
+            resume: Ignorer les cibles (même type) déjà présentes dans output_path
+
+        Returns:
+            Statistiques du run
+        """
+        done = read_done_targets(output_path) if resume else set()
+
+        # File bornée : le lecteur n'avance pas plus vite que les workers
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        with open(output_path, 'a' if resume else 'w', encoding='utf-8') as output:
+            workers = [asyncio.create_task(self._worker(queue, output)) for _ in range(self.concurrency)]
+
+            try:
+                for item in read_targets(input_path):
+                    if (item['type'], item['target']) in done:
+                        self.stats['skipped'] += 1
+                        continue
+                    await queue.put(item)
+
+                for _ in workers:
+                    await queue.put(None)
+
+                await asyncio.gather(*workers)
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                if self.graph:
+                    await asyncio.to_thread(self.graph.flush)
+                await close_http_client()
+
+        return self.stats
+
+
+def main():
+    """Point d'entrée principal"""
+    parser = argparse.ArgumentParser(description='Batch OSINT investigations')
+    parser.add_argument('input', help='Fichier de cibles (.csv ou .jsonl)')
+    parser.add_argument('output', help='Fichier de résultats (.jsonl)')
+    parser.add_argument('--concurrency', type=int, default=50, help='Cibles traitées en parallèle')
+    parser.add_argument('--timeout', type=float, default=600, help='Timeout par cible (secondes)')
+    parser.add_argument('--resume', action='store_true', help='Reprendre un run interrompu')
+    parser.add_argument('--graph', action='store_true', help='Écrire les entités dans Neo4j')
+    args = parser.parse_args()
+
+    print(f"🚀 Batch run : {args.input} → {args.output} (concurrency={args.concurrency})")
+    start = time.monotonic()
+
+    graph = None
+    if args.graph:
+        from graph.writer import GraphWriter
+        graph = GraphWriter()
+        graph.ensure_constraints()
+
+    runner = BatchRunner(concurrency=args.concurrency, target_timeout=args.timeout, graph=graph)
+    try:
+        stats = asyncio.run(runner.run(args.input, args.output, resume=args.resume))
+    finally:
+        if graph:
+            from graph.writer import close_graph_driver
+            close_graph_driver()
+
+    elapsed = time.monotonic() - start
+    print(f"✅ Terminé en {elapsed:.0f}s : {stats['processed']} cibles "
+          f"({stats['success']} ok, {stats['error']} erreurs, {stats['skipped']} déjà traitées)")
+
+
+if __name__ == "__main__":
+    main()
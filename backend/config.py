@@ -17,6 +17,14 @@ class Settings(BaseSettings):
     NEO4J_PASSWORD: str
     REDIS_URL: str
 
+    # Database connection pool (sync + async engines)
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    ASYNC_DATABASE_URL: Optional[str] = None
+
     # OSINT APIs
     SHODAN_API_KEY: Optional[str] = None
     VIRUSTOTAL_API_KEY: Optional[str] = None
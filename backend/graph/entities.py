@@ -0,0 +1,175 @@
+"""
+Graph entities extracted from parsed scraper output
+Transforme le résultat de parse() (email, username, IP, téléphone) en nœuds
+et relations Neo4j, accumulés dans un GraphBatch avant écriture.
+"""
+import re
+from typing import Dict, Any, Tuple
+
+# Propriété identifiant chaque type de nœud (contrainte d'unicité)
+NODE_KEYS = {
+    'Investigation': 'id',
+    'Email': 'address',
+    'Breach': 'name',
+    'Username': 'name',
+    'Platform': 'name',
+    'IPAddress': 'ip',
+    'Port': 'id',  # '443/tcp'
+    'Domain': 'name',
+    'Phone': 'number',
+    'Carrier': 'name',
+}
+
+
+class GraphBatch:
+    """
+    Nœuds et relations en attente d'écriture, dédupliqués
+
+    Un même nœud vu plusieurs fois dans le lot n'est écrit qu'une fois
+    (propriétés fusionnées).
+    """
+
+    def __init__(self):
+        # label -> {clé: propriétés}
+        self.nodes: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # (type, label source, label cible) -> {(clé source, clé cible): propriétés}
+        self.relationships: Dict[Tuple[str, str, str], Dict[Tuple[str, str], Dict[str, Any]]] = {}
+
+    def node(self, label: str, key: Any, **props) -> str:
+        """Ajoute (ou complète) un nœud et retourne sa clé"""
+        key = str(key)
+        existing = self.nodes.setdefault(label, {}).setdefault(key, {})
+        existing.update({name: value for name, value in props.items() if value is not None})
+        return key
+
+    def link(self, rel_type: str, from_label: str, from_key: str, to_label: str, to_key: str, **props):
+        """Ajoute (ou complète) une relation entre deux nœuds du lot"""
+        existing = self.relationships.setdefault((rel_type, from_label, to_label), {}).setdefault((from_key, to_key), {})
+        existing.update({name: value for name, value in props.items() if value is not None})
+
+    def __len__(self) -> int:
+        return (sum(len(nodes) for nodes in self.nodes.values())
+                + sum(len(rels) for rels in self.relationships.values()))
+
+
+def _clean(value: Any) -> str:
+    return str(value).strip() if value else ''
+
+
+def _add_email(batch: GraphBatch, email: str) -> str:
+    """Nœud Email relié au Domain de son adresse"""
+    address = batch.node('Email', email.lower())
+    if '@' in address:
+        domain = batch.node('Domain', address.split('@', 1)[1])
+        batch.link('REGISTERED_ON', 'Email', address, 'Domain', domain)
+    return address
+
+
+def _extract_email(batch: GraphBatch, parsed: Dict[str, Any]) -> Tuple[str, str]:
+    """EmailScraper / tâche Holehe : fuites et comptes"""
+    address = _add_email(batch, parsed['email'])
+
+    breaches = parsed.get('breaches') or {}
+    for breach in breaches.get('details', []) if isinstance(breaches, dict) else []:
+        name = _clean(breach.get('name'))
+        if not name:
+            continue
+        batch.node('Breach', name, title=breach.get('title'), breach_date=breach.get('breach_date'),
+                   pwn_count=breach.get('pwn_count'), data_classes=breach.get('data_classes'))
+        batch.link('EXPOSED_IN', 'Email', address, 'Breach', name)
+        if breach.get('domain'):
+            domain = batch.node('Domain', breach['domain'].lower())
+            batch.link('BREACHED_FROM', 'Breach', name, 'Domain', domain)
+
+    accounts = parsed.get('social_accounts') or {}
+    for platform in accounts.get('platforms', []) if isinstance(accounts, dict) else []:
+        platform = batch.node('Platform', _clean(platform).lower())
+        batch.link('HAS_ACCOUNT', 'Email', address, 'Platform', platform, source='holehe')
+
+    return 'Email', address
+
+
+def _extract_username(batch: GraphBatch, parsed: Dict[str, Any]) -> Tuple[str, str]:
+    """UsernameScraper : comptes trouvés par Sherlock"""
+    username = batch.node('Username', parsed['username'].lower())
+
+    for account in parsed.get('verified_accounts', []):
+        platform = _clean(account.get('platform')).lower()
+        if not platform:
+            continue
+        url = account.get('url')
+        if not url and ': ' in (account.get('info') or ''):
+            url = account['info'].split(': ', 1)[1].strip()
+        batch.node('Platform', platform)
+        batch.link('HAS_ACCOUNT', 'Username', username, 'Platform', platform, url=url, source='sherlock')
+
+    return 'Username', username
+
+
+def _extract_ip(batch: GraphBatch, parsed: Dict[str, Any]) -> Tuple[str, str]:
+    """ShodanScraper : ports, services et domaines"""
+    ip = batch.node('IPAddress', parsed['ip'], organization=parsed.get('organization'),
+                    isp=parsed.get('isp'), country=parsed.get('country'), city=parsed.get('city'),
+                    os=parsed.get('os'), vulnerabilities=parsed.get('vulnerabilities') or None,
+                    risk_score=parsed.get('risk_score'))
+
+    services = {service.get('port'): service for service in parsed.get('services', [])}
+    for port in parsed.get('ports_open', []):
+        service = services.get(port, {})
+        protocol = service.get('protocol') or 'tcp'
+        port_id = batch.node('Port', f"{port}/{protocol}", number=port, protocol=protocol)
+        batch.link('EXPOSES', 'IPAddress', ip, 'Port', port_id,
+                   product=service.get('product'), version=service.get('version'))
+
+    for name in set(parsed.get('hostnames', [])) | set(parsed.get('domains', [])):
+        domain = batch.node('Domain', name.lower())
+        batch.link('RESOLVES_TO', 'Domain', domain, 'IPAddress', ip)
+
+    return 'IPAddress', ip
+
+
+def _extract_phone(batch: GraphBatch, parsed: Dict[str, Any]) -> Tuple[str, str]:
+    """PhoneScraper : opérateur"""
+    # Format E.164 (+33612345678) : même clé quelle que soit la saisie
+    number = re.sub(r'[^\d+]', '', parsed.get('international_format') or parsed['phone_number'])
+    number = batch.node('Phone', number,
+                        country=parsed.get('country'), country_code=parsed.get('country_code'),
+                        line_type=parsed.get('type'), valid=parsed.get('valid'))
+
+    carrier = _clean(parsed.get('carrier'))
+    if carrier and carrier != 'Unknown':
+        batch.node('Carrier', carrier)
+        batch.link('OPERATED_BY', 'Phone', number, 'Carrier', carrier)
+
+    return 'Phone', number
+
+
+def extract_entities(parsed: Dict[str, Any], batch: GraphBatch, investigation_id: str = None) -> bool:
+    """
+    Ajoute au lot les entités d'un résultat parse()
+
+    Le type de résultat est reconnu à ses champs (ip, email, phone_number,
+    username). La cible est reliée à son investigation si elle est fournie.
+
+    Returns:
+        False si le résultat n'est pas reconnu ou est une erreur
+    """
+    if not parsed or 'error' in parsed:
+        return False
+
+    if parsed.get('ip'):
+        root = _extract_ip(batch, parsed)
+    elif parsed.get('email'):
+        root = _extract_email(batch, parsed)
+    elif parsed.get('phone_number'):
+        root = _extract_phone(batch, parsed)
+    elif parsed.get('username'):
+        root = _extract_username(batch, parsed)
+    else:
+        return False
+
+    if investigation_id:
+        investigation = batch.node('Investigation', investigation_id)
+        batch.link('TARGETS', 'Investigation', investigation, *root)
+
+    return True
@@ -0,0 +1,312 @@
+"""
+In-memory inverted index: identifiant normalisé -> investigations
+Répond à "quelles autres investigations touchent cet email / pseudo / IP /
+numéro ?" sans parcourir les JSON de collected_data.
+
+Persistance : snapshot JSON + journal d'ajouts (JSONL, append-only). Chaque
+ajout est écrit dans le journal ; refresh() relit les lignes ajoutées par les
+autres process ; compact() réécrit le snapshot et vide le journal. Un verrou
+fichier (flock) sérialise les ajouts et la compaction entre process.
+
+Limite : un seul hôte. Le répertoire est local à la machine (flock n'est pas
+fiable sur NFS) : les workers Celery et l'API qui doivent voir le même index
+tournent sur le même hôte. Sur plusieurs machines, chaque hôte a son propre
+index (reconstructible par rebuild_from_database) ; les rapprochements entre
+hôtes passent par le graphe Neo4j.
+"""
+import os
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Set, List, Iterable, Tuple, FrozenSet
+
+try:
+    import fcntl
+except ImportError:  # Windows : un seul process d'écriture (développement)
+    fcntl = None
+
+from graph.entities import GraphBatch, extract_entities
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_DIR = Path(__file__).resolve().parent.parent.parent / 'data' / 'index'
+IDENTITY_INDEX_DIR = Path(os.getenv('IDENTITY_INDEX_DIR', DEFAULT_INDEX_DIR))
+
+# Nœuds du graphe indexés (les fuites, plateformes, domaines... sont partagés
+# par trop de cibles pour servir à rapprocher des investigations)
+INDEXED_LABELS = {
+    'Email': 'email',
+    'Username': 'username',
+    'Phone': 'phone',
+    'IPAddress': 'ip',
+}
+
+
+def identifiers_from_result(parsed: Dict[str, Any]) -> Set[str]:
+    """
+    Identifiants normalisés ('email:a@b.com', 'ip:1.2.3.4'...) d'un résultat parse()
+
+    La normalisation est celle des clés du graphe Neo4j (graph.entities).
+    """
+    batch = GraphBatch()
+    if not extract_entities(parsed, batch):
+        return set()
+
+    return {
+        f"{kind}:{key}"
+        for label, kind in INDEXED_LABELS.items()
+        for key in batch.nodes.get(label, {})
+    }
+
+
+def identifier_key(kind: str, value: str) -> str:
+    """Clé d'index d'un identifiant saisi (même normalisation que les résultats)"""
+    samples = {
+        'email': {'email': value},
+        'username': {'username': value},
+        'phone': {'phone_number': value},
+        'ip': {'ip': value},
+    }
+    if kind not in samples:
+        raise ValueError(f'Unsupported identifier kind: {kind}')
+    keys = [key for key in identifiers_from_result(samples[kind]) if key.startswith(f'{kind}:')]
+    if not keys:
+        raise ValueError(f'Invalid {kind}: {value!r}')
+    return keys[0]
+
+
+class IdentityIndex:
+    """Index inversé identifiant -> investigations, persisté sur disque"""
+
+    def __init__(self, directory: Path = IDENTITY_INDEX_DIR):
+        self.directory = Path(directory)
+        self.snapshot_path = self.directory / 'identity_index.json'
+        self.log_path = self.directory / 'identity_index.log'
+        self.lock_path = self.directory / 'identity_index.lock'
+
+        self._index: Dict[str, Set[str]] = {}
+        self._by_investigation: Dict[str, Set[str]] = {}
+        self._log_offset = 0
+        self._snapshot_mtime = None
+        self._lock = threading.RLock()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.load()
+
+    # ─── Lecture ───
+
+    def lookup(self, key: str) -> FrozenSet[str]:
+        """Investigations liées à un identifiant normalisé"""
+        return frozenset(self._index.get(key, ()))
+
+    def lookup_identifier(self, kind: str, value: str) -> FrozenSet[str]:
+        """Investigations liées à un identifiant saisi (email, username, phone, ip)"""
+        return self.lookup(identifier_key(kind, value))
+
+    def identifiers(self, investigation_id: str) -> FrozenSet[str]:
+        """Identifiants trouvés dans une investigation"""
+        return frozenset(self._by_investigation.get(str(investigation_id), ()))
+
+    def related(self, investigation_id: str) -> Dict[str, List[str]]:
+        """
+        Autres investigations partageant au moins un identifiant
+
+        Returns:
+            {investigation_id: [identifiants partagés]}
+        """
+        investigation_id = str(investigation_id)
+        related: Dict[str, List[str]] = {}
+        with self._lock:
+            for key in self._by_investigation.get(investigation_id, ()):
+                for other in self._index.get(key, ()):
+                    if other != investigation_id:
+                        related.setdefault(other, []).append(key)
+        return related
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Verrou entre process : exclusif pour écrire, partagé pour lire"""
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    # ─── Écriture ───
+
+    def add_result(self, investigation_id: str, parsed: Dict[str, Any]) -> Set[str]:
+        """
+        Indexe les identifiants d'un résultat parse()
+
+        Returns:
+            Identifiants nouvellement associés à l'investigation
+        """
+        return self.add_identifiers(investigation_id, identifiers_from_result(parsed))
+
+    def add_identifiers(self, investigation_id: str, keys: Iterable[str]) -> Set[str]:
+        """Associe des identifiants normalisés à une investigation (journalisé)"""
+        investigation_id = str(investigation_id)
+        with self._lock:
+            new_keys = {key for key in keys if investigation_id not in self._index.get(key, ())}
+            if not new_keys:
+                return set()
+
+            # Journal d'abord : un crash ne perd pas un ajout déjà visible.
+            # L'offset de lecture n'avance pas : les lignes écrites entre-temps
+            # par d'autres process seront lues par refresh() (réappliquer la
+            # nôtre est sans effet)
+            with self._file_lock(exclusive=True), open(self.log_path, 'a', encoding='utf-8') as log:
+                log.write(json.dumps([investigation_id, sorted(new_keys)]) + '\n')
+
+            self._apply(investigation_id, new_keys)
+        return new_keys
+
+    def _apply(self, investigation_id: str, keys: Iterable[str]):
+        for key in keys:
+            self._index.setdefault(key, set()).add(investigation_id)
+            self._by_investigation.setdefault(investigation_id, set()).add(key)
+
+    # ─── Persistance ───
+
+    def load(self):
+        """Charge le snapshot puis rejoue le journal"""
+        with self._lock, self._file_lock(exclusive=False):
+            self._read_disk()
+
+        logger.info(f"🗂️  Identity index loaded: {len(self._index)} identifiers, "
+                    f"{len(self._by_investigation)} investigations")
+
+    def refresh(self) -> int:
+        """
+        Applique les ajouts journalisés par d'autres process depuis la dernière lecture
+
+        Returns:
+            Nombre d'entrées de journal appliquées
+        """
+        with self._lock, self._file_lock(exclusive=False):
+            try:
+                size = self.log_path.stat().st_size
+            except FileNotFoundError:
+                size = 0
+
+            if size < self._log_offset or self._get_snapshot_mtime() != self._snapshot_mtime:
+                # Journal compacté par un autre process : rechargement complet
+                self._read_disk()
+                return 0
+            if size == self._log_offset:
+                return 0
+            return self._read_log()
+
+    def _read_disk(self):
+        """Snapshot + journal complet (verrou fichier déjà pris)"""
+        self._index, self._by_investigation, self._log_offset = {}, {}, 0
+        self._snapshot_mtime = self._get_snapshot_mtime()
+
+        if self._snapshot_mtime is not None:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                for investigation_id, keys in json.load(f).items():
+                    self._apply(investigation_id, keys)
+
+        self._read_log()
+
+    def _read_log(self) -> int:
+        """Lignes du journal après _log_offset (verrou fichier déjà pris)"""
+        applied = 0
+        try:
+            log = open(self.log_path, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return 0
+        with log:
+            log.seek(self._log_offset)
+            for line in log:
+                if not line.endswith('\n'):
+                    break  # Ligne en cours d'écriture : relue au prochain refresh
+                investigation_id, keys = json.loads(line)
+                self._apply(investigation_id, keys)
+                self._log_offset += len(line.encode('utf-8'))
+                applied += 1
+        return applied
+
+    def compact(self, discard_log: bool = False):
+        """
+        Réécrit le snapshot (écriture atomique) et vide le journal
+
+        Sous le verrou exclusif (aucun ajout en cours ni possible), l'index
+        est relu depuis le disque avant d'être réécrit : l'état en mémoire
+        peut être en retard sur une compaction faite par un autre process.
+        Tout ajout est journalisé avant d'être visible, le disque contient
+        donc tout ce que ce process a indexé.
+
+        Args:
+            discard_log: Écrire l'index en mémoire tel quel, journal ignoré
+                (index reconstruit)
+        """
+        with self._lock, self._file_lock(exclusive=True):
+            if not discard_log:
+                self._read_disk()
+
+            tmp_path = self.snapshot_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({inv: sorted(keys) for inv, keys in self._by_investigation.items()}, f)
+            os.replace(tmp_path, self.snapshot_path)
+
+            # Après le snapshot : un crash entre les deux ne fait que rejouer
+            # des ajouts déjà présents (sans effet)
+            try:
+                self.log_path.unlink()
+            except FileNotFoundError:
+                pass
+            self._log_offset = 0
+            self._snapshot_mtime = self._get_snapshot_mtime()
+
+    def _get_snapshot_mtime(self):
+        try:
+            return self.snapshot_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def rebuild(self, results: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Reconstruit l'index à partir de (investigation_id, processed_data)
+
+        Returns:
+            Nombre d'identifiants indexés
+        """
+        with self._lock:
+            self._index, self._by_investigation = {}, {}
+            for investigation_id, parsed in results:
+                self._apply(str(investigation_id), identifiers_from_result(parsed or {}))
+            self.compact(discard_log=True)
+            return len(self._index)
+
+
+_index = None
+
+
+def get_identity_index() -> IdentityIndex:
+    """Index partagé du process (chargé au premier appel)"""
+    global _index
+    if _index is None:
+        _index = IdentityIndex()
+    return _index
+
+
+def rebuild_from_database(db) -> int:
+    """Reconstruit l'index depuis collected_data (première mise en place)"""
+    from sqlalchemy import select
+    from models.models import CollectedData
+
+    rows = db.execute(
+        select(CollectedData.investigation_id, CollectedData.processed_data)
+        .execution_options(yield_per=1000)
+    )
+    return get_identity_index().rebuild((str(inv), data) for inv, data in rows)
@@ -0,0 +1,166 @@
+"""
+Neo4j graph writer - upserts par lots (UNWIND + MERGE)
+Une requête par type de nœud/relation et par tranche de GRAPH_BATCH_SIZE lignes,
+au lieu d'une transaction par entité.
+"""
+import os
+import time
+import logging
+import threading
+from typing import Dict, Any, List, Tuple
+
+from neo4j import GraphDatabase, Driver
+
+from graph.entities import GraphBatch, NODE_KEYS, extract_entities
+
+logger = logging.getLogger(__name__)
+
+NEO4J_URI = os.getenv('NEO4J_URI', 'bolt://localhost:7687')
+NEO4J_USER = os.getenv('NEO4J_USER', 'neo4j')
+NEO4J_PASSWORD = os.getenv('NEO4J_PASSWORD', 'password')
+
+# Lignes par transaction UNWIND
+GRAPH_BATCH_SIZE = int(os.getenv('GRAPH_BATCH_SIZE', 5000))
+
+_driver = None
+
+
+def get_graph_driver() -> Driver:
+    """Driver Neo4j partagé (pool de connexions Bolt)"""
+    global _driver
+    if _driver is None:
+        _driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+    return _driver
+
+
+def close_graph_driver():
+    """Ferme le driver partagé"""
+    global _driver
+    if _driver is not None:
+        _driver.close()
+        _driver = None
+
+
+def _node_query(label: str) -> str:
+    key = NODE_KEYS[label]
+    return (
+        f"UNWIND $rows AS row "
+        f"MERGE (n:{label} {{{key}: row.key}}) "
+        f"SET n += row.props"
+    )
+
+
+def _relationship_query(rel_type: str, from_label: str, to_label: str) -> str:
+    return (
+        f"UNWIND $rows AS row "
+        f"MATCH (a:{from_label} {{{NODE_KEYS[from_label]}: row.from}}) "
+        f"MATCH (b:{to_label} {{{NODE_KEYS[to_label]}: row.to}}) "
+        f"MERGE (a)-[r:{rel_type}]->(b) "
+        f"SET r += row.props"
+    )
+
+
+def _chunks(rows: List[Dict[str, Any]], size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+class GraphWriter:
+    """
+    Accumule les entités et les écrit dans Neo4j par lots
+
+    Usage:
+        with GraphWriter() as graph:
+            graph.add(parsed_data, investigation_id)
+    """
+
+    def __init__(self, driver: Driver = None, flush_size: int = GRAPH_BATCH_SIZE,
+                 flush_interval: float = 5.0, database: str = None):
+        """
+        Args:
+            driver: Driver Neo4j (par défaut le driver partagé)
+            flush_size: Nombre d'entités en attente déclenchant un flush
+            flush_interval: Délai max (secondes) entre deux flush
+            database: Base Neo4j (par défaut celle du serveur)
+        """
+        self.driver = driver or get_graph_driver()
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.database = database
+        self._batch = GraphBatch()
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def ensure_constraints(self):
+        """Contraintes d'unicité : MERGE s'appuie sur leur index"""
+        with self.driver.session(database=self.database) as session:
+            for label, key in NODE_KEYS.items():
+                session.run(
+                    f"CREATE CONSTRAINT {label.lower()}_{key} IF NOT EXISTS "
+                    f"FOR (n:{label}) REQUIRE n.{key} IS UNIQUE"
+                )
+
+    def add(self, parsed: Dict[str, Any], investigation_id: str = None) -> bool:
+        """
+        Ajoute les entités d'un résultat parse() au lot courant
+
+        Returns:
+            False si le résultat n'a produit aucune entité
+        """
+        with self._lock:
+            added = extract_entities(parsed, self._batch, investigation_id)
+            pending = len(self._batch)
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+
+        if pending >= self.flush_size or due:
+            self.flush()
+        return added
+
+    def flush(self) -> Tuple[int, int]:
+        """
+        Écrit les nœuds puis les relations en attente
+
+        Les lignes sont triées par clé : des workers concurrents verrouillent
+        les nœuds dans le même ordre (moins de deadlocks).
+
+        Returns:
+            (nombre de nœuds, nombre de relations) écrits
+        """
+        with self._lock:
+            batch, self._batch = self._batch, GraphBatch()
+            self._last_flush = time.monotonic()
+
+        if not len(batch):
+            return 0, 0
+
+        node_count = rel_count = 0
+        with self.driver.session(database=self.database) as session:
+            for label, nodes in batch.nodes.items():
+                rows = [{'key': key, 'props': props} for key, props in sorted(nodes.items())]
+                for chunk in _chunks(rows, self.flush_size):
+                    session.execute_write(_run_batch, _node_query(label), chunk)
+                node_count += len(rows)
+
+            for (rel_type, from_label, to_label), rels in batch.relationships.items():
+                rows = [
+                    {'from': from_key, 'to': to_key, 'props': props}
+                    for (from_key, to_key), props in sorted(rels.items())
+                ]
+                for chunk in _chunks(rows, self.flush_size):
+                    session.execute_write(_run_batch, _relationship_query(rel_type, from_label, to_label), chunk)
+                rel_count += len(rows)
+
+        logger.info(f"🕸️  Graph flush: {node_count} nodes, {rel_count} relationships")
+        return node_count, rel_count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+
+
+def _run_batch(tx, query: str, rows: List[Dict[str, Any]]):
+    """Fonction de transaction (rejouée par le driver en cas d'erreur transitoire)"""
+    tx.run(query, rows=rows).consume()
@@ -1,23 +1,37 @@
 #!/usr/bin/env python3
 """
 Script to initialize the database
+Applique les migrations (alembic upgrade head) : sans risque sur une base existante
 """
-from models.database import engine, Base, init_db
-from models.models import Investigation, CollectedData, Alert
+from models.database import engine, init_db
+from models.partitions import ensure_collected_data_partitions
+from graph.writer import GraphWriter, close_graph_driver
 
 if __name__ == "__main__":
     print("🗄️  Initializing database...")
     print(f"📍 Database URL: {engine.url}")
 
     try:
-        # Créer toutes les tables
+        # Créer / mettre à jour les tables
         init_db()
+        partitions = ensure_collected_data_partitions()
         print("✅ All database tables created successfully!")
         print("\nTables created:")
         print("  - investigations")
         print("  - collected_data")
         print("  - alerts")
+        if partitions:
+            print(f"\nPartitions collected_data : {', '.join(partitions)}")
 
     except Exception as e:
         print(f"❌ Error creating database: {e}")
         exit(1)
+
+    # Contraintes d'unicité Neo4j (index utilisés par les MERGE du graph writer)
+    try:
+        GraphWriter().ensure_constraints()
+        print("✅ Neo4j constraints ready")
+    except Exception as e:
+        print(f"⚠️  Neo4j not initialized: {e}")
+    finally:
+        close_graph_driver()
@@ -0,0 +1,58 @@
+"""
+Alembic environment - utilise l'engine et les modèles de l'application
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import text
+
+from models.database import Base, engine
+from migrations.online import LOCK_TIMEOUT
+from models import models  # noqa: F401  (enregistre les tables dans Base.metadata)
+
+config = context.config
+
+if config.config_file_name is not None:
+    # Ne désactive pas les loggers de l'application (migrations lancées par init_db)
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    """Génère le SQL sans connexion (alembic upgrade head --sql)"""
+    context.configure(
+        url=str(engine.url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={'paramstyle': 'named'},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """Applique les migrations sur la base"""
+    with engine.connect() as connection:
+        if connection.dialect.name == 'postgresql':
+            # Un DDL qui n'obtient pas son verrou échoue au lieu de bloquer la base
+            connection.execute(text(f"SET lock_timeout = '{LOCK_TIMEOUT}'"))
+            connection.commit()
+
+        # Une transaction par migration : les étapes hors transaction
+        # (CONCURRENTLY, lots) ne remettent pas en cause les précédentes
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            transaction_per_migration=True
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
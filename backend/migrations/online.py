@@ -0,0 +1,103 @@
+"""
+Online-safe migration helpers (PostgreSQL)
+Étapes utilisables sur une base en production : index créés en CONCURRENTLY
+(hors transaction), recopies par lots courts, verrous bornés par lock_timeout.
+"""
+import os
+
+from alembic import op
+from sqlalchemy import text
+
+# Durée max d'attente d'un verrou : un ALTER bloqué mettrait toutes les
+# requêtes suivantes en file derrière lui
+LOCK_TIMEOUT = os.getenv('MIGRATION_LOCK_TIMEOUT', '5s')
+
+# Lignes recopiées par transaction lors d'un backfill
+BACKFILL_BATCH_SIZE = int(os.getenv('MIGRATION_BATCH_SIZE', 5000))
+
+# PostgreSQL tronque les identifiants au-delà de 63 caractères
+MAX_IDENTIFIER_LENGTH = 63
+
+
+def relation_kind(name: str):
+    """
+    Type d'une relation existante : 'r' (table), 'p' (table partitionnée),
+    'i' (index)... ou None si elle n'existe pas
+    """
+    return op.get_bind().execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"), {'name': name}
+    ).scalar()
+
+
+def create_index_concurrently(name: str, table: str, columns: list, **kwargs):
+    """
+    CREATE INDEX CONCURRENTLY : les écritures sur la table ne sont pas bloquées
+
+    Exécuté hors transaction (obligatoire pour CONCURRENTLY). Idempotent : une
+    migration interrompue peut être relancée. Une construction interrompue
+    (lock_timeout, annulation) laisse un index INVALID que IF NOT EXISTS
+    sauterait : il est supprimé puis reconstruit.
+    """
+    with op.get_context().autocommit_block():
+        if not op.get_context().as_sql:
+            valid = op.get_bind().execute(
+                text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"), {'name': name}
+            ).scalar()
+            if valid is False:
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True, **kwargs)
+
+
+def drop_index_concurrently(name: str, table: str):
+    """DROP INDEX CONCURRENTLY (hors transaction, idempotent)"""
+    with op.get_context().autocommit_block():
+        op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def set_not_null(table: str, column: str):
+    """
+    SET NOT NULL sans scan de la table sous verrou exclusif
+
+    Contrainte CHECK ajoutée NOT VALID (instantané), validée dans sa propre
+    transaction (verrou qui laisse passer lectures et écritures), puis SET NOT
+    NULL s'appuie sur elle au lieu de reparcourir la table (PostgreSQL 12+).
+    """
+    constraint = f"{table}_{column}_not_null"[:MAX_IDENTIFIER_LENGTH]
+    with op.get_context().autocommit_block():
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {constraint} CHECK ({column} IS NOT NULL) NOT VALID")
+        op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {constraint}")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL")
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT {constraint}")
+
+
+def backfill_in_batches(insert_sql: str, start_key: str, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """
+    Recopie des lignes par lots, une transaction par lot
+
+    Chaque lot est commité aussitôt : verrous courts, WAL étalé, et aucune
+    transaction longue ne bloque le VACUUM pendant la recopie.
+
+    Args:
+        insert_sql: INSERT ... SELECT recevant :last_key et :batch_size, qui
+            parcourt la source par clé croissante (WHERE key > :last_key
+            ORDER BY key LIMIT :batch_size) et renvoie la clé (RETURNING)
+        start_key: Valeur inférieure à toutes les clés
+        batch_size: Lignes par lot
+
+    Returns:
+        Nombre total de lignes recopiées
+    """
+    bind = op.get_bind()
+    last_key, total = start_key, 0
+
+    with op.get_context().autocommit_block():
+        while True:
+            keys = bind.execute(
+                text(insert_sql), {'last_key': last_key, 'batch_size': batch_size}
+            ).scalars().all()
+            if not keys:
+                break
+            total += len(keys)
+            last_key = max(str(key) for key in keys)
+
+    return total
@@ -0,0 +1,62 @@
+"""
+Initial schema (investigations, collected_data, alerts)
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-01-15
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'investigations',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('name', sa.String(255), nullable=False),
+        sa.Column('target_type', sa.String(50), nullable=False),
+        sa.Column('target_value', sa.String(255), nullable=False),
+        sa.Column('status', sa.String(50)),
+        sa.Column('risk_score', sa.Float),
+        sa.Column('created_at', sa.DateTime),
+        sa.Column('updated_at', sa.DateTime),
+    )
+
+    op.create_table(
+        'collected_data',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('investigation_id', postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey('investigations.id'), nullable=False),
+        sa.Column('source', sa.String(100), nullable=False),
+        sa.Column('data_type', sa.String(50)),
+        sa.Column('raw_data', sa.JSON),
+        sa.Column('processed_data', sa.JSON),
+        sa.Column('risk_level', sa.String(20)),
+        sa.Column('ai_confidence', sa.Float),
+        sa.Column('collected_at', sa.DateTime),
+    )
+
+    op.create_table(
+        'alerts',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('investigation_id', postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey('investigations.id'), nullable=False),
+        sa.Column('severity', sa.String(20), nullable=False),
+        sa.Column('alert_type', sa.String(100), nullable=False),
+        sa.Column('title', sa.String(255), nullable=False),
+        sa.Column('description', sa.Text),
+        sa.Column('evidence', sa.JSON),
+        sa.Column('created_at', sa.DateTime),
+    )
+
+
+def downgrade():
+    op.drop_table('alerts')
+    op.drop_table('collected_data')
+    op.drop_table('investigations')
@@ -0,0 +1,139 @@
+"""
+Composite and GIN indexes, JSONB payloads, monthly partitioning of collected_data
+
+Migration en ligne :
+- index alerts créés en CONCURRENTLY (écritures non bloquées)
+- collected_data : l'ancienne table est renommée et une table partitionnée
+  (RANGE sur collected_at, payloads JSONB, index déjà en place) prend sa place
+  dans une transaction courte ; les nouvelles écritures y arrivent aussitôt
+- les anciennes lignes sont recopiées par lots (json -> jsonb), puis
+  l'ancienne table est supprimée. La clé primaire devient (id, collected_at).
+
+Pendant la recopie, les lignes anciennes ne sont pas encore toutes visibles
+dans collected_data.
+
+Reprise : relancée après un échec, la migration saute la bascule déjà faite
+(collected_data_legacy existe) et reprend la recopie après la dernière ligne
+recopiée.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-01-20
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.online import (
+    create_index_concurrently, drop_index_concurrently, backfill_in_batches, relation_kind
+)
+from models.partitions import month_ranges, partition_ddl, add_months, PARTITION_MONTHS_AHEAD
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = 'id, investigation_id, source, data_type, raw_data, processed_data, risk_level, ai_confidence, collected_at'
+
+BACKFILL_SQL = f"""
+    INSERT INTO collected_data ({COLUMNS})
+    SELECT id, investigation_id, source, data_type, raw_data::jsonb, processed_data::jsonb,
+           risk_level, ai_confidence, COALESCE(collected_at, now() AT TIME ZONE 'utc')
+    FROM collected_data_legacy
+    WHERE id > CAST(:last_key AS uuid)
+    ORDER BY id
+    LIMIT :batch_size
+    RETURNING id
+"""
+
+
+def upgrade():
+    # ─── alerts : index composites, sans bloquer les écritures ───
+    create_index_concurrently('ix_alerts_investigation_created', 'alerts', ['investigation_id', 'created_at'])
+    create_index_concurrently('ix_alerts_severity_created', 'alerts', ['severity', 'created_at'])
+
+    # ─── collected_data : bascule vers la table partitionnée ───
+    # (faite en une transaction : soit rien, soit table legacy + table partitionnée)
+    if relation_kind('collected_data_legacy') is None:
+        if relation_kind('collected_data') == 'p':
+            return  # Recopie terminée et ancienne table supprimée
+        _switch_to_partitioned()
+
+    # ─── Recopie par lots (la bascule est commitée avant le premier lot) ───
+    # Lots commités par id croissant : tout ce qui précède le dernier id
+    # recopié est déjà en place
+    last_copied = op.get_bind().execute(sa.text(
+        'SELECT max(c.id) FROM collected_data c JOIN collected_data_legacy l ON l.id = c.id'
+    )).scalar()
+    backfill_in_batches(BACKFILL_SQL, start_key=str(last_copied or '00000000-0000-0000-0000-000000000000'))
+    op.execute('DROP TABLE collected_data_legacy')
+
+
+def _switch_to_partitioned():
+    """Renomme l'ancienne table et crée la table partitionnée à sa place"""
+    op.execute('ALTER TABLE collected_data RENAME TO collected_data_legacy')
+    op.execute('ALTER TABLE collected_data_legacy RENAME CONSTRAINT collected_data_pkey TO collected_data_legacy_pkey')
+
+    op.execute("""
+        CREATE TABLE collected_data (
+            id UUID NOT NULL,
+            investigation_id UUID NOT NULL REFERENCES investigations (id),
+            source VARCHAR(100) NOT NULL,
+            data_type VARCHAR(50),
+            raw_data JSONB,
+            processed_data JSONB,
+            risk_level VARCHAR(20),
+            ai_confidence FLOAT,
+            collected_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            PRIMARY KEY (id, collected_at)
+        ) PARTITION BY RANGE (collected_at)
+    """)
+    op.execute('CREATE TABLE collected_data_default PARTITION OF collected_data DEFAULT')
+
+    # Une partition par mois, de la plus ancienne ligne jusqu'aux mois à venir
+    oldest = op.get_bind().execute(sa.text('SELECT min(collected_at) FROM collected_data_legacy')).scalar()
+    today = datetime.utcnow().date()
+    start = oldest.date() if oldest else today
+    for month_start, month_end in month_ranges(start, add_months(today, PARTITION_MONTHS_AHEAD)):
+        op.execute(partition_ddl(month_start, month_end))
+
+    # Table vide : index créés directement (propagés à chaque partition)
+    op.create_index('ix_collected_data_investigation_collected', 'collected_data', ['investigation_id', 'collected_at'])
+    op.create_index('ix_collected_data_source_collected', 'collected_data', ['source', 'collected_at'])
+    op.create_index('ix_collected_data_risk_collected', 'collected_data', ['risk_level', 'collected_at'])
+    op.create_index('ix_collected_data_raw_data', 'collected_data', ['raw_data'],
+                    postgresql_using='gin', postgresql_ops={'raw_data': 'jsonb_path_ops'})
+    op.create_index('ix_collected_data_processed_data', 'collected_data', ['processed_data'],
+                    postgresql_using='gin', postgresql_ops={'processed_data': 'jsonb_path_ops'})
+
+
+def downgrade():
+    op.execute('ALTER TABLE collected_data RENAME TO collected_data_partitioned')
+    op.execute('ALTER TABLE collected_data_partitioned RENAME CONSTRAINT collected_data_pkey TO collected_data_partitioned_pkey')
+    op.execute("""
+        CREATE TABLE collected_data (
+            id UUID PRIMARY KEY,
+            investigation_id UUID NOT NULL REFERENCES investigations (id),
+            source VARCHAR(100) NOT NULL,
+            data_type VARCHAR(50),
+            raw_data JSON,
+            processed_data JSON,
+            risk_level VARCHAR(20),
+            ai_confidence FLOAT,
+            collected_at TIMESTAMP WITHOUT TIME ZONE
+        )
+    """)
+    op.execute(f"""
+        INSERT INTO collected_data ({COLUMNS})
+        SELECT id, investigation_id, source, data_type, raw_data::json, processed_data::json,
+               risk_level, ai_confidence, collected_at
+        FROM collected_data_partitioned
+    """)
+    # Supprime aussi toutes les partitions
+    op.execute('DROP TABLE collected_data_partitioned CASCADE')
+
+    drop_index_concurrently('ix_alerts_severity_created', 'alerts')
+    drop_index_concurrently('ix_alerts_investigation_created', 'alerts')
@@ -0,0 +1,35 @@
+"""
+Content-addressed raw payload store (raw_blobs) and collected_data.raw_hash
+
+Les nouvelles lignes stockent leur payload brut dans raw_blobs (compressé,
+dédupliqué) ; les lignes existantes gardent leur raw_data inline.
+Ajout d'une colonne nullable sans défaut : pas de réécriture de table.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-01-27
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'raw_blobs',
+        sa.Column('hash', sa.String(64), primary_key=True),
+        sa.Column('encoding', sa.String(20), nullable=False, server_default='zlib'),
+        sa.Column('data', sa.LargeBinary, nullable=False),
+        sa.Column('size', sa.Integer),
+        sa.Column('created_at', sa.DateTime, server_default=sa.func.now()),
+    )
+    op.add_column('collected_data', sa.Column('raw_hash', sa.String(64)))
+
+
+def downgrade():
+    op.drop_column('collected_data', 'raw_hash')
+    op.drop_table('raw_blobs')
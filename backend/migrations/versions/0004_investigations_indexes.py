@@ -0,0 +1,23 @@
+"""
+Indexes for keyset pagination of investigations (API)
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-02-03
+"""
+from migrations.online import create_index_concurrently, drop_index_concurrently
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    create_index_concurrently('ix_investigations_created', 'investigations', ['created_at', 'id'])
+    create_index_concurrently('ix_investigations_status_created', 'investigations', ['status', 'created_at'])
+
+
+def downgrade():
+    drop_index_concurrently('ix_investigations_status_created', 'investigations')
+    drop_index_concurrently('ix_investigations_created', 'investigations')
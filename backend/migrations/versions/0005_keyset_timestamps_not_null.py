@@ -0,0 +1,38 @@
+"""
+NOT NULL timestamps for keyset pagination, (status, created_at, id) index
+
+Les lignes anciennes sans created_at reçoivent updated_at (investigations) ou
+l'heure de la migration ; la colonne passe ensuite en NOT NULL sans bloquer
+la table. L'index par statut inclut id pour servir le tri (created_at, id).
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-02-10
+"""
+from alembic import op
+
+from migrations.online import create_index_concurrently, drop_index_concurrently, set_not_null
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("UPDATE investigations SET created_at = COALESCE(updated_at, now()) WHERE created_at IS NULL")
+    op.execute("UPDATE alerts SET created_at = now() WHERE created_at IS NULL")
+    set_not_null('investigations', 'created_at')
+    set_not_null('alerts', 'created_at')
+
+    create_index_concurrently('ix_investigations_status_created_id', 'investigations',
+                              ['status', 'created_at', 'id'])
+    drop_index_concurrently('ix_investigations_status_created', 'investigations')
+
+
+def downgrade():
+    create_index_concurrently('ix_investigations_status_created', 'investigations', ['status', 'created_at'])
+    drop_index_concurrently('ix_investigations_status_created_id', 'investigations')
+
+    op.alter_column('alerts', 'created_at', nullable=True)
+    op.alter_column('investigations', 'created_at', nullable=True)
@@ -0,0 +1,30 @@
+"""
+Drop the GIN index on collected_data.raw_data
+
+Depuis le blob store (0003), les nouvelles lignes ont raw_data NULL et leur
+payload dans raw_blobs : l'index ne couvre plus que les lignes anciennes et
+aucune requête ne filtre sur raw_data. Les recherches JSONB passent par
+ix_collected_data_processed_data.
+
+DROP INDEX CONCURRENTLY est refusé sur une table partitionnée : suppression
+directe, le verrou est borné par lock_timeout.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-02-17
+"""
+from alembic import op
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index('ix_collected_data_raw_data', table_name='collected_data', if_exists=True)
+
+
+def downgrade():
+    op.create_index('ix_collected_data_raw_data', 'collected_data', ['raw_data'],
+                    postgresql_using='gin', postgresql_ops={'raw_data': 'jsonb_path_ops'})
@@ -0,0 +1,139 @@
+"""
+Content-addressed storage for raw scraper payloads
+Chaque payload est sérialisé en JSON canonique, compressé (zlib) et stocké une
+seule fois dans raw_blobs sous son sha256 ; collected_data.raw_hash y fait référence.
+Un scan qui renvoie le même document ne réécrit rien.
+"""
+import os
+import json
+import zlib
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import select, event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from models.models import RawBlob, CollectedData
+
+BLOB_COMPRESSION_LEVEL = int(os.getenv('BLOB_COMPRESSION_LEVEL', 6))
+
+# Hashs déjà présents en base (évite un INSERT par scan répété)
+KNOWN_HASHES_MAX = int(os.getenv('BLOB_KNOWN_HASHES', 10000))
+
+
+class _KnownHashes:
+    """Ensemble LRU borné des hashs déjà écrits par ce process"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, blob_hash: str) -> bool:
+        with self._lock:
+            if blob_hash in self._entries:
+                self._entries.move_to_end(blob_hash)
+                return True
+            return False
+
+    def add(self, blob_hash: str):
+        with self._lock:
+            self._entries[blob_hash] = None
+            self._entries.move_to_end(blob_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_known_hashes = _KnownHashes(KNOWN_HASHES_MAX)
+
+# Hashs écrits dans une transaction non commitée (session.info)
+_PENDING_KEY = 'pending_blob_hashes'
+
+
+@event.listens_for(Session, 'after_commit')
+def _remember_committed_hashes(session):
+    for blob_hash in session.info.pop(_PENDING_KEY, ()):
+        _known_hashes.add(blob_hash)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_pending_hashes(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def encode_payload(payload: Any) -> Tuple[str, bytes, int]:
+    """
+    JSON canonique (clés triées) -> (sha256, données compressées, taille brute)
+
+    Deux payloads égaux ont toujours le même hash, quel que soit l'ordre des clés.
+    """
+    raw = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+    return hashlib.sha256(raw).hexdigest(), zlib.compress(raw, BLOB_COMPRESSION_LEVEL), len(raw)
+
+
+def decode_payload(data: bytes, encoding: str = 'zlib') -> Any:
+    """Inverse de encode_payload"""
+    if encoding != 'zlib':
+        raise ValueError(f'Unsupported blob encoding: {encoding}')
+    return json.loads(zlib.decompress(data).decode('utf-8'))
+
+
+def blob_row(payload: Any) -> Dict[str, Any]:
+    """Ligne raw_blobs pour un payload (utilisée aussi par BulkWriter)"""
+    blob_hash, data, size = encode_payload(payload)
+    return {'hash': blob_hash, 'encoding': 'zlib', 'data': data, 'size': size}
+
+
+def insert_blobs_statement(dialect_name: str, rows):
+    """INSERT ... ON CONFLICT DO NOTHING : un blob existant n'est pas réécrit"""
+    insert = pg_insert if dialect_name == 'postgresql' else sqlite_insert
+    return insert(RawBlob).values(rows).on_conflict_do_nothing(index_elements=['hash'])
+
+
+def store_blob(db: Session, payload: Any) -> Optional[str]:
+    """
+    Stocke un payload brut (dédupliqué) et retourne son hash
+
+    L'écriture fait partie de la transaction de la session : à commiter avec
+    la ligne collected_data qui y fait référence.
+    """
+    if payload is None:
+        return None
+
+    row = blob_row(payload)
+    if row['hash'] in _known_hashes:
+        return row['hash']
+
+    db.execute(insert_blobs_statement(db.get_bind().dialect.name, [row]))
+    # Connu seulement après le commit (un rollback annule l'écriture)
+    db.info.setdefault(_PENDING_KEY, set()).add(row['hash'])
+    return row['hash']
+
+
+def is_known(blob_hash: str) -> bool:
+    """Hash déjà écrit en base par ce process"""
+    return blob_hash in _known_hashes
+
+
+def mark_known(blob_hash: str):
+    """Signale un hash écrit en base par un autre chemin (BulkWriter)"""
+    _known_hashes.add(blob_hash)
+
+
+def load_blob(db: Session, blob_hash: str) -> Optional[Any]:
+    """Payload d'un blob (None s'il n'existe pas)"""
+    blob = db.execute(select(RawBlob).where(RawBlob.hash == blob_hash)).scalar_one_or_none()
+    if blob is None:
+        return None
+    return decode_payload(blob.data, blob.encoding)
+
+
+def load_raw_data(db: Session, collected: CollectedData) -> Optional[Any]:
+    """Données brutes d'une ligne collected_data (blob ou ancien stockage inline)"""
+    if collected.raw_hash:
+        return load_blob(db, collected.raw_hash)
+    return collected.raw_data
@@ -0,0 +1,226 @@
+"""
+Bulk persistence for CollectedData and Alert rows
+Les lignes sont accumulées puis écrites en un seul lot par fenêtre de flush
+(COPY sur PostgreSQL/psycopg2, INSERT multi-lignes sinon). Les payloads bruts
+vont dans raw_blobs (compressés, dédupliqués par hash).
+"""
+import io
+import csv
+import json
+import time
+import uuid
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+from sqlalchemy import JSON, insert
+from sqlalchemy.engine import Engine
+
+from models.database import engine as default_engine
+from models.models import CollectedData, Alert
+from models.blobs import blob_row, insert_blobs_statement, is_known, mark_known
+
+logger = logging.getLogger(__name__)
+
+# Marqueur NULL des COPY en CSV (distinct de la chaîne vide)
+COPY_NULL = '\\N'
+
+
+class BulkWriter:
+    """
+    Écrit les résultats et alertes par lots
+
+    Usage:
+        with BulkWriter() as writer:
+            writer.add_result(investigation_id, 'shodan', 'ip_scan', raw, parsed, 'high')
+            writer.add_alert(investigation_id, 'high', 'vulnerabilities_detected', '3 CVE')
+
+    Dans un bloc `with`, un thread écrit les lignes en attente toutes les
+    flush_interval secondes, même si plus rien n'est ajouté. À la sortie du
+    bloc, les lignes en attente sont toujours écrites, y compris si le bloc
+    lève une exception (chaque ligne était complète quand elle a été ajoutée).
+    Sans `with`, flush() doit être appelé explicitement.
+    """
+
+    def __init__(self, engine: Engine = None, flush_size: int = 1000, flush_interval: float = 2.0):
+        """
+        Args:
+            engine: Engine SQLAlchemy (par défaut celui de models.database)
+            flush_size: Nombre de lignes en attente déclenchant un flush
+            flush_interval: Délai max (secondes) entre deux flush
+        """
+        self.engine = engine or default_engine
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._results: List[Dict[str, Any]] = []
+        self._alerts: List[Dict[str, Any]] = []
+        self._blobs: Dict[str, Dict[str, Any]] = {}
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        # Un flush à la fois : les alertes d'un lot ne précèdent jamais les
+        # résultats d'un lot précédent encore en cours d'écriture
+        self._flush_lock = threading.Lock()
+        self._stop: Optional[threading.Event] = None
+        self._flusher: Optional[threading.Thread] = None
+        self.use_copy = self.engine.dialect.name == 'postgresql' and self.engine.dialect.driver == 'psycopg2'
+
+    def add_result(self, investigation_id, source: str, data_type: str = None, raw_data: Dict = None,
+                   processed_data: Dict = None, risk_level: str = None, ai_confidence: float = None,
+                   collected_at: datetime = None) -> uuid.UUID:
+        """Ajoute une ligne collected_data au lot courant (retourne son id)"""
+        row_id = uuid.uuid4()
+        raw_hash = None
+        if raw_data is not None:
+            blob = blob_row(raw_data)
+            raw_hash = blob['hash']
+            if not is_known(raw_hash):
+                with self._lock:
+                    self._blobs.setdefault(raw_hash, blob)
+
+        self._add(self._results, {
+            'id': row_id,
+            'investigation_id': investigation_id,
+            'source': source,
+            'data_type': data_type,
+            'raw_data': None,
+            'raw_hash': raw_hash,
+            'processed_data': processed_data,
+            'risk_level': risk_level,
+            'ai_confidence': ai_confidence,
+            'collected_at': collected_at or datetime.utcnow()
+        })
+        return row_id
+
+    def add_alert(self, investigation_id, severity: str, alert_type: str, title: str,
+                  description: str = None, evidence: Dict = None, created_at: datetime = None) -> uuid.UUID:
+        """Ajoute une alerte au lot courant (retourne son id)"""
+        row_id = uuid.uuid4()
+        self._add(self._alerts, {
+            'id': row_id,
+            'investigation_id': investigation_id,
+            'severity': severity,
+            'alert_type': alert_type,
+            'title': title,
+            'description': description,
+            'evidence': evidence,
+            'created_at': created_at or datetime.utcnow()
+        })
+        return row_id
+
+    def _add(self, buffer: List[Dict[str, Any]], row: Dict[str, Any]):
+        with self._lock:
+            buffer.append(row)
+            pending = len(self._results) + len(self._alerts)
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if pending >= self.flush_size or due:
+            self.flush()
+
+    def flush(self) -> Tuple[int, int]:
+        """
+        Écrit toutes les lignes en attente dans une seule transaction
+
+        Returns:
+            (nombre de résultats, nombre d'alertes) écrits
+        """
+        with self._flush_lock:
+            return self._flush()
+
+    def _flush(self) -> Tuple[int, int]:
+        with self._lock:
+            results, self._results = self._results, []
+            alerts, self._alerts = self._alerts, []
+            blobs, self._blobs = self._blobs, {}
+            self._last_flush = time.monotonic()
+
+        if not results and not alerts:
+            return 0, 0
+
+        with self.engine.begin() as conn:
+            # Blobs déjà présents ignorés (ON CONFLICT DO NOTHING)
+            if blobs:
+                conn.execute(insert_blobs_statement(self.engine.dialect.name, list(blobs.values())))
+
+            # Résultats d'abord : les alertes peuvent y faire référence
+            for table, rows in ((CollectedData.__table__, results), (Alert.__table__, alerts)):
+                if not rows:
+                    continue
+                if self.use_copy:
+                    self._copy(conn, table, rows)
+                else:
+                    conn.execute(insert(table), rows)
+
+        for blob_hash in blobs:
+            mark_known(blob_hash)
+
+        return len(results), len(alerts)
+
+    def _copy(self, conn, table, rows: List[Dict[str, Any]]):
+        """COPY ... FROM STDIN (CSV) via psycopg2"""
+        columns = [column.name for column in table.columns]
+        json_columns = {column.name for column in table.columns if isinstance(column.type, JSON)}
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([
+                _to_copy_value(row.get(name), name in json_columns)
+                for name in columns
+            ])
+        buffer.seek(0)
+
+        cursor = conn.connection.driver_connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+                buffer
+            )
+        finally:
+            cursor.close()
+
+    def _run_flusher(self):
+        """Flush périodique (thread du bloc `with`)"""
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"❌ Bulk flush failed: {e}")
+
+    def __enter__(self):
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._run_flusher, name='bulk-writer-flush', daemon=True)
+        self._flusher.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._flusher.join()
+
+        if exc_type is None:
+            self.flush()
+            return
+
+        # Le bloc a échoué : les lignes déjà ajoutées sont écrites quand même,
+        # sans masquer l'exception d'origine si l'écriture échoue aussi
+        try:
+            results, alerts = self.flush()
+            if results or alerts:
+                logger.warning(f"⚠️  Bulk writer closed on error, {results} result(s) and {alerts} alert(s) written")
+        except Exception as e:
+            logger.error(f"❌ Bulk writer closed on error, pending rows lost: {e}")
+
+
+def _to_copy_value(value: Any, is_json: bool) -> str:
+    """
+    Valeur CSV pour COPY (None -> marqueur NULL explicite)
+
+    En CSV, un champ vide non quoté vaut NULL : sans marqueur, une chaîne
+    vide serait écrite NULL par COPY mais '' par le chemin INSERT.
+    """
+    if value is None:
+        return COPY_NULL
+    if is_json:
+        return json.dumps(value, default=str)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
@@ -0,0 +1,110 @@
+"""
+Schema migrations runner (Alembic)
+Remplace Base.metadata.create_all : chaque évolution du schéma est une
+révision versionnée dans migrations/versions.
+"""
+import logging
+from pathlib import Path
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+
+from models.database import engine
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Schéma créé par l'ancien create_all (avant les migrations)
+BASELINE_REVISION = '0001'
+
+
+def get_alembic_config() -> Config:
+    """Configuration Alembic (utilisable quel que soit le répertoire courant)"""
+    config = Config(str(BACKEND_DIR / 'alembic.ini'))
+    config.set_main_option('script_location', str(BACKEND_DIR / 'migrations'))
+    return config
+
+
+def current_revision() -> Optional[str]:
+    """Révision appliquée à la base (None si jamais migrée)"""
+    with engine.connect() as conn:
+        return MigrationContext.configure(conn).get_current_revision()
+
+
+def head_revision() -> str:
+    """Dernière révision disponible"""
+    return ScriptDirectory.from_config(get_alembic_config()).get_current_head()
+
+
+def _detect_unversioned_schema() -> Optional[str]:
+    """
+    Révision correspondant à une base créée par create_all (sans alembic_version)
+
+    La base est marquée à la plus récente révision dont tous les objets sont
+    présents, puis les révisions suivantes s'appliquent normalement.
+
+    Returns:
+        La révision détectée, None pour une base vide
+    """
+    with engine.connect() as conn:
+        inspector = inspect(conn)
+        if not inspector.has_table('investigations'):
+            return None
+
+        # 0002 : collected_data partitionnée (PostgreSQL uniquement)
+        if conn.dialect.name == 'postgresql':
+            partitioned = conn.execute(text(
+                "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('collected_data')"
+            )).scalar()
+            if not partitioned:
+                return BASELINE_REVISION
+        revision = '0002'
+
+        # 0003 : table raw_blobs et colonne collected_data.raw_hash
+        columns = {column['name'] for column in inspector.get_columns('collected_data')}
+        if not inspector.has_table('raw_blobs') or 'raw_hash' not in columns:
+            return revision
+        revision = '0003'
+
+        # 0004 : index de pagination des investigations
+        indexes = {index['name'] for index in inspector.get_indexes('investigations')}
+        if 'ix_investigations_created' not in indexes:
+            return revision
+        if 'ix_investigations_status_created_id' not in indexes:
+            return '0004' if 'ix_investigations_status_created' in indexes else revision
+
+        # 0005 : created_at NOT NULL et index (status, created_at, id)
+        created_at = next(c for c in inspector.get_columns('investigations') if c['name'] == 'created_at')
+        if created_at['nullable']:
+            return '0004'
+
+        # 0006 : plus d'index GIN sur raw_data
+        collected_indexes = {index['name'] for index in inspector.get_indexes('collected_data')}
+        return '0005' if 'ix_collected_data_raw_data' in collected_indexes else '0006'
+
+
+def upgrade_database(revision: str = 'head') -> Optional[str]:
+    """
+    Applique les migrations jusqu'à `revision`
+
+    Une base créée avant les migrations est d'abord marquée à la révision
+    correspondant à son schéma, puis migrée normalement.
+
+    Returns:
+        Révision de la base après migration
+    """
+    config = get_alembic_config()
+
+    if current_revision() is None:
+        existing = _detect_unversioned_schema()
+        if existing:
+            logger.info(f"📌 Unversioned schema detected, stamping {existing}")
+            command.stamp(config, existing)
+
+    command.upgrade(config, revision)
+    return current_revision()
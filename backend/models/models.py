@@ -1,17 +1,25 @@
 """
 SQLAlchemy models for OSINT Platform
 """
-from sqlalchemy import Column, String, Float, DateTime, JSON, ForeignKey, Integer, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Float, DateTime, JSON, ForeignKey, Integer, Text, Index, DDL, event, LargeBinary
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from datetime import datetime
 import uuid
 from models.database import Base
 
+# JSONB sur PostgreSQL (indexable en GIN), JSON ailleurs
+JSONType = JSON().with_variant(JSONB(), 'postgresql')
+
 
 class Investigation(Base):
     """Modèle pour une investigation OSINT"""
 
     __tablename__ = 'investigations'
+    __table_args__ = (
+        # Listes paginées par l'API (keyset sur created_at, id)
+        Index('ix_investigations_created', 'created_at', 'id'),
+        Index('ix_investigations_status_created_id', 'status', 'created_at', 'id'),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False)
@@ -19,7 +27,7 @@ class Investigation(Base):
     target_value = Column(String(255), nullable=False)
     status = Column(String(50), default='pending')  # 'pending', 'running', 'completed', 'failed'
     risk_score = Column(Float, default=0.0)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     def __repr__(self):
@@ -30,25 +38,55 @@ class CollectedData(Base):
     """Modèle pour les données collectées par les scrapers"""
 
     __tablename__ = 'collected_data'
+    __table_args__ = (
+        Index('ix_collected_data_investigation_collected', 'investigation_id', 'collected_at'),
+        Index('ix_collected_data_source_collected', 'source', 'collected_at'),
+        Index('ix_collected_data_risk_collected', 'risk_level', 'collected_at'),
+        Index('ix_collected_data_processed_data', 'processed_data',
+              postgresql_using='gin', postgresql_ops={'processed_data': 'jsonb_path_ops'}),
+        # Partitions mensuelles (voir models.partitions)
+        {'postgresql_partition_by': 'RANGE (collected_at)'},
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     investigation_id = Column(UUID(as_uuid=True), ForeignKey('investigations.id'), nullable=False)
     source = Column(String(100), nullable=False)  # 'shodan', 'github', 'twitter', etc.
     data_type = Column(String(50))  # 'ip_scan', 'profile', 'leak', etc.
-    raw_data = Column(JSON)  # Données brutes du scraper
-    processed_data = Column(JSON)  # Données traitées/parsed
+    raw_data = Column(JSONType)  # Données brutes inline (lignes antérieures au blob store)
+    raw_hash = Column(String(64))  # Données brutes du scraper : RawBlob.hash (voir models.blobs)
+    processed_data = Column(JSONType)  # Données traitées/parsed
     risk_level = Column(String(20))  # 'low', 'medium', 'high', 'critical'
     ai_confidence = Column(Float)  # Score de confiance de l'IA (0.0 - 1.0)
-    collected_at = Column(DateTime, default=datetime.utcnow)
+    # Clé de partitionnement : fait partie de la clé primaire
+    collected_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
 
     def __repr__(self):
         return f"<CollectedData(id={self.id}, source={self.source}, risk={self.risk_level})>"
 
 
+class RawBlob(Base):
+    """Payload brut compressé, adressé par son contenu (partagé entre scans identiques)"""
+
+    __tablename__ = 'raw_blobs'
+
+    hash = Column(String(64), primary_key=True)  # sha256 du JSON canonique
+    encoding = Column(String(20), nullable=False, default='zlib')
+    data = Column(LargeBinary, nullable=False)  # JSON compressé
+    size = Column(Integer)  # Taille non compressée (octets)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<RawBlob(hash={self.hash[:12]}, size={self.size}, stored={len(self.data or b'')})>"
+
+
 class Alert(Base):
     """Modèle pour les alertes générées automatiquement"""
 
     __tablename__ = 'alerts'
+    __table_args__ = (
+        Index('ix_alerts_investigation_created', 'investigation_id', 'created_at'),
+        Index('ix_alerts_severity_created', 'severity', 'created_at'),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     investigation_id = Column(UUID(as_uuid=True), ForeignKey('investigations.id'), nullable=False)
@@ -57,7 +95,17 @@ class Alert(Base):
     title = Column(String(255), nullable=False)
     description = Column(Text)
     evidence = Column(JSON)  # Preuves/détails de l'alerte
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
     def __repr__(self):
         return f"<Alert(id={self.id}, severity={self.severity}, type={self.alert_type})>"
+
+
+# Partition par défaut à la création de la table (les partitions mensuelles
+# sont créées par models.partitions.ensure_collected_data_partitions)
+event.listen(
+    CollectedData.__table__,
+    'after_create',
+    DDL('CREATE TABLE IF NOT EXISTS collected_data_default PARTITION OF collected_data DEFAULT')
+    .execute_if(dialect='postgresql')
+)
@@ -0,0 +1,76 @@
+"""
+Monthly partitions for the collected_data table
+collected_data est partitionnée par RANGE (collected_at) : une partition par mois,
+plus une partition DEFAULT pour les lignes hors plage.
+"""
+import os
+import logging
+from datetime import datetime, date
+from typing import List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from models.database import engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+# Nombre de mois créés à l'avance
+PARTITION_MONTHS_AHEAD = int(os.getenv('PARTITION_MONTHS_AHEAD', 3))
+
+
+def add_months(day: date, months: int) -> date:
+    """Premier jour du mois décalé de `months`"""
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(month_start: date) -> str:
+    """Nom de la partition d'un mois (collected_data_y2025m01)"""
+    return f"collected_data_y{month_start.year}m{month_start.month:02d}"
+
+
+def month_ranges(start: date, end: date) -> List[Tuple[date, date]]:
+    """Bornes [début, fin) de chaque mois entre start et end (inclus)"""
+    current = date(start.year, start.month, 1)
+    ranges = []
+    while current <= end:
+        following = add_months(current, 1)
+        ranges.append((current, following))
+        current = following
+    return ranges
+
+
+def partition_ddl(month_start: date, month_end: date) -> str:
+    """DDL de création d'une partition mensuelle"""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month_start)} "
+        f"PARTITION OF collected_data "
+        f"FOR VALUES FROM ('{month_start.isoformat()}') TO ('{month_end.isoformat()}')"
+    )
+
+
+def ensure_collected_data_partitions(engine: Engine = None, months_ahead: int = PARTITION_MONTHS_AHEAD) -> List[str]:
+    """
+    Crée les partitions du mois courant et des `months_ahead` mois suivants
+
+    Les partitions doivent exister avant que des lignes n'y arrivent : si la
+    partition DEFAULT contient déjà des lignes du mois, la création échoue.
+
+    Returns:
+        Noms des partitions vérifiées/créées
+    """
+    engine = engine or default_engine
+    if engine.dialect.name != 'postgresql':
+        return []
+
+    today = datetime.utcnow().date()
+    ranges = month_ranges(today, add_months(today, months_ahead))
+
+    with engine.begin() as conn:
+        for month_start, month_end in ranges:
+            conn.execute(text(partition_ddl(month_start, month_end)))
+
+    names = [partition_name(month_start) for month_start, _ in ranges]
+    logger.info(f"✅ collected_data partitions ready: {', '.join(names)}")
+    return names
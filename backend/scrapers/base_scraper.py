@@ -2,14 +2,60 @@
 Base scraper class for all OSINT scrapers
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+from contextvars import ContextVar
+import uuid
 import asyncio
 import logging
+import weakref
+from scrapers.http_client import get_http_client
+from scrapers.rate_limiter import get_rate_limiter
+from scrapers.cache import get_response_cache, make_cache_key
+from scrapers.single_flight import get_single_flight
+from scrapers.policy import call_with_policy, get_policy, is_transient
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# File des résultats partiels de l'appel process_stream() en cours.
+# Propagée automatiquement aux sous-tâches (gather, wait_for) via le contexte.
+_findings_queue: ContextVar[Optional[asyncio.Queue]] = ContextVar('findings_queue', default=None)
+
+
+class _FindingsFanout:
+    """
+    Résultats partiels d'un appel coalescé, relayés à tous ses appelants
+
+    Tient lieu de file pour emit_finding() pendant l'appel partagé : chaque
+    finding est gardé et poussé dans la file de chaque appelant abonné (les
+    abonnés tardifs reçoivent d'abord ceux déjà émis).
+    """
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.findings: List[Dict[str, Any]] = []
+        self.queues: List[asyncio.Queue] = []
+
+    def subscribe(self, queue: asyncio.Queue):
+        for finding in self.findings:
+            queue.put_nowait(finding)
+        self.queues.append(queue)
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        if queue in self.queues:
+            self.queues.remove(queue)
+
+    def put_nowait(self, finding: Dict[str, Any]):
+        self.findings.append(finding)
+        for queue in self.queues:
+            queue.put_nowait(finding)
+
+
+# Appels coalescés en cours, par event loop : clé -> _FindingsFanout
+_fanouts: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, _FindingsFanout]]" = \
+    weakref.WeakKeyDictionary()
+
 
 class BaseScraper(ABC):
     """Classe de base pour tous les scrapers OSINT"""
@@ -17,6 +63,8 @@ class BaseScraper(ABC):
     def __init__(self, config: Dict[str, Any] = None):
         self.config = config or {}
         self.rate_limit = self.config.get('rate_limit', 1)  # requests per second
+        self.http = get_http_client()  # Pool HTTP partagé entre tous les scrapers
+        self.cache = get_response_cache()  # Cache des réponses API (TTL par source)
         logger.info(f"✅ Initializing {self.__class__.__name__}")
 
     @abstractmethod
@@ -45,12 +93,14 @@ class BaseScraper(ABC):
         """
         pass
 
-    async def process(self, target: str) -> Dict[str, Any]:
+    async def process(self, target: str, include_raw: bool = False) -> Dict[str, Any]:
         """
         Pipeline complet : scrape + parse + enrich
 
         Args:
             target: La cible à analyser
+            include_raw: Ajoute le payload brut de scrape() sous 'raw_data'
+                (à stocker via models.blobs)
 
         Returns:
             Dict avec status et données
@@ -66,12 +116,15 @@ class BaseScraper(ABC):
 
             logger.info(f"✅ Successfully processed {target}")
 
-            return {
+            result = {
                 'status': 'success',
                 'target': target,
                 'source': self.__class__.__name__,
                 'data': parsed_data
             }
+            if include_raw:
+                result['raw_data'] = raw_data
+            return result
 
         except Exception as e:
             logger.error(f"❌ Error processing {target}: {str(e)}")
@@ -82,6 +135,235 @@ class BaseScraper(ABC):
                 'error': str(e)
             }
 
-    async def rate_limit_wait(self):
-        """Respecte le rate limit configuré"""
-        await asyncio.sleep(1 / self.rate_limit)
+    async def process_stream(self, target: str, include_raw: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Pipeline en streaming : émet les résultats partiels dès qu'ils sont connus
+
+        Args:
+            target: La cible à analyser
+            include_raw: Voir process()
+
+        Yields:
+            {'type': 'finding', 'kind': ..., 'data': ...} pour chaque fuite,
+            compte, port... trouvé, puis {'type': 'result', ...} avec le
+            résultat complet de process().
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+
+        token = _findings_queue.set(queue)
+        try:
+            task = asyncio.create_task(self.process(target, include_raw=include_raw))
+        finally:
+            _findings_queue.reset(token)
+
+        try:
+            while not task.done() or not queue.empty():
+                if queue.empty():
+                    getter = asyncio.ensure_future(queue.get())
+                    await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+                    if not getter.done():
+                        getter.cancel()
+                        continue
+                    finding = getter.result()
+                else:
+                    finding = queue.get_nowait()
+
+                yield {
+                    'type': 'finding',
+                    'target': target,
+                    'source': self.__class__.__name__,
+                    **finding
+                }
+
+            yield {'type': 'result', **task.result()}
+        finally:
+            # Consommateur parti avant la fin : on arrête le scraping
+            if not task.done():
+                task.cancel()
+
+    def emit_finding(self, kind: str, data: Any):
+        """
+        Publie un résultat partiel (breach, compte, port...) pour process_stream()
+
+        Sans effet quand le scraper est appelé via process().
+        """
+        queue = _findings_queue.get()
+        if queue is not None:
+            queue.put_nowait({'kind': kind, 'data': data})
+
+    @staticmethod
+    def source_error(error: Any = None, status_code: int = None) -> Dict[str, Any]:
+        """
+        Résultat d'erreur d'une source
+
+        Marqué 'transient' pour un 429/5xx, un timeout, une erreur réseau ou un
+        circuit ouvert : la tâche Celery est alors retentée (tasks.scraping).
+
+        Args:
+            error: Message ou exception (défaut : 'Status code: ...')
+            status_code: Statut HTTP de la réponse
+        """
+        result = {'error': str(error) if error is not None else f'Status code: {status_code}'}
+        if is_transient(status_code, error if isinstance(error, BaseException) else None):
+            result['transient'] = True
+        return result
+
+    async def gather_sources(self, sources: Dict[str, Awaitable], timeouts: Dict[str, float] = None,
+                             default_timeout: float = 30) -> Dict[str, Any]:
+        """
+        Interroge plusieurs sources en parallèle, chacune avec sa propre deadline
+
+        Une source lente ou en erreur ne bloque pas les autres : son résultat
+        est remplacé par {'error': ...} et les autres résultats sont conservés.
+
+        Args:
+            sources: {nom: coroutine} des sources à interroger
+            timeouts: {nom: secondes} deadline par source
+            default_timeout: Deadline des sources absentes de timeouts
+
+        Returns:
+            Dict {nom: résultat}
+        """
+        timeouts = timeouts or {}
+        names = list(sources.keys())
+
+        results = await asyncio.gather(
+            *(asyncio.wait_for(sources[name], timeout=timeouts.get(name, default_timeout)) for name in names),
+            return_exceptions=True
+        )
+
+        gathered = {}
+        for name, result in zip(names, results):
+            if isinstance(result, asyncio.TimeoutError):
+                timeout = timeouts.get(name, default_timeout)
+                logger.warning(f"⏱️  {self.__class__.__name__}: source '{name}' timeout ({timeout}s)")
+                gathered[name] = {'error': f'Timeout ({timeout}s exceeded)', 'transient': True}
+            elif isinstance(result, Exception):
+                gathered[name] = self.source_error(result)
+            else:
+                gathered[name] = result
+
+        return gathered
+
+    async def fetch_json(self, provider: str, url: str, *, params: Dict = None, headers: Dict = None,
+                         timeout: float = None, cache_if: Callable[[Any], bool] = None) -> Tuple[int, Any]:
+        """
+        GET JSON sur une API : cache -> politique du provider -> rate limiter -> pool HTTP
+
+        Les réponses 200 sont mises en cache avec le TTL du provider, les 404
+        ("rien trouvé") avec un TTL négatif plus court. Un hit de cache ne
+        consomme pas de quota. Les 429/5xx et erreurs réseau sont retentés
+        selon la politique du provider (scrapers.policy) ; circuit ouvert,
+        CircuitOpenError est levée sans appel.
+
+        Args:
+            provider: Clé du provider ('hibp', 'shodan'...)
+            url: URL de l'API
+            params: Paramètres de query string
+            headers: Headers (clés d'API)
+            timeout: Timeout par tentative (défaut : celui de la politique)
+            cache_if: Filtre supplémentaire sur le corps des réponses 200
+
+        Returns:
+            (status_code, corps JSON ou None)
+        """
+        policy = get_policy(provider)
+        if timeout is not None:
+            policy = policy.replace(timeout=timeout)
+
+        async def attempt(attempt_timeout: float):
+            await self.rate_limit_wait(provider)
+            return await self.http.get(url, params=params, headers=headers, timeout=attempt_timeout)
+
+        async def fetch() -> Dict[str, Any]:
+            response = await call_with_policy(provider, attempt, policy)
+            try:
+                body = response.json()
+            except ValueError:
+                body = None
+            return {'status_code': response.status_code, 'body': body}
+
+        cache_key = make_cache_key(url, params)
+
+        def cached_fetch() -> Awaitable[Dict[str, Any]]:
+            return self.cache.get_or_fetch(
+                provider,
+                cache_key,
+                fetch,
+                cacheable=lambda e: e['status_code'] == 404 or (
+                    e['status_code'] == 200 and (cache_if is None or cache_if(e['body']))
+                ),
+                is_negative=lambda e: e['status_code'] == 404
+            )
+
+        # Requêtes identiques en vol (autres investigations) : un seul appel amont
+        entry = await self.coalesce(provider, cache_key, cached_fetch, ttl=policy.deadline + 5)
+        return entry['status_code'], entry['body']
+
+    async def coalesce(self, source: str, target: str, fn: Callable[[], Awaitable[Any]],
+                       ttl: float = 60) -> Any:
+        """
+        Single-flight : les appels concurrents sur (source, target) partagent
+        un seul appel amont et reçoivent tous son résultat
+
+        Dans le process, et entre workers avec SINGLE_FLIGHT_BACKEND=redis
+        (le résultat doit alors être sérialisable en JSON).
+
+        Les findings émis pendant l'appel (emit_finding) parviennent à chaque
+        appelant : en direct dans le process, sinon rejoués depuis le
+        résultat partagé.
+
+        Args:
+            source: Source interrogée ('hibp', 'holehe'...)
+            target: Cible ou requête (email, pseudo, clé de cache)
+            fn: Coroutine faisant l'appel
+            ttl: Durée max de l'appel (au-delà, les autres le refont)
+        """
+        key = f'{source}:{target}'
+        fanouts = _fanouts.setdefault(asyncio.get_running_loop(), {})
+        fanout = fanouts.get(key)
+        if fanout is None:
+            fanout = fanouts[key] = _FindingsFanout()
+
+        queue = _findings_queue.get()
+        if queue is not None:
+            fanout.subscribe(queue)
+
+        async def shared_call() -> Dict[str, Any]:
+            # Findings de l'appel partagé : vers tous les abonnés, pas
+            # seulement le premier appelant (dont la tâche a copié le contexte)
+            token = _findings_queue.set(fanout)
+            try:
+                value = await fn()
+            finally:
+                _findings_queue.reset(token)
+                if fanouts.get(key) is fanout:
+                    del fanouts[key]  # Appelants suivants : nouvel appel
+            return {'value': value, 'findings': fanout.findings, 'flight': fanout.id}
+
+        try:
+            shared = await get_single_flight().do(key, shared_call, ttl=ttl)
+        finally:
+            if queue is not None:
+                fanout.unsubscribe(queue)
+            if not fanout.queues and fanouts.get(key) is fanout:
+                del fanouts[key]
+
+        if queue is not None and shared['flight'] != fanout.id:
+            # Appel fait par un autre worker (ou un appel précédent) : findings rejoués
+            for finding in shared['findings']:
+                queue.put_nowait(finding)
+        return shared['value']
+
+    async def rate_limit_wait(self, provider: str = None):
+        """
+        Respecte le quota du provider (token bucket partagé entre scrapers)
+
+        Args:
+            provider: Clé du provider ('hibp', 'shodan'...). Par défaut le nom
+                du scraper, limité à self.rate_limit requêtes/seconde.
+        """
+        await get_rate_limiter().acquire(
+            provider or self.__class__.__name__.lower(),
+            default=(self.rate_limit, 1)
+        )
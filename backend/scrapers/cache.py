@@ -0,0 +1,340 @@
+"""
+Persistent response cache with TTL for remote OSINT lookups
+Deux niveaux : LRU en mémoire + SQLite (local) ou Redis (partagé)
+"""
+import os
+import json
+import time
+import sqlite3
+import asyncio
+import hashlib
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Awaitable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Durée de vie des réponses par source (secondes)
+SOURCE_TTLS = {
+    'hibp': 24 * 3600,
+    'hunter': 7 * 24 * 3600,
+    'emailrep': 24 * 3600,
+    'shodan': 24 * 3600,
+    'virustotal': 6 * 3600,
+    'numverify': 30 * 24 * 3600,
+    'github': 24 * 3600,
+    'github_etag': 30 * 24 * 3600,   # ETag + profil : revalidés par If-None-Match
+}
+DEFAULT_TTL = 3600
+
+# Durée de vie des réponses négatives (404 : "pas de fuite", "pas d'info")
+NEGATIVE_TTLS = {
+    'hibp': 6 * 3600,
+    'shodan': 6 * 3600,
+    'github': 6 * 3600,
+}
+DEFAULT_NEGATIVE_TTL = 3600
+
+# Paramètres jamais inclus dans les clés de cache
+SECRET_PARAMS = {'key', 'api_key', 'apikey', 'access_key', 'token'}
+
+
+def make_cache_key(url: str, params: Dict = None) -> str:
+    """Clé de cache d'une requête (sans les clés d'API, hashée)"""
+    params = {k: v for k, v in (params or {}).items() if k.lower() not in SECRET_PARAMS}
+    raw = url + '?' + json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class MemoryLRUCache:
+    """Cache LRU en mémoire avec expiration"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value, expires_at
+
+    def set(self, key: str, value: Any, ttl: float):
+        with self._lock:
+            self._data[key] = (value, time.time() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+
+class SQLiteCache:
+    """Cache persistant sur disque (un seul hôte)"""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS response_cache '
+            '(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+        )
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, expires_at FROM response_cache WHERE key = ?', (key,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, ttl: float):
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO response_cache (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, json.dumps(value, default=str), time.time() + ttl)
+            )
+
+    # Disque local, requêtes de l'ordre de la milliseconde : appel direct
+    async def get_async(self, key: str) -> Optional[Tuple[Any, float]]:
+        return self.get(key)
+
+    async def set_async(self, key: str, value: Any, ttl: float):
+        self.set(key, value, ttl)
+
+    def purge_expired(self) -> int:
+        """Supprime les entrées expirées"""
+        with self._lock:
+            return self._conn.execute(
+                'DELETE FROM response_cache WHERE expires_at < ?', (time.time(),)
+            ).rowcount
+
+
+class RedisCache:
+    """
+    Cache partagé entre workers via Redis
+
+    Client synchrone pour get_or_fetch_sync, redis.asyncio (un client par
+    event loop) pour le chemin async : une lecture lente ne bloque pas la loop.
+    """
+
+    def __init__(self, redis_url: str = None, prefix: str = 'osint:cache'):
+        import redis
+
+        self.redis_url = redis_url or os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(self.redis_url, socket_timeout=1)
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    def _async_redis(self):
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            import redis.asyncio as aioredis
+            client = self._async_clients[loop] = aioredis.from_url(self.redis_url, socket_timeout=1)
+        return client
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        pipe = self._redis.pipeline()
+        pipe.get(f'{self.prefix}:{key}')
+        pipe.ttl(f'{self.prefix}:{key}')
+        raw, ttl = pipe.execute()
+        if raw is None:
+            return None
+        return json.loads(raw), time.time() + max(ttl, 0)
+
+    def set(self, key: str, value: Any, ttl: float):
+        self._redis.set(f'{self.prefix}:{key}', json.dumps(value, default=str), ex=max(int(ttl), 1))
+
+    async def get_async(self, key: str) -> Optional[Tuple[Any, float]]:
+        async with self._async_redis().pipeline() as pipe:
+            raw, ttl = await pipe.get(f'{self.prefix}:{key}').ttl(f'{self.prefix}:{key}').execute()
+        if raw is None:
+            return None
+        return json.loads(raw), time.time() + max(ttl, 0)
+
+    async def set_async(self, key: str, value: Any, ttl: float):
+        await self._async_redis().set(f'{self.prefix}:{key}', json.dumps(value, default=str), ex=max(int(ttl), 1))
+
+
+class ResponseCache:
+    """
+    Cache à deux niveaux pour les réponses des APIs OSINT
+
+    Les valeurs sont stockées avec un drapeau 'negative' (ex: 404 HIBP) pour
+    appliquer un TTL plus court aux réponses "rien trouvé".
+    """
+
+    def __init__(self, persistent=None, max_memory_entries: int = 10000):
+        self.memory = MemoryLRUCache(max_memory_entries)
+        self.persistent = persistent
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, source: str, counter: str):
+        with self._stats_lock:
+            source_stats = self.stats.setdefault(source, {'hits': 0, 'negative_hits': 0, 'misses': 0})
+            source_stats[counter] += 1
+
+    def _promote(self, full_key: str, cached: Optional[Tuple[Any, float]]) -> Optional[Dict]:
+        """Promotion dans le LRU pour le reste de la durée de vie"""
+        if cached is None:
+            return None
+        self.memory.set(full_key, cached[0], cached[1] - time.time())
+        return cached[0]
+
+    def get(self, source: str, key: str) -> Optional[Dict]:
+        """Retourne l'entrée {'value', 'negative'} ou None"""
+        full_key = f'{source}:{key}'
+
+        cached = self.memory.get(full_key)
+        if cached is not None:
+            return cached[0]
+        if self.persistent is None:
+            return None
+        try:
+            return self._promote(full_key, self.persistent.get(full_key))
+        except Exception as e:
+            logger.warning(f"⚠️  Cache read failed ({e})")
+            return None
+
+    async def get_async(self, source: str, key: str) -> Optional[Dict]:
+        """Version async de get (ne bloque pas l'event loop sur Redis)"""
+        full_key = f'{source}:{key}'
+
+        cached = self.memory.get(full_key)
+        if cached is not None:
+            return cached[0]
+        if self.persistent is None:
+            return None
+        try:
+            return self._promote(full_key, await self.persistent.get_async(full_key))
+        except Exception as e:
+            logger.warning(f"⚠️  Cache read failed ({e})")
+            return None
+
+    def _entry(self, source: str, key: str, value: Any, negative: bool) -> Tuple[str, Dict, float]:
+        """Entrée mise en mémoire, avec le TTL de la source"""
+        if negative:
+            ttl = NEGATIVE_TTLS.get(source, DEFAULT_NEGATIVE_TTL)
+        else:
+            ttl = SOURCE_TTLS.get(source, DEFAULT_TTL)
+
+        full_key = f'{source}:{key}'
+        entry = {'value': value, 'negative': negative}
+        self.memory.set(full_key, entry, ttl)
+        return full_key, entry, ttl
+
+    def set(self, source: str, key: str, value: Any, negative: bool = False):
+        """Enregistre une valeur avec le TTL de la source"""
+        full_key, entry, ttl = self._entry(source, key, value, negative)
+        if self.persistent is not None:
+            try:
+                self.persistent.set(full_key, entry, ttl)
+            except Exception as e:
+                logger.warning(f"⚠️  Cache write failed ({e})")
+
+    async def set_async(self, source: str, key: str, value: Any, negative: bool = False):
+        """Version async de set"""
+        full_key, entry, ttl = self._entry(source, key, value, negative)
+        if self.persistent is not None:
+            try:
+                await self.persistent.set_async(full_key, entry, ttl)
+            except Exception as e:
+                logger.warning(f"⚠️  Cache write failed ({e})")
+
+    def _count_lookup(self, source: str, entry: Optional[Dict]) -> Optional[Dict]:
+        if entry is None:
+            self._count(source, 'misses')
+        else:
+            self._count(source, 'negative_hits' if entry['negative'] else 'hits')
+        return entry
+
+    async def get_or_fetch(self, source: str, key: str, fetch: Callable[[], Awaitable[Any]],
+                           cacheable: Callable[[Any], bool] = None,
+                           is_negative: Callable[[Any], bool] = None) -> Any:
+        """
+        Retourne la valeur en cache ou l'obtient via fetch()
+
+        Args:
+            source: Provider ('hibp', 'shodan'...) - détermine le TTL
+            key: Clé de la requête (voir make_cache_key)
+            fetch: Coroutine qui interroge la source
+            cacheable: Filtre des valeurs à mettre en cache (erreurs exclues)
+            is_negative: Détecte une réponse "rien trouvé"
+
+        Returns:
+            La valeur (en cache ou fraîche)
+        """
+        entry = self._count_lookup(source, await self.get_async(source, key))
+        if entry is not None:
+            return entry['value']
+
+        value = await fetch()
+        if cacheable is None or cacheable(value):
+            await self.set_async(source, key, value, negative=bool(is_negative and is_negative(value)))
+        return value
+
+    def get_or_fetch_sync(self, source: str, key: str, fetch: Callable[[], Any],
+                          cacheable: Callable[[Any], bool] = None,
+                          is_negative: Callable[[Any], bool] = None) -> Any:
+        """Version synchrone de get_or_fetch (clients basés sur requests)"""
+        entry = self._count_lookup(source, self.get(source, key))
+        if entry is not None:
+            return entry['value']
+
+        value = fetch()
+        if cacheable is None or cacheable(value):
+            self.set(source, key, value, negative=bool(is_negative and is_negative(value)))
+        return value
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hits/misses par source (chaque hit = une requête API économisée)"""
+        with self._stats_lock:
+            report = {}
+            for source, counters in self.stats.items():
+                total = counters['hits'] + counters['negative_hits'] + counters['misses']
+                report[source] = {
+                    **counters,
+                    'hit_rate': round((counters['hits'] + counters['negative_hits']) / total, 3) if total else 0.0
+                }
+            return report
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Retourne le cache du process
+
+    CACHE_BACKEND : 'sqlite' (défaut), 'redis' (partagé entre workers)
+    ou 'memory' (pas de persistance).
+    """
+    global _response_cache
+    if _response_cache is None:
+        backend = os.getenv('CACHE_BACKEND', 'sqlite').lower()
+        persistent = None
+
+        try:
+            if backend == 'sqlite':
+                default_path = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'cache', 'responses.db')
+                persistent = SQLiteCache(os.getenv('CACHE_SQLITE_PATH', default_path))
+            elif backend == 'redis':
+                persistent = RedisCache()
+        except Exception as e:
+            logger.warning(f"⚠️  Persistent cache unavailable ({e}), using memory only")
+
+        _response_cache = ResponseCache(persistent, int(os.getenv('CACHE_MEMORY_ENTRIES', 10000)))
+    return _response_cache
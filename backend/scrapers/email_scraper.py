@@ -3,11 +3,11 @@ Email OSINT Scraper - Complete email profiling
 Uses: HaveIBeenPwned, Hunter.io, EmailRep, Holehe
 """
 import os
-import requests
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
 from scrapers.base_scraper import BaseScraper
-import subprocess
+from scrapers.subprocess_runner import run_tool
+from scrapers.policy import get_policy
 import json
 
 load_dotenv()
@@ -16,10 +16,25 @@ load_dotenv()
 class EmailScraper(BaseScraper):
     """Scraper OSINT complet pour emails"""
 
-    def __init__(self):
+    # Deadline par source (secondes) : celle de la politique du provider,
+    # retries compris, plus une marge (cache, rate limiter)
+    SOURCE_TIMEOUTS = {
+        'breaches': get_policy('hibp').deadline + 5,
+        'email_validation': get_policy('hunter').deadline + 5,
+        'email_reputation': get_policy('emailrep').deadline + 5,
+        'social_accounts': get_policy('holehe').deadline + 15
+    }
+
+    def __init__(self, use_holehe: bool = True):
+        """
+        Args:
+            use_holehe: Lancer Holehe dans scrape() (désactivé quand Holehe
+                tourne dans une tâche séparée, sur la file des outils lents)
+        """
         super().__init__({'rate_limit': 1})
         self.hibp_api_key = os.getenv('HIBP_API_KEY')
         self.hunter_api_key = os.getenv('HUNTER_IO_KEY')
+        self.use_holehe = use_holehe
 
     async def scrape(self, email: str) -> Dict[str, Any]:
         """
@@ -31,35 +46,40 @@ class EmailScraper(BaseScraper):
         Returns:
             Dict avec toutes les données collectées
         """
-        results = {
-            'email': email,
-            'breaches': await self._check_hibp(email),
-            'email_validation': await self._validate_email(email),
-            'email_reputation': await self._check_emailrep(email),
-            'social_accounts': await self._find_accounts(email)
+        sources = {
+            'breaches': self._check_hibp(email),
+            'email_validation': self._validate_email(email),
+            'email_reputation': self._check_emailrep(email)
         }
+        if self.use_holehe:
+            sources['social_accounts'] = self._find_accounts(email)
+
+        # Toutes les sources en parallèle : la latence est celle de la plus lente
+        results = await self.gather_sources(sources, timeouts=self.SOURCE_TIMEOUTS)
+        results.setdefault('social_accounts', {'skipped': 'Holehe disabled'})
 
-        return results
+        # HIBP renvoie une liste : une erreur (timeout) doit garder ce format
+        if isinstance(results['breaches'], dict):
+            results['breaches'] = [results['breaches']]
+
+        return {'email': email, **results}
 
     async def _check_hibp(self, email: str) -> List[Dict]:
         """Vérifie les fuites sur HaveIBeenPwned"""
         try:
-            await self.rate_limit_wait()
-
             url = f"https://haveibeenpwned.com/api/v3/breachedaccount/{email}"
             headers = {}
 
             if self.hibp_api_key:
                 headers['hibp-api-key'] = self.hibp_api_key
 
-            response = requests.get(url, headers=headers, timeout=10)
+            status_code, breaches = await self.fetch_json('hibp', url, headers=headers)
 
-            if response.status_code == 404:
+            if status_code == 404:
                 return []  # Pas de fuites
 
-            if response.status_code == 200:
-                breaches = response.json()
-                return [
+            if status_code == 200:
+                breaches = [
                     {
                         'name': breach.get('Name'),
                         'title': breach.get('Title'),
@@ -72,10 +92,13 @@ class EmailScraper(BaseScraper):
                     }
                     for breach in breaches
                 ]
+                for breach in breaches:
+                    self.emit_finding('breach', breach)
+                return breaches
 
-            return []
+            return [self.source_error(status_code=status_code)]
         except Exception as e:
-            return [{'error': str(e)}]
+            return [self.source_error(e)]
 
     async def _validate_email(self, email: str) -> Dict:
         """Valide l'email avec Hunter.io"""
@@ -83,19 +106,17 @@ class EmailScraper(BaseScraper):
             if not self.hunter_api_key:
                 return {'error': 'Hunter.io API key not configured'}
 
-            await self.rate_limit_wait()
-
             url = f"https://api.hunter.io/v2/email-verifier"
             params = {
                 'email': email,
                 'api_key': self.hunter_api_key
             }
 
-            response = requests.get(url, params=params, timeout=10)
+            status_code, body = await self.fetch_json('hunter', url, params=params)
 
-            if response.status_code == 200:
-                data = response.json().get('data', {})
-                return {
+            if status_code == 200:
+                data = body.get('data', {})
+                validation = {
                     'valid': data.get('status') == 'valid',
                     'score': data.get('score'),
                     'regexp': data.get('regexp'),
@@ -106,70 +127,90 @@ class EmailScraper(BaseScraper):
                     'smtp_server': data.get('smtp_server'),
                     'smtp_check': data.get('smtp_check')
                 }
+                self.emit_finding('email_validation', validation)
+                return validation
 
-            return {'error': f'Status code: {response.status_code}'}
+            return self.source_error(status_code=status_code)
         except Exception as e:
-            return {'error': str(e)}
+            return self.source_error(e)
 
     async def _check_emailrep(self, email: str) -> Dict:
         """Vérifie la réputation de l'email"""
         try:
-            await self.rate_limit_wait()
-
             url = f"https://emailrep.io/{email}"
-            response = requests.get(url, timeout=10)
+            status_code, data = await self.fetch_json('emailrep', url)
 
-            if response.status_code == 200:
-                data = response.json()
-                return {
+            if status_code == 200:
+                reputation = {
                     'reputation': data.get('reputation'),
                     'suspicious': data.get('suspicious'),
                     'references': data.get('references'),
                     'details': data.get('details', {})
                 }
+                self.emit_finding('email_reputation', reputation)
+                return reputation
 
-            return {'error': f'Status code: {response.status_code}'}
+            return self.source_error(status_code=status_code)
         except Exception as e:
-            return {'error': str(e)}
+            return self.source_error(e)
 
     async def _find_accounts(self, email: str) -> Dict:
         """
         Trouve tous les comptes liés à l'email avec Holehe
 
+        Un seul Holehe par email à la fois : les investigations concurrentes
+        sur le même email partagent le même run.
+
         Note: Nécessite holehe installé: pip install holehe
         """
+        return await self.coalesce('holehe', email, lambda: self._run_holehe(email),
+                                   ttl=self.SOURCE_TIMEOUTS['social_accounts'])
+
+    async def _run_holehe(self, email: str) -> Dict:
+        """Lance Holehe (comptes streamés via emit_finding)"""
+        accounts_found = []
+
+        def on_line(line: str):
+            # Comptes récupérés au fil de l'eau (conservés même en cas de timeout)
+            platform = self._parse_holehe_line(line)
+            if platform:
+                accounts_found.append(platform)
+                self.emit_finding('account', {'platform': platform})
+
+        timeout = get_policy('holehe').deadline
         try:
-            # Vérifier si holehe est installé
-            result = subprocess.run(
+            result = await run_tool(
                 ['holehe', email, '--only-used', '--no-color'],
-                capture_output=True,
-                text=True,
-                timeout=60
+                timeout=timeout,
+                on_line=on_line
             )
 
-            if result.returncode == 0:
-                # Parser la sortie de holehe
-                accounts_found = []
-                for line in result.stdout.split('\n'):
-                    if '[+]' in line:
-                        # Format: [+] Twitter: https://twitter.com/...
-                        parts = line.split('[+]')[1].strip().split(':')
-                        if len(parts) >= 2:
-                            platform = parts[0].strip()
-                            accounts_found.append(platform)
-
+            if result['returncode'] == 0 or (result['timed_out'] and accounts_found):
                 return {
                     'found': len(accounts_found),
                     'platforms': accounts_found,
-                    'raw_output': result.stdout
+                    'partial': result['timed_out'],
+                    'raw_output': result['stdout']
                 }
 
-            return {'error': 'Holehe not installed or failed', 'stderr': result.stderr}
+            if result['timed_out']:
+                return {'error': f'Holehe timeout ({timeout:.0f}s exceeded)'}
+
+            return {'error': 'Holehe not installed or failed', 'stderr': result['stderr']}
         except FileNotFoundError:
             return {'error': 'Holehe not installed. Install with: pip install holehe'}
         except Exception as e:
             return {'error': str(e)}
 
+    def _parse_holehe_line(self, line: str) -> Optional[str]:
+        """Extrait la plateforme d'une ligne Holehe ('[+] Twitter: https://...')"""
+        if '[+]' not in line:
+            return None
+        parts = line.split('[+]')[1].strip().split(':')
+        if len(parts) >= 2:
+            return parts[0].strip()
+        return None
+
     def parse(self, raw_data: Dict) -> Dict[str, Any]:
         """Parse les données email"""
         email = raw_data.get('email')
@@ -224,6 +265,7 @@ class EmailScraper(BaseScraper):
 # Test
 if __name__ == "__main__":
     import asyncio
+    from scrapers.http_client import close_http_client
 
     async def test():
         print("=" * 70)
@@ -278,4 +320,6 @@ if __name__ == "__main__":
 
         print("\n" + "=" * 70)
 
+        await close_http_client()
+
     asyncio.run(test())
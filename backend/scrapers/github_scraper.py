@@ -0,0 +1,483 @@
+"""
+GitHub OSINT Scraper - profil, dépôts, organisations, emails de commit
+Uses: GitHub GraphQL API (un appel pour GRAPHQL_BATCH_SIZE usernames), REST
+avec requêtes conditionnelles (ETag) quand aucun token n'est configuré
+"""
+import os
+import time
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+from dotenv import load_dotenv
+from scrapers.base_scraper import BaseScraper
+from scrapers.cache import make_cache_key
+from scrapers.policy import call_with_policy
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+GRAPHQL_URL = 'https://api.github.com/graphql'
+REST_USER_URL = 'https://api.github.com/users/{}'
+
+# Usernames résolus par requête GraphQL (un alias user(login:) chacun)
+GRAPHQL_BATCH_SIZE = int(os.getenv('GITHUB_GRAPHQL_BATCH_SIZE', 25))
+
+# Délai pendant lequel les scrape() concurrents sont regroupés en un lot
+BATCH_WINDOW = 0.05
+
+# Quota restant sous lequel on attend le reset de la fenêtre GitHub,
+# et attente maximale acceptée (au-delà, les lookups restants échouent)
+RATE_LIMIT_RESERVE = 10
+MAX_RATE_LIMIT_WAIT = float(os.getenv('GITHUB_MAX_RATE_LIMIT_WAIT', 60))
+
+REPOS_PER_USER = 10
+COMMITS_PER_REPO = 20
+ORGS_PER_USER = 20
+
+_USER_FRAGMENT = """
+fragment UserFields on User {
+  login name bio company location email websiteUrl twitterUsername createdAt url
+  followers { totalCount }
+  following { totalCount }
+  organizations(first: %(orgs)d) { nodes { login name url } }
+  repositories(first: %(repos)d, ownerAffiliations: OWNER, isFork: false,
+               orderBy: {field: PUSHED_AT, direction: DESC}) {
+    totalCount
+    nodes {
+      nameWithOwner url description stargazerCount forkCount pushedAt
+      primaryLanguage { name }
+      defaultBranchRef {
+        target {
+          ... on Commit {
+            history(first: %(commits)d) { nodes { author { name email user { login } } } }
+          }
+        }
+      }
+    }
+  }
+}
+""" % {'orgs': ORGS_PER_USER, 'repos': REPOS_PER_USER, 'commits': COMMITS_PER_REPO}
+
+
+class GitHubRateLimitError(Exception):
+    """Quota GitHub épuisé pour plus de MAX_RATE_LIMIT_WAIT secondes"""
+
+
+def build_users_query(logins: List[str]) -> Tuple[str, Dict[str, str]]:
+    """
+    Requête GraphQL résolvant plusieurs usernames (alias u0, u1...)
+
+    Les logins passent en variables : aucune valeur n'est interpolée dans la requête.
+    """
+    params = ', '.join(f'$l{i}: String!' for i in range(len(logins)))
+    fields = '\n'.join(f'  u{i}: user(login: $l{i}) {{ ...UserFields }}' for i in range(len(logins)))
+    query = f'query({params}) {{\n{fields}\n  rateLimit {{ cost remaining resetAt }}\n}}\n{_USER_FRAGMENT}'
+    return query, {f'l{i}': login for i, login in enumerate(logins)}
+
+
+def _header(headers: Dict[str, str], name: str) -> Optional[str]:
+    """Lecture d'un header sans tenir compte de la casse"""
+    name = name.lower()
+    for key, value in (headers or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+class GitHubScraper(BaseScraper):
+    """Scraper GitHub : enrichissement de usernames par lots"""
+
+    def __init__(self):
+        super().__init__({'rate_limit': 1})
+        self.token = os.getenv('GITHUB_TOKEN')
+
+        # Quota GitHub d'après les derniers headers X-RateLimit-*
+        self.rate_remaining: Optional[int] = None
+        self.rate_reset_at: Optional[float] = None
+
+        self.stats = {'graphql_requests': 0, 'rest_requests': 0, 'not_modified': 0, 'cached': 0}
+
+        # Lot en cours de constitution (scrape() concurrents)
+        self._waiting: Dict[str, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    async def scrape(self, username: str) -> Dict[str, Any]:
+        """
+        Enrichit un username GitHub
+
+        Les appels concurrents (batch_runner, investigations parallèles) sont
+        regroupés : un seul appel GraphQL pour GRAPHQL_BATCH_SIZE usernames.
+
+        Args:
+            username: Le login GitHub
+
+        Returns:
+            Dict avec le profil brut (GraphQL ou REST)
+        """
+        login = username.strip().lstrip('@')
+        cached = await self._cached(login)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        future = self._waiting.get(login)
+        if future is None:
+            future = loop.create_future()
+            self._waiting[login] = future
+            if len(self._waiting) >= GRAPHQL_BATCH_SIZE:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(BATCH_WINDOW, self._flush)
+
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        """Envoie le lot en cours"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._waiting = self._waiting, {}
+        if batch:
+            asyncio.ensure_future(self._resolve(batch))
+
+    async def _resolve(self, batch: Dict[str, asyncio.Future]):
+        try:
+            results = await self.enrich_many(list(batch))
+        except Exception as e:
+            results = {login: {'login': login, 'error': str(e)} for login in batch}
+
+        for login, future in batch.items():
+            if not future.done():
+                future.set_result(results.get(login, {'login': login, 'error': 'No result'}))
+
+    async def enrich_many(self, usernames: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Enrichit une liste de usernames
+
+        Profils en cache : aucune requête. Avec GITHUB_TOKEN : GraphQL par
+        lots de GRAPHQL_BATCH_SIZE. Sans token : REST, avec If-None-Match
+        (un 304 ne consomme pas de quota).
+
+        Args:
+            usernames: Logins GitHub
+
+        Returns:
+            {login: profil brut}
+        """
+        results = {}
+        missing = []
+        for login in dict.fromkeys(u.strip().lstrip('@') for u in usernames if u and u.strip()):
+            cached = await self._cached(login)
+            if cached is not None:
+                results[login] = cached
+            else:
+                missing.append(login)
+
+        if not missing:
+            return results
+
+        if not self.token:
+            fetched = await asyncio.gather(*(self._fetch_rest(login) for login in missing))
+            results.update(zip(missing, fetched))
+            return results
+
+        for start in range(0, len(missing), GRAPHQL_BATCH_SIZE):
+            batch = missing[start:start + GRAPHQL_BATCH_SIZE]
+            try:
+                results.update(await self._fetch_graphql(batch))
+            except GitHubRateLimitError as e:
+                logger.warning(f"⚠️  GitHub: {e}, {len(missing) - start} usernames not enriched")
+                results.update({login: {'login': login, 'error': str(e)} for login in missing[start:]})
+                break
+            except Exception as e:
+                results.update({login: {'login': login, 'error': str(e)} for login in batch})
+
+        return results
+
+    def _cache_key(self, login: str) -> str:
+        return make_cache_key(GRAPHQL_URL, {'login': login.lower()})
+
+    async def _cached(self, login: str) -> Optional[Dict[str, Any]]:
+        entry = await self.cache.get_async('github', self._cache_key(login))
+        if entry is None:
+            return None
+        self.stats['cached'] += 1
+        return entry['value']
+
+    async def _store(self, raw: Dict[str, Any]):
+        await self.cache.set_async('github', self._cache_key(raw['login']), raw, negative=not raw.get('found'))
+
+    def _update_rate_limit(self, headers: Dict[str, str]):
+        """Mémorise le quota restant annoncé par GitHub"""
+        remaining = _header(headers, 'X-RateLimit-Remaining')
+        reset = _header(headers, 'X-RateLimit-Reset')
+        if remaining is not None and reset is not None:
+            self.rate_remaining = int(remaining)
+            self.rate_reset_at = float(reset)
+
+    async def _wait_for_quota(self, retry_after: float = None):
+        """Attend le reset de la fenêtre GitHub si le quota est (presque) épuisé"""
+        if retry_after is None:
+            if self.rate_remaining is None or self.rate_remaining > RATE_LIMIT_RESERVE:
+                return
+            retry_after = (self.rate_reset_at or 0) - time.time()
+            if retry_after <= 0:
+                return
+
+        if retry_after > MAX_RATE_LIMIT_WAIT:
+            raise GitHubRateLimitError(f'rate limit exhausted, reset in {retry_after:.0f}s')
+
+        logger.info(f"⏳ GitHub rate limit: waiting {retry_after:.0f}s")
+        await asyncio.sleep(retry_after)
+        self.rate_remaining = None
+
+    def _rate_limited_delay(self, response) -> Optional[float]:
+        """Délai imposé par un 403/429 de rate limit GitHub (primaire ou secondaire)"""
+        if response.status_code not in (403, 429):
+            return None
+        retry_after = _header(response.headers, 'Retry-After')
+        if retry_after is not None:
+            return float(retry_after)
+        if _header(response.headers, 'X-RateLimit-Remaining') == '0':
+            return max(0.0, float(_header(response.headers, 'X-RateLimit-Reset') or 0) - time.time())
+        return None
+
+    async def _request(self, method: str, url: str, **kwargs):
+        """Appel GitHub : quota GitHub, rate limiter, politique 'github' (une reprise après un 403 de rate limit)"""
+        async def attempt(timeout: float):
+            await self.rate_limit_wait('github')
+            return await self.http.request(method, url, timeout=timeout, **kwargs)
+
+        for _ in range(2):
+            await self._wait_for_quota()
+            response = await call_with_policy('github', attempt)
+            self._update_rate_limit(response.headers)
+
+            delay = self._rate_limited_delay(response)
+            if delay is None:
+                return response
+            await self._wait_for_quota(retry_after=delay)
+
+        return response
+
+    async def _fetch_graphql(self, logins: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Résout un lot de usernames en un appel GraphQL"""
+        query, variables = build_users_query(logins)
+        response = await self._request(
+            'POST', GRAPHQL_URL,
+            json_body={'query': query, 'variables': variables},
+            headers={'Authorization': f'bearer {self.token}'}
+        )
+        self.stats['graphql_requests'] += 1
+
+        if response.status_code != 200:
+            raise Exception(f'GitHub GraphQL: HTTP {response.status_code}')
+
+        body = response.json()
+        data = body.get('data') or {}
+
+        # Erreurs par alias (path[0] = 'u3') ; sans path, elles touchent tout le lot
+        errors: Dict[Optional[str], List[Dict[str, Any]]] = {}
+        for error in body.get('errors') or []:
+            if error.get('type') == 'RATE_LIMITED':
+                raise GitHubRateLimitError('GraphQL rate limit exhausted')
+            path = error.get('path') or [None]
+            errors.setdefault(path[0], []).append(error)
+            if error.get('type') != 'NOT_FOUND':
+                logger.warning(f"⚠️  GitHub GraphQL: {error.get('message')}")
+
+        rate = data.get('rateLimit')
+        if rate:
+            self.rate_remaining = rate['remaining']
+
+        results = {}
+        for i, login in enumerate(logins):
+            alias = f'u{i}'
+            user = data.get(alias)
+            alias_errors = errors.get(alias, []) + errors.get(None, [])
+
+            if user is None and not any(e.get('type') == 'NOT_FOUND' and e.get('path') == [alias]
+                                        for e in alias_errors):
+                # FORBIDDEN, timeout, erreur interne : ni "introuvable", ni mis en cache
+                message = alias_errors[0].get('message') if alias_errors else 'no data returned'
+                results[login] = {'login': login, 'error': f'GitHub GraphQL: {message}'}
+                continue
+
+            raw = {'login': login, 'found': user is not None, 'source': 'graphql', 'user': user}
+            if alias_errors and user is not None:
+                raw['partial'] = True  # Champs manquants : résultat non mis en cache
+            else:
+                await self._store(raw)
+            results[login] = raw
+        return results
+
+    async def _fetch_rest(self, login: str) -> Dict[str, Any]:
+        """Profil REST avec requête conditionnelle (ETag mémorisé 30 jours)"""
+        url = REST_USER_URL.format(login)
+        etag_key = make_cache_key(url)
+        known = await self.cache.get_async('github_etag', etag_key)
+
+        headers = {'Accept': 'application/vnd.github+json'}
+        if known is not None:
+            headers['If-None-Match'] = known['value']['etag']
+
+        try:
+            response = await self._request('GET', url, headers=headers)
+        except Exception as e:
+            return {'login': login, 'error': str(e)}
+        self.stats['rest_requests'] += 1
+
+        if response.status_code == 304 and known is not None:
+            self.stats['not_modified'] += 1
+            user = known['value']['user']
+        elif response.status_code == 200:
+            user = response.json()
+            etag = _header(response.headers, 'ETag')
+            if etag:
+                await self.cache.set_async('github_etag', etag_key, {'etag': etag, 'user': user})
+        elif response.status_code == 404:
+            user = None
+        else:
+            return {'login': login, 'error': f'HTTP {response.status_code}'}
+
+        raw = {'login': login, 'found': user is not None, 'source': 'rest', 'user': user}
+        await self._store(raw)
+        return raw
+
+    def parse(self, raw_data: Dict) -> Dict[str, Any]:
+        """Parse le profil (GraphQL ou REST)"""
+        login = raw_data.get('login')
+
+        if raw_data.get('error') or not raw_data.get('found'):
+            return {
+                'username': login,
+                'found': False,
+                'error': raw_data.get('error'),
+                'risk_score': 0.0,
+                'risk_level': 'low',
+                'summary': f"Aucun compte GitHub '{login}'" if not raw_data.get('error') else raw_data['error']
+            }
+
+        user = raw_data['user']
+        if raw_data.get('source') == 'graphql':
+            profile = {
+                'name': user.get('name'),
+                'bio': user.get('bio'),
+                'company': user.get('company'),
+                'location': user.get('location'),
+                'email': user.get('email') or None,
+                'blog': user.get('websiteUrl'),
+                'twitter': user.get('twitterUsername'),
+                'followers': user['followers']['totalCount'],
+                'following': user['following']['totalCount'],
+                'public_repos': user['repositories']['totalCount'],
+                'created_at': user.get('createdAt'),
+                'profile_url': user.get('url'),
+            }
+            repositories = [
+                {
+                    'name': repo['nameWithOwner'],
+                    'url': repo['url'],
+                    'description': repo.get('description'),
+                    'language': (repo.get('primaryLanguage') or {}).get('name'),
+                    'stars': repo.get('stargazerCount', 0),
+                    'forks': repo.get('forkCount', 0),
+                    'pushed_at': repo.get('pushedAt'),
+                }
+                for repo in user['repositories']['nodes']
+            ]
+            organizations = [
+                {'login': org['login'], 'name': org.get('name'), 'url': org.get('url')}
+                for org in user['organizations']['nodes']
+            ]
+            commit_emails = self._commit_emails(user['login'], user['repositories']['nodes'])
+        else:
+            profile = {
+                'name': user.get('name'),
+                'bio': user.get('bio'),
+                'company': user.get('company'),
+                'location': user.get('location'),
+                'email': user.get('email'),
+                'blog': user.get('blog'),
+                'twitter': user.get('twitter_username'),
+                'followers': user.get('followers'),
+                'following': user.get('following'),
+                'public_repos': user.get('public_repos'),
+                'created_at': user.get('created_at'),
+                'profile_url': user.get('html_url'),
+            }
+            repositories, organizations, commit_emails = [], [], []
+
+        # Emails exposés : profil public et auteurs des commits
+        exposed = [e for e in commit_emails if not e.endswith('@users.noreply.github.com')]
+        risk_score = min(len(exposed) * 20, 40)
+        if profile['email']:
+            risk_score += 20
+        if profile['company'] or organizations:
+            risk_score += 10
+        if profile['location']:
+            risk_score += 10
+
+        return {
+            'username': login,
+            'found': True,
+            'profile': profile,
+            'repositories': repositories,
+            'organizations': organizations,
+            'commit_emails': commit_emails,
+            'risk_score': float(risk_score),
+            'risk_level': self._get_risk_level(risk_score),
+            'summary': f"GitHub '{login}' : {profile['public_repos'] or 0} dépôts, "
+                       f"{len(organizations)} organisations, {len(exposed)} emails de commit exposés"
+        }
+
+    @staticmethod
+    def _commit_emails(login: str, repositories: List[Dict]) -> List[str]:
+        """Emails des commits dont l'auteur est ce compte"""
+        emails = set()
+        for repo in repositories:
+            target = (repo.get('defaultBranchRef') or {}).get('target') or {}
+            for commit in (target.get('history') or {}).get('nodes', []):
+                author = commit.get('author') or {}
+                if (author.get('user') or {}).get('login', '').lower() == login.lower() and author.get('email'):
+                    emails.add(author['email'].lower())
+        return sorted(emails)
+
+    def _get_risk_level(self, score: float) -> str:
+        """Convertit le score en niveau de risque"""
+        if score >= 75:
+            return 'critical'
+        elif score >= 50:
+            return 'high'
+        elif score >= 25:
+            return 'medium'
+        else:
+            return 'low'
+
+
+# Test du scraper
+if __name__ == "__main__":
+    import sys
+    from scrapers.http_client import close_http_client
+
+    async def test():
+        print("=" * 60)
+        print("🧪 TEST DU SCRAPER GITHUB")
+        print("=" * 60)
+
+        scraper = GitHubScraper()
+        usernames = sys.argv[1:] or ['torvalds', 'gvanrossum', 'this-user-should-not-exist-42']
+
+        results = await asyncio.gather(*(scraper.process(u) for u in usernames))
+        for result in results:
+            data = result.get('data', {})
+            print(f"\n👤 {result['target']} : {data.get('summary', result.get('error'))}")
+            for email in data.get('commit_emails', [])[:5]:
+                print(f"   📧 {email}")
+
+        print(f"\n📊 Requêtes : {scraper.stats}")
+        await close_http_client()
+
+    asyncio.run(test())
@@ -0,0 +1,250 @@
+"""
+Shared async HTTP client for all OSINT scrapers
+Un seul pool de connexions aiohttp (keep-alive, limites par hôte) partagé
+par tous les scrapers d'un même process. Un client HTTP/2 (httpx) est aussi
+disponible pour les API qui le supportent : une connexion multiplexée par hôte
+au lieu d'une connexion par requête en vol.
+"""
+import os
+import json
+import asyncio
+import logging
+from typing import Dict, Any, Optional, Union
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 10  # secondes
+DEFAULT_USER_AGENT = 'OSINT-Platform'
+
+
+class HttpError(Exception):
+    """Erreur HTTP (status >= 400)"""
+
+    def __init__(self, status_code: int, url: str):
+        super().__init__(f'HTTP {status_code} for {url}')
+        self.status_code = status_code
+        self.url = url
+
+
+class HttpResponse:
+    """Réponse HTTP entièrement lue (même interface que requests.Response)"""
+
+    def __init__(self, status_code: int, headers: Dict[str, str], content: bytes, url: str):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HttpError(self.status_code, self.url)
+
+    def __repr__(self):
+        return f"<HttpResponse(status={self.status_code}, url={self.url})>"
+
+
+class AsyncHttpClient:
+    """Client HTTP asynchrone avec pool de connexions partagé"""
+
+    def __init__(self, max_connections: int = None, max_per_host: int = None,
+                 keepalive_timeout: float = None, user_agent: str = DEFAULT_USER_AGENT):
+        self.max_connections = max_connections or int(os.getenv('HTTP_MAX_CONNECTIONS', 200))
+        self.max_per_host = max_per_host or int(os.getenv('HTTP_MAX_PER_HOST', 10))
+        self.keepalive_timeout = keepalive_timeout or float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', 30))
+        self.user_agent = user_agent
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Retourne la session du loop courant (en crée une si besoin)
+
+        Une session aiohttp est liée à son event loop : si le loop a changé
+        (plusieurs asyncio.run successifs), on repart sur une nouvelle session.
+        """
+        loop = asyncio.get_running_loop()
+
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'User-Agent': self.user_agent}
+            )
+            self._loop = loop
+
+        return self._session
+
+    async def request(self, method: str, url: str, *, params: Dict = None, headers: Dict = None,
+                      data: Any = None, json_body: Any = None, timeout: float = DEFAULT_TIMEOUT,
+                      allow_redirects: bool = True) -> HttpResponse:
+        """
+        Exécute une requête et lit tout le corps de la réponse
+
+        Args:
+            method: Méthode HTTP (GET, POST, HEAD...)
+            url: URL cible
+            params: Paramètres de query string
+            headers: Headers additionnels
+            data: Corps form-encoded
+            json_body: Corps JSON
+            timeout: Timeout total en secondes
+            allow_redirects: Suivre les redirections
+
+        Returns:
+            HttpResponse
+        """
+        session = self._get_session()
+
+        async with session.request(
+            method,
+            url,
+            params=params,
+            headers=headers,
+            data=data,
+            json=json_body,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+            allow_redirects=allow_redirects
+        ) as response:
+            content = await response.read()
+            return HttpResponse(response.status, dict(response.headers), content, str(response.url))
+
+    async def get(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request('POST', url, **kwargs)
+
+    async def head(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request('HEAD', url, **kwargs)
+
+    async def close(self):
+        """Ferme la session et libère les connexions"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+
+class Http2Client:
+    """
+    Client HTTP/2 asynchrone (httpx), même interface que AsyncHttpClient
+
+    HTTP/2 est négocié par ALPN : les hôtes qui ne le supportent pas sont
+    servis en HTTP/1.1 keep-alive par le même pool. httpx n'a pas de limite
+    par hôte, mais en HTTP/2 toutes les requêtes vers un hôte partagent une
+    seule connexion.
+    """
+
+    def __init__(self, max_connections: int = None, max_keepalive: int = None,
+                 keepalive_timeout: float = None, user_agent: str = DEFAULT_USER_AGENT):
+        import httpx
+
+        self._httpx = httpx
+        self.max_connections = max_connections or int(os.getenv('HTTP_MAX_CONNECTIONS', 200))
+        self.max_keepalive = max_keepalive or int(os.getenv('HTTP_MAX_KEEPALIVE', 50))
+        self.keepalive_timeout = keepalive_timeout or float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', 30))
+        self.user_agent = user_agent
+        self._client = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self):
+        """Retourne le client du loop courant (en crée un si besoin, comme AsyncHttpClient)"""
+        loop = asyncio.get_running_loop()
+
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = self._httpx.AsyncClient(
+                http2=True,
+                limits=self._httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive,
+                    keepalive_expiry=self.keepalive_timeout
+                ),
+                headers={'User-Agent': self.user_agent}
+            )
+            self._loop = loop
+
+        return self._client
+
+    async def request(self, method: str, url: str, *, params: Dict = None, headers: Dict = None,
+                      data: Any = None, json_body: Any = None, timeout: float = DEFAULT_TIMEOUT,
+                      allow_redirects: bool = True) -> HttpResponse:
+        """Exécute une requête et lit tout le corps de la réponse (voir AsyncHttpClient.request)"""
+        response = await self._get_client().request(
+            method,
+            url,
+            params=params,
+            headers=headers,
+            data=data,
+            json=json_body,
+            timeout=timeout,
+            follow_redirects=allow_redirects
+        )
+        return HttpResponse(response.status_code, dict(response.headers), response.content, str(response.url))
+
+    async def get(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request('POST', url, **kwargs)
+
+    async def head(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request('HEAD', url, **kwargs)
+
+    async def close(self):
+        """Ferme le client et libère les connexions"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
+
+
+# Client partagé par tous les scrapers du process
+_http_client: Optional[AsyncHttpClient] = None
+_http2_client: Optional[Union[Http2Client, AsyncHttpClient]] = None
+
+
+def get_http_client() -> AsyncHttpClient:
+    """Retourne le client HTTP partagé du process"""
+    global _http_client
+    if _http_client is None:
+        _http_client = AsyncHttpClient()
+    return _http_client
+
+
+def get_http2_client() -> Union[Http2Client, AsyncHttpClient]:
+    """
+    Retourne le client HTTP/2 partagé du process
+
+    Sans httpx[http2] installé, retourne le client aiohttp partagé.
+    """
+    global _http2_client
+    if _http2_client is None:
+        try:
+            import h2  # noqa: F401 - requis par httpx pour HTTP/2
+            _http2_client = Http2Client()
+        except ImportError:
+            logger.warning("⚠️  httpx[http2] not installed, using the HTTP/1.1 pool")
+            _http2_client = get_http_client()
+    return _http2_client
+
+
+async def close_http_client():
+    """Ferme les clients HTTP partagés (à appeler en fin de process)"""
+    if _http_client is not None:
+        await _http_client.close()
+    if _http2_client is not None and _http2_client is not _http_client:
+        await _http2_client.close()
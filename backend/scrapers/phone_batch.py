@@ -0,0 +1,141 @@
+"""
+Batch phone analysis - enrichissement offline de listes de numéros
+Les numéros sont lus en flux (un par ligne, ou une colonne de CSV), répartis
+par lots sur un pool de process et analysés avec phonenumbers, sans aucun
+appel réseau. Chaque process mémorise zone, opérateur et fuseaux par préfixe.
+
+Usage:
+    python -m scrapers.phone_batch numbers.txt results.jsonl --workers 8 --region FR
+"""
+import os
+import csv
+import json
+import time
+import argparse
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Any, Iterator, List
+from scrapers.phone_scraper import analyze_number
+
+logger = logging.getLogger(__name__)
+
+# Numéros envoyés à un process par lot
+CHUNK_SIZE = int(os.getenv('PHONE_BATCH_CHUNK_SIZE', 5000))
+
+# Colonnes reconnues dans un CSV (sinon la première)
+PHONE_COLUMNS = ('phone', 'phone_number', 'number', 'target', 'value')
+
+
+def read_numbers(path: str) -> Iterator[str]:
+    """Lit les numéros en flux (.csv, sinon un numéro par ligne)"""
+    with open(path, newline='', encoding='utf-8', errors='replace') as f:
+        if path.endswith('.csv'):
+            reader = csv.DictReader(f)
+            fields = reader.fieldnames or []
+            if not fields:
+                return
+            column = next((c for c in PHONE_COLUMNS if c in fields), fields[0])
+            for row in reader:
+                number = (row.get(column) or '').strip()
+                if number:
+                    yield number
+        else:
+            for line in f:
+                number = line.strip()
+                if number and not number.startswith('#'):
+                    yield number
+
+
+def analyze_chunk(numbers: List[str], region: str = None, lang: str = 'fr') -> List[Dict[str, Any]]:
+    """Analyse un lot de numéros (exécuté dans un process du pool)"""
+    return [{'phone_number': number, **analyze_number(number, region, lang)} for number in numbers]
+
+
+class PhoneBatchAnalyzer:
+    """Analyse offline de gros fichiers de numéros sur un pool de process"""
+
+    def __init__(self, workers: int = None, chunk_size: int = CHUNK_SIZE,
+                 region: str = None, lang: str = 'fr'):
+        """
+        Args:
+            workers: Nombre de process (défaut : nombre de CPU)
+            chunk_size: Numéros par lot
+            region: Pays par défaut des numéros au format national ('FR')
+            lang: Langue des noms de zone et d'opérateur
+        """
+        self.workers = workers or int(os.getenv('PHONE_BATCH_WORKERS', 0)) or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.region = region
+        self.lang = lang
+        self.stats = {'processed': 0, 'valid': 0, 'invalid': 0, 'error': 0}
+
+    def _chunks(self, numbers: Iterator[str]) -> Iterator[List[str]]:
+        while True:
+            chunk = list(islice(numbers, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def _write(self, out, results: List[Dict[str, Any]]):
+        for result in results:
+            if 'error' in result:
+                self.stats['error'] += 1
+            elif result['valid']:
+                self.stats['valid'] += 1
+            else:
+                self.stats['invalid'] += 1
+            out.write(json.dumps(result, ensure_ascii=False) + '\n')
+        self.stats['processed'] += len(results)
+
+    def run(self, input_path: str, output_path: str) -> Dict[str, int]:
+        """
+        Analyse tous les numéros de input_path, résultats en JSONL dans output_path
+
+        Les résultats sont écrits dans l'ordre du fichier d'entrée. Au plus
+        2 lots par process sont en cours : la mémoire reste bornée quelle que
+        soit la taille du fichier.
+        """
+        chunks = self._chunks(read_numbers(input_path))
+        pending = deque()
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool, \
+                open(output_path, 'w', encoding='utf-8') as out:
+            for chunk in chunks:
+                pending.append(pool.submit(analyze_chunk, chunk, self.region, self.lang))
+                if len(pending) >= self.workers * 2:
+                    self._write(out, pending.popleft().result())
+                    logger.info(f"📞 {self.stats['processed']} numbers analyzed")
+            while pending:
+                self._write(out, pending.popleft().result())
+
+        return self.stats
+
+
+def main():
+    """Point d'entrée principal"""
+    parser = argparse.ArgumentParser(description='Batch offline phone number analysis')
+    parser.add_argument('input', help='Fichier de numéros (.txt, un par ligne, ou .csv)')
+    parser.add_argument('output', help='Fichier de résultats (.jsonl)')
+    parser.add_argument('--workers', type=int, default=None, help='Nombre de process (défaut : CPU)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Numéros par lot')
+    parser.add_argument('--region', default=None, help='Pays des numéros au format national (FR, US...)')
+    parser.add_argument('--lang', default='fr', help='Langue des zones et opérateurs')
+    args = parser.parse_args()
+
+    analyzer = PhoneBatchAnalyzer(workers=args.workers, chunk_size=args.chunk_size,
+                                  region=args.region, lang=args.lang)
+    print(f"🚀 Phone batch : {args.input} → {args.output} (workers={analyzer.workers})")
+    start = time.monotonic()
+
+    stats = analyzer.run(args.input, args.output)
+
+    elapsed = time.monotonic() - start
+    rate = stats['processed'] / elapsed if elapsed else 0
+    print(f"✅ Terminé en {elapsed:.0f}s : {stats['processed']} numéros ({rate:.0f}/s) - "
+          f"{stats['valid']} valides, {stats['invalid']} invalides, {stats['error']} erreurs")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,121 @@ Uses: phonenumbers library, Numverify API (optionnel)
 import os
 import phonenumbers
 from phonenumbers import geocoder, carrier, timezone
-import requests
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from dotenv import load_dotenv
 from scrapers.base_scraper import BaseScraper
 
 load_dotenv()
 
+NUMBER_TYPES = {
+    0: 'FIXED_LINE',
+    1: 'MOBILE',
+    2: 'FIXED_LINE_OR_MOBILE',
+    3: 'TOLL_FREE',
+    4: 'PREMIUM_RATE',
+    5: 'SHARED_COST',
+    6: 'VOIP',
+    7: 'PERSONAL_NUMBER',
+    8: 'PAGER',
+    9: 'UAN',
+    10: 'VOICEMAIL',
+    -1: 'UNKNOWN'
+}
+
+# Nombre max de préfixes mémorisés par process
+PREFIX_CACHE_SIZE = int(os.getenv('PHONE_PREFIX_CACHE_SIZE', 200000))
+
+_prefix_lengths: Optional[Dict[int, int]] = None
+_prefix_cache: Dict[Tuple[str, int, str], Tuple[str, str, Tuple[str, ...]]] = {}
+
+
+def _prefix_length(country_code: int) -> int:
+    """
+    Nombre de chiffres E.164 qui déterminent zone, opérateur et fuseaux
+
+    Plus long préfixe des données geocoder/carrier/timezone de l'indicatif
+    (calculé une fois par process), plus la longueur du token mobile retiré
+    avant la recherche (Argentine).
+    """
+    global _prefix_lengths
+    if _prefix_lengths is None:
+        from phonenumbers.geodata import GEOCODE_DATA
+        from phonenumbers.carrierdata import CARRIER_DATA
+        from phonenumbers.tzdata import TIMEZONE_DATA
+
+        lengths = {}
+        for data in (GEOCODE_DATA, CARRIER_DATA, TIMEZONE_DATA):
+            for prefix in data:
+                # Les indicatifs sont sans préfixe commun : 1 à 3 chiffres
+                for size in (1, 2, 3):
+                    code = int(prefix[:size])
+                    if code in phonenumbers.COUNTRY_CODE_TO_REGION_CODE:
+                        lengths[code] = max(lengths.get(code, 0), len(prefix))
+                        break
+        _prefix_lengths = lengths
+    return (_prefix_lengths.get(country_code, len(str(country_code)))
+            + len(phonenumbers.country_mobile_token(country_code)))
+
+
+def _prefix_info(parsed, e164: str, number_type: int, lang: str) -> Tuple[str, str, Tuple[str, ...]]:
+    """Zone, opérateur et fuseaux du numéro, mémorisés par (préfixe, type, langue)"""
+    key = (e164[1:1 + _prefix_length(parsed.country_code)], number_type, lang)
+    info = _prefix_cache.get(key)
+    if info is None:
+        info = (
+            geocoder.description_for_number(parsed, lang),
+            # Opérateur (peut ne pas toujours fonctionner)
+            carrier.name_for_number(parsed, lang),
+            tuple(timezone.time_zones_for_number(parsed))
+        )
+        if len(_prefix_cache) >= PREFIX_CACHE_SIZE:
+            _prefix_cache.clear()
+        _prefix_cache[key] = info
+    return info
+
+
+def analyze_number(phone_number: str, region: str = None, lang: str = 'fr') -> Dict[str, Any]:
+    """
+    Analyse offline d'un numéro avec phonenumbers
+
+    Fonction de module pour être utilisable dans un pool de process
+    (scrapers.phone_batch). Le type n'est calculé qu'une fois (un numéro est
+    valide si son type est connu) ; zone, opérateur et fuseaux ne dépendent
+    que du préfixe et sont mémorisés.
+
+    Args:
+        phone_number: Numéro au format international (+33612345678)
+        region: Pays par défaut des numéros au format national ('FR')
+        lang: Langue des noms de zone et d'opérateur
+    """
+    try:
+        parsed = phonenumbers.parse(phone_number, region)
+        number_type = phonenumbers.number_type(parsed)
+        e164 = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+        country, carrier_name, timezones = _prefix_info(parsed, e164, number_type, lang)
+
+        return {
+            'valid': number_type != phonenumbers.PhoneNumberType.UNKNOWN,
+            'possible': phonenumbers.is_possible_number(parsed),
+            'international_format': phonenumbers.format_number(
+                parsed, phonenumbers.PhoneNumberFormat.INTERNATIONAL
+            ),
+            'national_format': phonenumbers.format_number(
+                parsed, phonenumbers.PhoneNumberFormat.NATIONAL
+            ),
+            'e164_format': e164,
+            'country_code': f"+{parsed.country_code}",
+            'country': country,
+            'carrier': carrier_name or 'Unknown',
+            'type': NUMBER_TYPES.get(number_type, 'UNKNOWN'),
+            'timezones': list(timezones)
+        }
+
+    except phonenumbers.phonenumberutil.NumberParseException as e:
+        return {'error': f'Invalid phone number: {str(e)}'}
+    except Exception as e:
+        return {'error': str(e)}
+
 
 class PhoneScraper(BaseScraper):
     """Scraper pour analyse de numéros de téléphone"""
@@ -30,9 +138,13 @@ class PhoneScraper(BaseScraper):
         Returns:
             Dict avec infos du numéro
         """
+        # Analyse offline immédiate, publiée avant l'appel réseau Numverify
+        basic_info = self._parse_with_phonenumbers(phone_number)
+        self.emit_finding('phone_info', basic_info)
+
         results = {
             'phone_number': phone_number,
-            'basic_info': self._parse_with_phonenumbers(phone_number),
+            'basic_info': basic_info,
             'numverify_info': await self._check_numverify(phone_number) if self.numverify_key else None
         }
 
@@ -40,65 +152,7 @@ class PhoneScraper(BaseScraper):
 
     def _parse_with_phonenumbers(self, phone_number: str) -> Dict:
         """Parse le numéro avec la lib phonenumbers (gratuit, offline)"""
-        try:
-            # Parser le numéro
-            parsed = phonenumbers.parse(phone_number, None)
-
-            # Validation
-            is_valid = phonenumbers.is_valid_number(parsed)
-            is_possible = phonenumbers.is_possible_number(parsed)
-
-            # Localisation
-            country = geocoder.description_for_number(parsed, "fr")
-            country_code = parsed.country_code
-            national_number = parsed.national_number
-
-            # Opérateur (peut ne pas toujours fonctionner)
-            carrier_name = carrier.name_for_number(parsed, "fr")
-
-            # Type de numéro
-            number_type = phonenumbers.number_type(parsed)
-            type_map = {
-                0: 'FIXED_LINE',
-                1: 'MOBILE',
-                2: 'FIXED_LINE_OR_MOBILE',
-                3: 'TOLL_FREE',
-                4: 'PREMIUM_RATE',
-                5: 'SHARED_COST',
-                6: 'VOIP',
-                7: 'PERSONAL_NUMBER',
-                8: 'PAGER',
-                9: 'UAN',
-                10: 'VOICEMAIL',
-                -1: 'UNKNOWN'
-            }
-
-            # Fuseau horaire
-            timezones = timezone.time_zones_for_number(parsed)
-
-            return {
-                'valid': is_valid,
-                'possible': is_possible,
-                'international_format': phonenumbers.format_number(
-                    parsed, phonenumbers.PhoneNumberFormat.INTERNATIONAL
-                ),
-                'national_format': phonenumbers.format_number(
-                    parsed, phonenumbers.PhoneNumberFormat.NATIONAL
-                ),
-                'e164_format': phonenumbers.format_number(
-                    parsed, phonenumbers.PhoneNumberFormat.E164
-                ),
-                'country_code': f"+{country_code}",
-                'country': country,
-                'carrier': carrier_name or 'Unknown',
-                'type': type_map.get(number_type, 'UNKNOWN'),
-                'timezones': list(timezones)
-            }
-
-        except phonenumbers.phonenumberutil.NumberParseException as e:
-            return {'error': f'Invalid phone number: {str(e)}'}
-        except Exception as e:
-            return {'error': str(e)}
+        return analyze_number(phone_number)
 
     async def _check_numverify(self, phone_number: str) -> Dict:
         """
@@ -108,8 +162,6 @@ class PhoneScraper(BaseScraper):
         https://numverify.com/
         """
         try:
-            await self.rate_limit_wait()
-
             url = "http://apilayer.net/api/validate"
             params = {
                 'access_key': self.numverify_key,
@@ -117,13 +169,16 @@ class PhoneScraper(BaseScraper):
                 'format': 1
             }
 
-            response = requests.get(url, params=params, timeout=10)
+            # Numverify renvoie ses erreurs (quota...) en 200 : on ne les met pas en cache
+            status_code, data = await self.fetch_json(
+                'numverify', url, params=params,
+                cache_if=lambda body: isinstance(body, dict) and 'error' not in body
+            )
 
-            if response.status_code == 200:
-                data = response.json()
+            if status_code == 200:
 
                 if data.get('valid'):
-                    return {
+                    numverify_info = {
                         'valid': data.get('valid'),
                         'number': data.get('number'),
                         'local_format': data.get('local_format'),
@@ -135,13 +190,15 @@ class PhoneScraper(BaseScraper):
                         'carrier': data.get('carrier'),
                         'line_type': data.get('line_type')
                     }
+                    self.emit_finding('numverify', numverify_info)
+                    return numverify_info
                 else:
                     return {'error': 'Number not valid', 'details': data}
 
-            return {'error': f'API error: {response.status_code}'}
+            return self.source_error(f'API error: {status_code}', status_code)
 
         except Exception as e:
-            return {'error': str(e)}
+            return self.source_error(e)
 
     def parse(self, raw_data: Dict) -> Dict[str, Any]:
         """Parse les données du téléphone"""
@@ -195,6 +252,7 @@ class PhoneScraper(BaseScraper):
 # Test
 if __name__ == "__main__":
     import asyncio
+    from scrapers.http_client import close_http_client
 
     async def test():
         print("=" * 70)
@@ -245,4 +303,6 @@ if __name__ == "__main__":
 
         print("=" * 70)
 
+        await close_http_client()
+
     asyncio.run(test())
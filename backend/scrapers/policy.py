@@ -0,0 +1,337 @@
+"""
+Per-provider call policy - deadlines, retry, circuit breaker
+Chaque provider a sa politique : timeout par tentative, deadline globale
+(retries compris), retry exponentiel avec jitter sur 429/5xx et erreurs réseau
+(en respectant Retry-After), et un circuit breaker qui coupe les appels vers
+un provider en panne au lieu d'occuper les workers jusqu'au timeout.
+"""
+import os
+import time
+import random
+import asyncio
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Statuts pour lesquels une nouvelle tentative a un sens
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Erreurs réseau transitoires (requests lève des OSError)
+TRANSIENT_ERRORS = (asyncio.TimeoutError, TimeoutError, OSError)
+try:
+    import aiohttp
+    TRANSIENT_ERRORS += (aiohttp.ClientError,)
+except ImportError:
+    pass
+try:
+    import httpx
+    TRANSIENT_ERRORS += (httpx.TransportError,)
+except ImportError:
+    pass
+
+
+class ProviderPolicy:
+    """Politique d'appel d'un provider"""
+
+    def __init__(self, timeout: float = 10, deadline: float = 30, retries: int = 2,
+                 backoff: float = 0.5, max_backoff: float = 10,
+                 failure_threshold: int = 5, reset_timeout: float = 60):
+        """
+        Args:
+            timeout: Timeout d'une tentative (secondes)
+            deadline: Durée max de l'appel, retries compris
+            retries: Nombre max de nouvelles tentatives
+            backoff: Délai de base du backoff exponentiel
+            max_backoff: Plafond du backoff
+            failure_threshold: Échecs consécutifs avant ouverture du circuit
+            reset_timeout: Durée d'ouverture du circuit avant un appel d'essai
+        """
+        self.timeout = timeout
+        self.deadline = deadline
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+    def replace(self, **changes) -> 'ProviderPolicy':
+        """Copie de la politique avec quelques valeurs changées"""
+        return ProviderPolicy(**{**vars(self), **changes})
+
+    def __repr__(self):
+        return (f"<ProviderPolicy(timeout={self.timeout}, deadline={self.deadline}, "
+                f"retries={self.retries})>")
+
+
+PROVIDER_POLICIES: Dict[str, ProviderPolicy] = {
+    'hibp': ProviderPolicy(timeout=10, deadline=20, retries=1),   # 429 + Retry-After fréquents
+    'hunter': ProviderPolicy(timeout=10, deadline=20),
+    'emailrep': ProviderPolicy(timeout=10, deadline=20),
+    'shodan': ProviderPolicy(timeout=10, deadline=25),
+    'numverify': ProviderPolicy(timeout=10, deadline=20),
+    'github': ProviderPolicy(timeout=10, deadline=25),
+    'virustotal': ProviderPolicy(timeout=15, deadline=60),        # 4 req/min : Retry-After long
+    'social': ProviderPolicy(timeout=5, deadline=5, retries=0),    # Checks HEAD des profils
+    'holehe': ProviderPolicy(timeout=60, deadline=60, retries=0),
+    'sherlock': ProviderPolicy(timeout=300, deadline=300, retries=0),
+}
+
+
+def get_policy(provider: str, default: ProviderPolicy = None) -> ProviderPolicy:
+    """
+    Retourne la politique d'un provider
+
+    Surchargeable par variable d'environnement :
+    POLICY_SHODAN="timeout=5,deadline=15,retries=3"
+    """
+    policy = PROVIDER_POLICIES.get(provider) or default or ProviderPolicy()
+
+    override = os.getenv(f'POLICY_{provider.upper()}')
+    if override:
+        changes = {}
+        for item in override.split(','):
+            name, _, value = item.partition('=')
+            name = name.strip()
+            if hasattr(policy, name):
+                changes[name] = int(value) if name in ('retries', 'failure_threshold') else float(value)
+        policy = policy.replace(**changes)
+
+    return policy
+
+
+class CircuitOpenError(Exception):
+    """Circuit ouvert : le provider n'est pas appelé"""
+
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(f'{provider} unavailable (circuit open, retry in {retry_in:.0f}s)')
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+def is_transient(status_code: int = None, error: BaseException = None) -> bool:
+    """Échec qu'un nouvel essai plus tard peut résoudre (quota, panne, réseau, circuit ouvert)"""
+    if status_code is not None and status_code in RETRY_STATUSES:
+        return True
+    return isinstance(error, TRANSIENT_ERRORS + (CircuitOpenError,))
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker d'un provider (closed -> open -> half-open)
+
+    Après failure_threshold échecs consécutifs (5xx, erreurs réseau), le
+    circuit s'ouvre : les appels échouent immédiatement pendant reset_timeout.
+    Ensuite un seul appel d'essai passe ; son succès referme le circuit.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return 'open'
+        return 'half-open'
+
+    def retry_in(self) -> float:
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Le provider peut-il être appelé ?"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self.opened_at < self.reset_timeout:
+                return False
+            # Half-open : un seul appel d'essai à la fois (un essai perdu,
+            # par exemple annulé, est remplacé après reset_timeout)
+            if self._trial_at is not None and now - self._trial_at < self.reset_timeout:
+                return False
+            self._trial_at = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info("✅ Circuit closed")
+            self.failures = 0
+            self.opened_at = None
+            self._trial_at = None
+
+    def record_failure(self) -> bool:
+        """Enregistre un échec, retourne True si le circuit vient de s'ouvrir"""
+        with self._lock:
+            self.failures += 1
+            half_open = self._trial_at is not None
+            if half_open or (self.opened_at is None and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                self._trial_at = None
+                return True
+            return False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider: str, policy: ProviderPolicy = None) -> CircuitBreaker:
+    """Circuit breaker du provider (un par process)"""
+    breaker = _breakers.get(provider)
+    if breaker is None:
+        policy = policy or get_policy(provider)
+        with _breakers_lock:
+            breaker = _breakers.setdefault(
+                provider, CircuitBreaker(policy.failure_threshold, policy.reset_timeout)
+            )
+    return breaker
+
+
+def get_circuit_states() -> Dict[str, Dict[str, Any]]:
+    """État des circuits (pour le monitoring)"""
+    return {
+        provider: {'state': breaker.state, 'failures': breaker.failures, 'retry_in': round(breaker.retry_in(), 1)}
+        for provider, breaker in _breakers.items()
+    }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After en secondes (nombre de secondes ou date HTTP)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_delay(policy: ProviderPolicy, attempt: int, response: Any = None) -> float:
+    """
+    Délai avant la tentative suivante
+
+    Retry-After s'il est fourni, sinon backoff exponentiel avec full jitter
+    (les workers en échec ne réessaient pas tous au même instant).
+    """
+    if response is not None:
+        headers = getattr(response, 'headers', None) or {}
+        retry_after = parse_retry_after(headers.get('Retry-After') or headers.get('retry-after'))
+        if retry_after is not None:
+            return retry_after
+    return random.uniform(0, min(policy.max_backoff, policy.backoff * 2 ** attempt))
+
+
+def _record(breaker: CircuitBreaker, provider: str, response: Any = None):
+    """Succès ou échec pour le circuit (un 429 ou un 4xx ne signale pas une panne)"""
+    if response is not None and response.status_code < 500:
+        breaker.record_success()
+    elif breaker.record_failure():
+        logger.warning(f"🔌 {provider}: circuit open ({breaker.failures} consecutive failures)")
+
+
+def _give_up(provider: str, policy: ProviderPolicy, attempt: int, delay: float, deadline: float) -> bool:
+    if attempt > policy.retries:
+        return True
+    if time.monotonic() + delay >= deadline:
+        logger.info(f"⏱️  {provider}: no retry, deadline ({policy.deadline}s) would be exceeded")
+        return True
+    return False
+
+
+async def call_with_policy(provider: str, request: Callable[[float], Awaitable[Any]],
+                           policy: ProviderPolicy = None) -> Any:
+    """
+    Appelle un provider selon sa politique
+
+    Args:
+        provider: Clé du provider ('hibp', 'shodan'...)
+        request: Coroutine appelée avec le timeout de la tentative, retournant
+            une réponse (status_code, headers)
+        policy: Politique (par défaut celle du provider)
+
+    Returns:
+        La réponse (la dernière reçue si les tentatives sont épuisées)
+
+    Raises:
+        CircuitOpenError: Circuit ouvert, aucun appel fait
+        L'erreur réseau de la dernière tentative si aucune réponse n'a été reçue
+    """
+    policy = policy or get_policy(provider)
+    breaker = get_circuit_breaker(provider, policy)
+    deadline = time.monotonic() + policy.deadline
+    attempt = 0
+
+    while True:
+        if not breaker.allow():
+            raise CircuitOpenError(provider, breaker.retry_in())
+
+        response = error = None
+        try:
+            response = await request(max(0.1, min(policy.timeout, deadline - time.monotonic())))
+        except TRANSIENT_ERRORS as e:
+            error = e
+        _record(breaker, provider, response)
+
+        if response is not None and response.status_code not in RETRY_STATUSES:
+            return response
+
+        attempt += 1
+        delay = retry_delay(policy, attempt, response)
+        if _give_up(provider, policy, attempt, delay, deadline):
+            if response is not None:
+                return response
+            raise error
+
+        reason = f'HTTP {response.status_code}' if response is not None else type(error).__name__
+        logger.info(f"🔁 {provider}: retry {attempt}/{policy.retries} in {delay:.1f}s ({reason})")
+        await asyncio.sleep(delay)
+
+
+def call_with_policy_sync(provider: str, request: Callable[[float], Any],
+                          policy: ProviderPolicy = None) -> Any:
+    """Version synchrone de call_with_policy (scripts basés sur requests)"""
+    policy = policy or get_policy(provider)
+    breaker = get_circuit_breaker(provider, policy)
+    deadline = time.monotonic() + policy.deadline
+    attempt = 0
+
+    while True:
+        if not breaker.allow():
+            raise CircuitOpenError(provider, breaker.retry_in())
+
+        response = error = None
+        try:
+            response = request(max(0.1, min(policy.timeout, deadline - time.monotonic())))
+        except TRANSIENT_ERRORS as e:
+            error = e
+        _record(breaker, provider, response)
+
+        if response is not None and response.status_code not in RETRY_STATUSES:
+            return response
+
+        attempt += 1
+        delay = retry_delay(policy, attempt, response)
+        if _give_up(provider, policy, attempt, delay, deadline):
+            if response is not None:
+                return response
+            raise error
+
+        reason = f'HTTP {response.status_code}' if response is not None else type(error).__name__
+        logger.info(f"🔁 {provider}: retry {attempt}/{policy.retries} in {delay:.1f}s ({reason})")
+        time.sleep(delay)
@@ -0,0 +1,206 @@
+"""
+Token-bucket rate limiter per API provider
+Backends : en mémoire (un process) ou Redis (partagé entre workers)
+"""
+import os
+import time
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Quotas par provider : (jetons par seconde, burst)
+PROVIDER_LIMITS: Dict[str, Tuple[float, int]] = {
+    'hibp': (10 / 60, 1),            # Pwned 1 : 10 requêtes/minute
+    'hunter': (500 / 60, 15),        # 15 req/s, 500 req/min
+    'emailrep': (1, 1),
+    'shodan': (1, 1),                # 1 req/s (free tier)
+    'virustotal': (4 / 60, 4),       # API publique : 4 req/min
+    'numverify': (1, 1),
+    'github': (5000 / 3600, 30),     # 5000 req/heure avec token
+}
+
+
+def get_provider_limit(provider: str, default: Tuple[float, int] = (1, 1)) -> Tuple[float, int]:
+    """
+    Retourne (rate, burst) d'un provider
+
+    Surchargeable par variable d'environnement : RATE_LIMIT_SHODAN="2:5"
+    """
+    override = os.getenv(f'RATE_LIMIT_{provider.upper()}')
+    if override:
+        rate, _, burst = override.partition(':')
+        return float(rate), int(burst or 1)
+    return PROVIDER_LIMITS.get(provider, default)
+
+
+class TokenBucket:
+    """
+    Token bucket avec réservation
+
+    Un appel réserve immédiatement ses jetons (le solde peut devenir négatif)
+    et reçoit le temps à attendre : les appelants sont servis dans l'ordre,
+    sans se réveiller tous en même temps.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int = 1) -> float:
+        """Réserve des jetons et retourne le délai d'attente en secondes"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= tokens
+
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def refund(self, tokens: int = 1):
+        """Rend des jetons réservés mais non utilisés (appelant annulé)"""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + tokens)
+
+
+class InMemoryRateLimiter:
+    """Rate limiter local au process (partagé entre scrapers)"""
+
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _get_bucket(self, provider: str, default: Tuple[float, int]) -> TokenBucket:
+        bucket = self._buckets.get(provider)
+        if bucket is None:
+            rate, burst = get_provider_limit(provider, default)
+            bucket = self._buckets.setdefault(provider, TokenBucket(rate, burst))
+        return bucket
+
+    async def acquire(self, provider: str, tokens: int = 1, default: Tuple[float, int] = (1, 1)):
+        """Attend que des jetons soient disponibles pour ce provider"""
+        bucket = self._get_bucket(provider, default)
+        wait = bucket.reserve(tokens)
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # Deadline de la source dépassée : les jetons n'ont pas servi
+                bucket.refund(tokens)
+                raise
+
+
+# Token bucket atomique côté Redis (horloge du serveur Redis pour tous les workers)
+_REDIS_TOKEN_BUCKET = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+tokens = tokens - requested
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 1)
+
+if tokens >= 0 then
+    return '0'
+end
+return tostring(-tokens / rate)
+"""
+
+# Restitution des jetons d'une réservation abandonnée (plafonnée à la capacité)
+_REDIS_REFUND = """
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens'))
+if tokens then
+    redis.call('HSET', KEYS[1], 'tokens', math.min(tonumber(ARGV[2]), tokens + tonumber(ARGV[1])))
+end
+return 0
+"""
+
+
+class RedisRateLimiter:
+    """Rate limiter partagé entre process/machines via Redis"""
+
+    def __init__(self, redis_url: str = None, prefix: str = 'osint:ratelimit'):
+        import redis.asyncio as aioredis
+
+        self.redis_url = redis_url or os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+        self.prefix = prefix
+        self._aioredis = aioredis
+        self._scripts_by_loop = weakref.WeakKeyDictionary()
+        self._fallback = InMemoryRateLimiter()
+
+    def _scripts(self):
+        """
+        Scripts (réservation, restitution) sur le client de l'event loop courante
+
+        Un client redis.asyncio est lié à la loop de sa première connexion :
+        un client par loop (asyncio.run successifs des CLI et du batch runner).
+        """
+        loop = asyncio.get_running_loop()
+        scripts = self._scripts_by_loop.get(loop)
+        if scripts is None:
+            client = self._aioredis.from_url(self.redis_url)
+            scripts = self._scripts_by_loop[loop] = (
+                client.register_script(_REDIS_TOKEN_BUCKET),
+                client.register_script(_REDIS_REFUND),
+            )
+        return scripts
+
+    async def acquire(self, provider: str, tokens: int = 1, default: Tuple[float, int] = (1, 1)):
+        """Attend que des jetons soient disponibles pour ce provider"""
+        rate, burst = get_provider_limit(provider, default)
+        key = f'{self.prefix}:{provider}'
+        reserve, refund = self._scripts()
+
+        try:
+            wait = float(await reserve(keys=[key], args=[rate, burst, tokens]))
+        except Exception as e:
+            # Redis indisponible : on limite au moins localement
+            logger.warning(f"⚠️  Redis rate limiter unavailable ({e}), using local bucket")
+            await self._fallback.acquire(provider, tokens, default)
+            return
+
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # Deadline de la source dépassée : les jetons n'ont pas servi
+                try:
+                    await asyncio.shield(refund(keys=[key], args=[tokens, burst]))
+                except Exception as e:
+                    logger.warning(f"⚠️  Rate limiter refund failed ({e})")
+                raise
+
+
+_rate_limiter = None
+
+
+def get_rate_limiter():
+    """
+    Retourne le rate limiter du process
+
+    RATE_LIMIT_BACKEND=redis pour partager les quotas entre workers,
+    sinon les quotas sont comptés en mémoire (défaut).
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        if os.getenv('RATE_LIMIT_BACKEND', 'memory').lower() == 'redis':
+            _rate_limiter = RedisRateLimiter()
+        else:
+            _rate_limiter = InMemoryRateLimiter()
+    return _rate_limiter
@@ -3,7 +3,6 @@ Shodan scraper - Scan IPs for open ports and vulnerabilities
 """
 import os
 from typing import Dict, Any
-import shodan
 from dotenv import load_dotenv
 from scrapers.base_scraper import BaseScraper
 
@@ -20,7 +19,7 @@ class ShodanScraper(BaseScraper):
         if not self.api_key:
             raise ValueError("❌ SHODAN_API_KEY not found in environment")
 
-        self.api = shodan.Shodan(self.api_key)
+        self.base_url = "https://api.shodan.io"
 
     async def scrape(self, ip_address: str) -> Dict[str, Any]:
         """
@@ -33,11 +32,25 @@ class ShodanScraper(BaseScraper):
             Dict contenant les données brutes de Shodan
         """
         try:
-            await self.rate_limit_wait()
-            result = self.api.host(ip_address)
-            return result
-        except shodan.APIError as e:
-            return {'error': str(e), 'ip': ip_address}
+            url = f"{self.base_url}/shodan/host/{ip_address}"
+            status_code, body = await self.fetch_json('shodan', url, params={'key': self.api_key})
+
+            if status_code == 200:
+                for item in body.get('data', []):
+                    self.emit_finding('port', {
+                        'port': item.get('port'),
+                        'protocol': item.get('transport', 'tcp'),
+                        'product': item.get('product')
+                    })
+                for vuln in body.get('vulns', []):
+                    self.emit_finding('vulnerability', vuln)
+                return body
+
+            # Même format d'erreur que shodan.APIError
+            error = body.get('error') if isinstance(body, dict) else None
+            return {**self.source_error(error, status_code), 'ip': ip_address}
+        except Exception as e:
+            return {**self.source_error(e), 'ip': ip_address}
 
     def parse(self, raw_data: Dict) -> Dict[str, Any]:
         """
@@ -141,6 +154,7 @@ class ShodanScraper(BaseScraper):
 # Test du scraper
 if __name__ == "__main__":
     import asyncio
+    from scrapers.http_client import close_http_client
 
     async def test():
         """Test le scraper Shodan"""
@@ -190,5 +204,7 @@ if __name__ == "__main__":
 
         print("\n" + "=" * 60)
 
+        await close_http_client()
+
     # Lancer le test
     asyncio.run(test())
@@ -0,0 +1,177 @@
+"""
+Single-flight - coalescing of duplicate in-flight lookups
+Plusieurs investigations qui interrogent la même source pour la même cible en
+même temps partagent un seul appel amont (quota et latence payés une fois).
+
+- En mémoire : dans un process, les appels concurrents sur une même clé
+  attendent la même tâche.
+- Redis : entre workers, un verrou (SET NX PX) élit le process qui fait
+  l'appel ; les autres lisent le résultat qu'il publie.
+"""
+import os
+import json
+import time
+import uuid
+import asyncio
+import logging
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Durée de conservation du résultat partagé entre workers (secondes)
+RESULT_TTL = float(os.getenv('SINGLE_FLIGHT_RESULT_TTL', 10))
+
+# Intervalle de lecture du résultat par les workers en attente
+POLL_INTERVAL = 0.1
+
+_RELEASE_LOCK = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlightError(Exception):
+    """L'appel partagé a échoué dans un autre worker"""
+
+
+class SingleFlight:
+    """Coalescing en mémoire (un dictionnaire de vols par event loop)"""
+
+    def __init__(self):
+        self._flights: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]]" = \
+            weakref.WeakKeyDictionary()
+        self.stats = {'calls': 0, 'shared': 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]], ttl: float = 60) -> Any:
+        """
+        Exécute fn() une seule fois pour tous les appels concurrents sur `key`
+
+        L'appel tourne dans sa propre tâche : un appelant annulé (timeout de
+        sa source) n'interrompt pas l'appel attendu par les autres.
+
+        Args:
+            key: Clé de coalescing (source + requête)
+            fn: Coroutine à exécuter
+            ttl: Durée max de l'appel (utilisée par le backend Redis)
+        """
+        flights = self._flights.setdefault(asyncio.get_running_loop(), {})
+        self.stats['calls'] += 1
+
+        task = flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            flights[key] = task
+            task.add_done_callback(lambda _: flights.pop(key, None) if flights.get(key) is task else None)
+        else:
+            self.stats['shared'] += 1
+
+        return await asyncio.shield(task)
+
+
+class RedisSingleFlight(SingleFlight):
+    """Coalescing entre workers via Redis (et en mémoire dans chaque process)"""
+
+    def __init__(self, redis_url: str = None, prefix: str = 'osint:flight'):
+        super().__init__()
+        import redis.asyncio as aioredis
+
+        self.redis_url = redis_url or os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+        self.prefix = prefix
+        self._aioredis = aioredis
+        self._clients = weakref.WeakKeyDictionary()
+
+    def _client(self):
+        """
+        Client redis.asyncio de l'event loop courante et son script de libération
+
+        Un client est lié à la loop de sa première connexion : un par loop.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            redis = self._aioredis.from_url(self.redis_url)
+            client = self._clients[loop] = (redis, redis.register_script(_RELEASE_LOCK))
+        return client
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]], ttl: float = 60) -> Any:
+        # Un seul appelant par process parle à Redis
+        return await super().do(key, lambda: self._do_distributed(key, fn, ttl), ttl)
+
+    async def _do_distributed(self, key: str, fn: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        lock_key = f'{self.prefix}:{key}:lock'
+        result_key = f'{self.prefix}:{key}:result'
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + ttl
+        redis, _ = self._client()
+
+        while True:
+            try:
+                acquired = await redis.set(lock_key, token, nx=True, px=int(ttl * 1000))
+            except Exception as e:
+                logger.warning(f"⚠️  Single-flight Redis unavailable ({e}), calling directly")
+                return await fn()
+
+            if acquired:
+                return await self._lead(lock_key, result_key, token, fn)
+
+            # Un autre worker fait l'appel : on attend son résultat
+            while time.monotonic() < deadline:
+                raw = await redis.get(result_key)
+                if raw is not None:
+                    self.stats['shared'] += 1
+                    shared = json.loads(raw)
+                    if 'error' in shared:
+                        raise SingleFlightError(shared['error'])
+                    return shared['value']
+                if not await redis.exists(lock_key):
+                    break  # Verrou libéré sans résultat (worker arrêté) : on retente
+                await asyncio.sleep(POLL_INTERVAL)
+            else:
+                logger.warning(f"⏱️  Single-flight wait exceeded for {key}, calling directly")
+                return await fn()
+
+    async def _lead(self, lock_key: str, result_key: str, token: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Fait l'appel et publie son résultat (ou son erreur) pour les autres workers"""
+        redis, release = self._client()
+        shared = None
+        try:
+            value = await fn()
+            shared = {'value': value}
+            return value
+        except Exception as e:
+            shared = {'error': str(e)}
+            raise
+        finally:
+            # Annulé : rien à partager, les autres workers reprendront la main
+            try:
+                if shared is not None:
+                    await redis.set(result_key, json.dumps(shared, default=str), px=int(RESULT_TTL * 1000))
+                await release(keys=[lock_key], args=[token])
+            except Exception as e:
+                logger.warning(f"⚠️  Single-flight result not shared ({e})")
+
+
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    """
+    Retourne le coalescer du process
+
+    SINGLE_FLIGHT_BACKEND=redis pour dédupliquer aussi entre workers,
+    'memory' (défaut) pour un seul process.
+    """
+    global _single_flight
+    if _single_flight is None:
+        backend = os.getenv('SINGLE_FLIGHT_BACKEND', 'memory').lower()
+        if backend == 'redis':
+            try:
+                _single_flight = RedisSingleFlight()
+            except Exception as e:
+                logger.warning(f"⚠️  Redis single-flight unavailable ({e}), using in-memory coalescing")
+        if _single_flight is None:
+            _single_flight = SingleFlight()
+    return _single_flight
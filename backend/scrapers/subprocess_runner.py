@@ -0,0 +1,142 @@
+"""
+Non-blocking runner for external OSINT tools (Sherlock, Holehe...)
+Lecture de stdout en streaming, nombre de process limité, kill propre au timeout
+"""
+import os
+import time
+import signal
+import asyncio
+import logging
+import weakref
+from typing import Dict, Any, List, Callable
+
+logger = logging.getLogger(__name__)
+
+# Nombre max d'outils externes lancés en même temps (par process)
+MAX_TOOL_PROCESSES = int(os.getenv('MAX_TOOL_PROCESSES', 4))
+
+# Délai laissé au process pour s'arrêter après SIGTERM
+KILL_GRACE_PERIOD = 5
+
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """Sémaphore du loop courant"""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(MAX_TOOL_PROCESSES)
+    return semaphore
+
+
+async def _acquire_slot(semaphore: asyncio.Semaphore, timeout: float) -> bool:
+    """Prend un slot avant timeout (False sinon), sans jamais perdre de slot"""
+    acquire = asyncio.ensure_future(semaphore.acquire())
+
+    def release_if_acquired(task: asyncio.Future):
+        if not task.cancelled():
+            semaphore.release()
+
+    try:
+        done, _ = await asyncio.wait({acquire}, timeout=max(0.0, timeout))
+    except asyncio.CancelledError:
+        acquire.cancel()
+        acquire.add_done_callback(release_if_acquired)
+        raise
+    if not done:
+        # Obtenu entre-temps ou annulé : le callback rend le slot s'il a été pris
+        acquire.cancel()
+        acquire.add_done_callback(release_if_acquired)
+        return False
+    return True
+
+
+async def _terminate(process: asyncio.subprocess.Process):
+    """Arrête le process et tous ses enfants (SIGTERM puis SIGKILL)"""
+    if process.returncode is not None:
+        return
+
+    try:
+        if os.name == 'nt':
+            process.kill()
+        else:
+            # start_new_session=True : le pid est aussi l'id du groupe
+            os.killpg(process.pid, signal.SIGTERM)
+            try:
+                await asyncio.wait_for(process.wait(), timeout=KILL_GRACE_PERIOD)
+                return
+            except asyncio.TimeoutError:
+                os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+    await process.wait()
+
+
+async def run_tool(cmd: List[str], timeout: float, on_line: Callable[[str], None] = None) -> Dict[str, Any]:
+    """
+    Lance un outil externe sans bloquer l'event loop
+
+    Args:
+        cmd: Commande et arguments
+        timeout: Durée max en secondes, attente d'un slot comprise (le process
+            est tué au-delà) : le résultat partiel est rendu avant la deadline
+            de l'appelant
+        on_line: Appelé pour chaque ligne de stdout, dès qu'elle est écrite
+
+    Returns:
+        Dict avec returncode, stdout, stderr et timed_out. En cas de timeout,
+        stdout contient ce qui a été lu avant l'arrêt du process.
+
+    Raises:
+        FileNotFoundError: Si l'outil n'est pas installé
+    """
+    start = time.monotonic()
+    semaphore = _get_semaphore()
+    if not await _acquire_slot(semaphore, timeout):
+        logger.warning(f"⏱️  {cmd[0]}: no free slot within {timeout}s (MAX_TOOL_PROCESSES={MAX_TOOL_PROCESSES})")
+        return {'returncode': None, 'stdout': '', 'stderr': '', 'timed_out': True}
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=(os.name != 'nt'),
+            limit=1024 * 1024  # Lignes JSON longues
+        )
+
+        stdout_lines: List[str] = []
+        stderr_chunks: List[bytes] = []
+
+        async def read_stdout():
+            async for raw in process.stdout:
+                line = raw.decode('utf-8', errors='replace').rstrip('\r\n')
+                stdout_lines.append(line)
+                if on_line:
+                    on_line(line)
+
+        async def read_stderr():
+            stderr_chunks.append(await process.stderr.read())
+
+        timed_out = False
+        try:
+            await asyncio.wait_for(asyncio.gather(read_stdout(), read_stderr(), process.wait()),
+                                   timeout=max(0.1, timeout - (time.monotonic() - start)))
+        except asyncio.TimeoutError:
+            timed_out = True
+            logger.warning(f"⏱️  {cmd[0]} timeout ({timeout}s), killing process")
+            await _terminate(process)
+        except asyncio.CancelledError:
+            await _terminate(process)
+            raise
+
+        return {
+            'returncode': process.returncode,
+            'stdout': '\n'.join(stdout_lines),
+            'stderr': b''.join(stderr_chunks).decode('utf-8', errors='replace'),
+            'timed_out': timed_out
+        }
+    finally:
+        semaphore.release()
@@ -2,10 +2,11 @@
 Username OSINT Scraper
 Uses: Sherlock, Maigret (find social media accounts by username)
 """
-import subprocess
 import json
 from typing import Dict, Any, List
 from scrapers.base_scraper import BaseScraper
+from scrapers.subprocess_runner import run_tool
+from scrapers.policy import get_policy
 
 
 class UsernameScraper(BaseScraper):
@@ -36,22 +37,51 @@ class UsernameScraper(BaseScraper):
         """
         Lance Sherlock pour trouver le username sur 300+ sites
 
+        Un seul Sherlock par username à la fois : les investigations
+        concurrentes sur le même pseudo partagent le même run.
+
         Installation: pip install sherlock-project
         """
+        return await self.coalesce('sherlock', username, lambda: self._sherlock(username),
+                                   ttl=get_policy('sherlock').deadline + 30)
+
+    async def _sherlock(self, username: str) -> Dict:
+        """Lance Sherlock (comptes streamés via emit_finding)"""
+        streamed_accounts = []
+
+        def on_line(line: str):
+            # Comptes récupérés au fil de l'eau (conservés même en cas de timeout)
+            if '[+]' in line or '✓' in line:
+                streamed_accounts.append(line.strip())
+                self.emit_finding('account', {'info': line.strip()})
+
+        timeout = get_policy('sherlock').deadline
         try:
             # Lancer Sherlock
-            result = subprocess.run(
+            result = await run_tool(
                 ['sherlock', username, '--json', '--timeout', '10', '--print-found'],
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minutes max
+                timeout=timeout,
+                on_line=on_line
             )
 
-            if result.returncode == 0:
+            if result['timed_out']:
+                if streamed_accounts:
+                    return {
+                        'found_count': len(streamed_accounts),
+                        'accounts': streamed_accounts,
+                        'success': True,
+                        'partial': True
+                    }
+                return {
+                    'error': f'Sherlock timeout ({timeout:.0f}s exceeded)',
+                    'success': False
+                }
+
+            if result['returncode'] == 0:
                 # Parser la sortie JSON
                 try:
                     # Sherlock output peut avoir du texte avant le JSON
-                    output_lines = result.stdout.strip().split('\n')
+                    output_lines = result['stdout'].strip().split('\n')
                     json_line = None
 
                     for line in output_lines:
@@ -68,22 +98,19 @@ class UsernameScraper(BaseScraper):
                         }
 
                 except json.JSONDecodeError:
-                    # Si le JSON parse échoue, parser manuellement
-                    accounts_found = []
-                    for line in result.stdout.split('\n'):
-                        if '[+]' in line or '✓' in line:
-                            accounts_found.append(line.strip())
+                    pass
 
-                    return {
-                        'found_count': len(accounts_found),
-                        'accounts': accounts_found,
-                        'success': True,
-                        'raw_output': result.stdout
-                    }
+                # Pas de JSON exploitable : comptes lus ligne par ligne
+                return {
+                    'found_count': len(streamed_accounts),
+                    'accounts': streamed_accounts,
+                    'success': True,
+                    'raw_output': result['stdout']
+                }
 
             return {
                 'error': 'Sherlock failed',
-                'stderr': result.stderr,
+                'stderr': result['stderr'],
                 'success': False
             }
 
@@ -92,11 +119,6 @@ class UsernameScraper(BaseScraper):
                 'error': 'Sherlock not installed. Install with: pip install sherlock-project',
                 'success': False
             }
-        except subprocess.TimeoutExpired:
-            return {
-                'error': 'Sherlock timeout (5 min exceeded)',
-                'success': False
-            }
         except Exception as e:
             return {
                 'error': str(e),
@@ -223,7 +245,13 @@ if __name__ == "__main__":
         print(f"\n🔍 Searching for: {test_username}\n")
         print("⏳ Cela peut prendre 1-3 minutes...\n")
 
-        result = await scraper.process(test_username)
+        # Les comptes s'affichent dès que Sherlock les trouve
+        result = None
+        async for event in scraper.process_stream(test_username):
+            if event['type'] == 'finding':
+                print(f"   ✅ {event['data'].get('info')}")
+            else:
+                result = {k: v for k, v in event.items() if k != 'type'}
 
         print("=" * 70)
         print("📊 RÉSULTATS")
@@ -0,0 +1,274 @@
+"""
+VirusTotal OSINT Scraper - réputation de domaines et d'URLs
+Uses: VirusTotal API v3. Le rapport existant est lu d'abord ; une analyse
+n'est demandée que s'il manque ou est trop ancien, puis suivie par polling
+de /analyses/{id} avec backoff.
+"""
+import os
+import time
+import base64
+import random
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+from dotenv import load_dotenv
+from scrapers.base_scraper import BaseScraper
+from scrapers.cache import make_cache_key
+from scrapers.policy import call_with_policy
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = 'https://www.virustotal.com/api/v3'
+
+# Âge max d'un rapport existant avant de demander une nouvelle analyse (secondes)
+REPORT_MAX_AGE = int(os.getenv('VIRUSTOTAL_REPORT_MAX_AGE', 7 * 24 * 3600))
+
+# Polling des analyses : premier délai, facteur de backoff, plafond, durée max
+POLL_INITIAL = 10
+POLL_BACKOFF = 1.5
+POLL_MAX = 60
+ANALYSIS_TIMEOUT = float(os.getenv('VIRUSTOTAL_ANALYSIS_TIMEOUT', 300))
+
+
+def url_id(url: str) -> str:
+    """Identifiant VirusTotal d'une URL (base64 url-safe sans padding)"""
+    return base64.urlsafe_b64encode(url.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+class VirusTotalScraper(BaseScraper):
+    """Scraper VirusTotal pour domaines et URLs"""
+
+    def __init__(self, http=None):
+        """
+        Args:
+            http: Client HTTP (défaut : pool partagé des scrapers)
+        """
+        super().__init__({'rate_limit': 4 / 60})
+        if http is not None:
+            self.http = http
+        self.api_key = os.getenv('VIRUSTOTAL_API_KEY')
+
+    async def scrape(self, target: str, analysis_timeout: float = ANALYSIS_TIMEOUT,
+                     reanalyze: bool = True) -> Dict[str, Any]:
+        """
+        Rapport VirusTotal d'un domaine ou d'une URL
+
+        Args:
+            target: Domaine (example.com) ou URL (https://...)
+            analysis_timeout: Durée max d'attente d'une nouvelle analyse
+            reanalyze: Demander une analyse si le rapport manque ou est trop
+                ancien (False : rapport existant seul, quel que soit son âge)
+
+        Returns:
+            Dict avec le rapport ou l'analyse terminée
+        """
+        if not self.api_key:
+            return {'target': target, 'error': 'VIRUSTOTAL_API_KEY not configured'}
+
+        # Une seule analyse en cours par cible, même entre investigations
+        return await self.coalesce(
+            'virustotal_scan' if reanalyze else 'virustotal_report', target,
+            lambda: self._scan(target, analysis_timeout, reanalyze),
+            ttl=analysis_timeout + 60
+        )
+
+    async def analyze_many(self, targets: List[str], max_concurrent: int = 20,
+                           analysis_timeout: float = ANALYSIS_TIMEOUT) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyse une liste de domaines/URLs en parallèle
+
+        Le quota (4 requêtes/minute en API publique) est partagé via le rate
+        limiter ; pendant qu'une analyse attend entre deux polls, les autres
+        cibles avancent.
+
+        Returns:
+            {cible: résultat de process()}
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def analyze(target: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    raw = await self.scrape(target, analysis_timeout)
+                    return {'status': 'success', 'target': target, 'source': self.__class__.__name__,
+                            'data': self.parse(raw)}
+                except Exception as e:
+                    return {'status': 'error', 'target': target, 'source': self.__class__.__name__,
+                            'error': str(e)}
+
+        targets = list(dict.fromkeys(targets))
+        return dict(zip(targets, await asyncio.gather(*(analyze(t) for t in targets))))
+
+    async def _scan(self, target: str, analysis_timeout: float, reanalyze: bool = True) -> Dict[str, Any]:
+        is_url = '://' in target
+        target_type = 'url' if is_url else 'domain'
+        report_url = f"{BASE_URL}/urls/{url_id(target)}" if is_url else f"{BASE_URL}/domains/{target}"
+        headers = {'x-apikey': self.api_key}
+
+        # Analyse déjà faite par ce scraper (le rapport peut encore être en 404 côté cache)
+        analysis_key = make_cache_key(report_url, {'analysis': True})
+        cached = await self.cache.get_async('virustotal', analysis_key)
+        if cached is not None:
+            return cached['value']
+
+        # 1. Rapport existant : aucune soumission s'il est récent
+        status_code, report = await self.fetch_json(
+            'virustotal', report_url, headers=headers,
+            cache_if=self._is_fresh
+        )
+        if status_code == 200 and (self._is_fresh(report) or not reanalyze):
+            return {'target': target, 'type': target_type, 'source': 'report', 'report': report}
+        if status_code not in (200, 404):
+            return {'target': target, 'error': f'Status code: {status_code}'}
+        if not reanalyze:
+            return {'target': target, 'error': 'No VirusTotal report'}
+        known = report if status_code == 200 else None
+
+        # 2. Nouvelle analyse : réanalyse si la cible est connue de VirusTotal,
+        # soumission sinon (les domaines sont toujours réanalysés)
+        if known is not None or not is_url:
+            submit_url, data = f"{report_url}/analyse", None
+        else:
+            submit_url, data = f"{BASE_URL}/urls", {'url': target}
+
+        status_code, submitted = await self._request_json('POST', submit_url, headers=headers, data=data)
+        if status_code != 200:
+            if known is not None:
+                # Rapport ancien plutôt que rien
+                return {'target': target, 'type': target_type, 'source': 'report', 'report': known}
+            return {'target': target, 'error': f'Submission failed: HTTP {status_code}'}
+
+        analysis_id = submitted['data']['id']
+        logger.info(f"🛡️  VirusTotal analysis queued for {target} ({analysis_id})")
+
+        # 3. Polling avec backoff jusqu'à la fin de l'analyse
+        analysis = await self._wait_for_analysis(analysis_id, headers, analysis_timeout)
+        if analysis is None:
+            if known is not None:
+                # Rapport ancien plutôt que rien (l'analyse continue côté VirusTotal)
+                logger.info(f"⏱️  VirusTotal analysis of {target} still running, using previous report")
+                return {'target': target, 'type': target_type, 'source': 'report', 'report': known,
+                        'analysis_id': analysis_id}
+            return {'target': target, 'error': f'Analysis not completed after {analysis_timeout:.0f}s',
+                    'analysis_id': analysis_id}
+
+        raw = {'target': target, 'type': target_type, 'source': 'analysis', 'analysis': analysis}
+        await self.cache.set_async('virustotal', analysis_key, raw)
+        return raw
+
+    async def _wait_for_analysis(self, analysis_id: str, headers: Dict[str, str],
+                                 timeout: float) -> Optional[Dict[str, Any]]:
+        """Suit une analyse jusqu'à 'completed' (None si timeout)"""
+        deadline = time.monotonic() + timeout
+        delay = POLL_INITIAL
+
+        while True:
+            # Jitter : les analyses soumises ensemble ne sont pas relues ensemble
+            await asyncio.sleep(min(delay * random.uniform(0.8, 1.2), max(0.0, deadline - time.monotonic())))
+
+            status_code, body = await self._request_json('GET', f"{BASE_URL}/analyses/{analysis_id}", headers=headers)
+            if status_code == 200 and body['data']['attributes'].get('status') == 'completed':
+                return body
+
+            if time.monotonic() >= deadline:
+                return None
+            delay = min(delay * POLL_BACKOFF, POLL_MAX)
+
+    async def _request_json(self, method: str, url: str, **kwargs) -> Tuple[int, Any]:
+        """Appel non mis en cache (soumissions, polling), selon la politique 'virustotal'"""
+        async def attempt(timeout: float):
+            await self.rate_limit_wait('virustotal')
+            return await self.http.request(method, url, timeout=timeout, **kwargs)
+
+        response = await call_with_policy('virustotal', attempt)
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        return response.status_code, body
+
+    @staticmethod
+    def _is_fresh(body: Any) -> bool:
+        """Rapport analysé depuis moins de REPORT_MAX_AGE"""
+        if not isinstance(body, dict):
+            return False
+        analysed_at = body.get('data', {}).get('attributes', {}).get('last_analysis_date')
+        return bool(analysed_at) and time.time() - analysed_at < REPORT_MAX_AGE
+
+    def parse(self, raw_data: Dict) -> Dict[str, Any]:
+        """Parse le rapport ou l'analyse"""
+        target = raw_data.get('target')
+        if raw_data.get('error'):
+            return {'target': target, 'error': raw_data['error'], 'risk_score': 0.0, 'risk_level': 'low'}
+
+        if raw_data['source'] == 'report':
+            attributes = raw_data['report'].get('data', {}).get('attributes', {})
+            stats = attributes.get('last_analysis_stats', {})
+            analysed_at = attributes.get('last_analysis_date')
+        else:
+            attributes = raw_data['analysis'].get('data', {}).get('attributes', {})
+            stats = attributes.get('stats', {})
+            analysed_at = attributes.get('date')
+
+        malicious = stats.get('malicious', 0)
+        suspicious = stats.get('suspicious', 0)
+
+        # Score de risque : détections malveillantes (max 80) + suspectes (max 20)
+        risk_score = min(malicious * 10, 80) + min(suspicious * 5, 20)
+
+        return {
+            'target': target,
+            'type': raw_data['type'],
+            'malicious': malicious,
+            'suspicious': suspicious,
+            'harmless': stats.get('harmless', 0),
+            'undetected': stats.get('undetected', 0),
+            'is_safe': malicious == 0,
+            'reputation': attributes.get('reputation'),
+            'categories': attributes.get('categories', {}),
+            'analysed_at': analysed_at,
+            'fresh_analysis': raw_data['source'] == 'analysis',
+            'risk_score': float(risk_score),
+            'risk_level': self._get_risk_level(risk_score)
+        }
+
+    def _get_risk_level(self, score: float) -> str:
+        """Convertit le score en niveau de risque"""
+        if score >= 75:
+            return 'critical'
+        elif score >= 50:
+            return 'high'
+        elif score >= 25:
+            return 'medium'
+        else:
+            return 'low'
+
+
+# Test du scraper
+if __name__ == "__main__":
+    import sys
+    from scrapers.http_client import close_http_client
+
+    async def test():
+        print("=" * 60)
+        print("🧪 TEST DU SCRAPER VIRUSTOTAL")
+        print("=" * 60)
+
+        scraper = VirusTotalScraper()
+        targets = sys.argv[1:] or ['google.com', 'example.com', 'https://www.google.com']
+
+        results = await scraper.analyze_many(targets)
+        for target, result in results.items():
+            data = result.get('data', {})
+            if result['status'] != 'success' or data.get('error'):
+                print(f"\n❌ {target} : {data.get('error') or result.get('error')}")
+                continue
+            print(f"\n🛡️  {target} : {'✅ sûr' if data['is_safe'] else '❌ malveillant'} "
+                  f"({data['malicious']} malveillant, {data['suspicious']} suspect"
+                  f"{', nouvelle analyse' if data['fresh_analysis'] else ''})")
+
+        await close_http_client()
+
+    asyncio.run(test())
@@ -0,0 +1,48 @@
+"""
+Celery application for distributed scraping
+Lancement : celery -A tasks.celery_app worker -Q api     (lookups API rapides)
+            celery -A tasks.celery_app worker -Q tools   (Sherlock, Holehe)
+"""
+from celery import Celery
+from celery.schedules import crontab
+from kombu import Queue
+from config import settings
+
+celery_app = Celery(
+    'osint',
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=['tasks.scraping', 'tasks.maintenance']
+)
+
+celery_app.conf.update(
+    task_serializer='json',
+    result_serializer='json',
+    accept_content=['json'],
+    result_expires=24 * 3600,
+
+    # Deux files : les outils lents ne bloquent pas les lookups API
+    task_queues=(Queue('api'), Queue('tools')),
+    task_default_queue='api',
+    task_routes={
+        'tasks.scraping.scrape_username': {'queue': 'tools'},
+        'tasks.scraping.find_email_accounts': {'queue': 'tools'},
+    },
+
+    # Une tâche perdue (worker tué) est relancée ailleurs
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+
+    # Partitions collected_data des mois à venir (quotidien, idempotent)
+    beat_schedule={
+        'maintain-partitions': {
+            'task': 'tasks.maintenance.maintain_partitions',
+            'schedule': crontab(hour=3, minute=0),
+        },
+        'compact-identity-index': {
+            'task': 'tasks.maintenance.compact_identity_index',
+            'schedule': crontab(hour=3, minute=30),
+        },
+    },
+)
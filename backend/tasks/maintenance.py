@@ -0,0 +1,21 @@
+"""
+Celery periodic tasks - maintenance de la base
+Lancement du planificateur : celery -A tasks.celery_app beat
+"""
+from tasks.celery_app import celery_app
+from models.partitions import ensure_collected_data_partitions
+from graph.identity_index import get_identity_index
+
+
+@celery_app.task
+def maintain_partitions():
+    """Crée à l'avance les partitions mensuelles de collected_data"""
+    return ensure_collected_data_partitions()
+
+
+@celery_app.task
+def compact_identity_index():
+    """Réécrit le snapshot de l'index d'identifiants et vide son journal"""
+    index = get_identity_index()
+    index.compact()
+    return len(index)
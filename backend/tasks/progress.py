@@ -0,0 +1,87 @@
+"""
+Investigation progress events (Redis pub/sub)
+Les workers publient l'avancement (source lancée/terminée, résultats partiels,
+statut) sur un canal Redis par investigation ; les nœuds API les relaient aux
+clients (SSE / WebSocket). Un historique court permet aux clients arrivés en
+cours de route de rattraper les événements déjà publiés.
+"""
+import os
+import json
+import logging
+from datetime import datetime
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+
+# Événements conservés par investigation, et durée de conservation
+EVENT_HISTORY = int(os.getenv('EVENT_HISTORY', 500))
+EVENT_TTL = int(os.getenv('EVENT_TTL', 3600))
+
+# Statuts après lesquels plus aucun événement n'est publié
+TERMINAL_STATUSES = ('completed', 'failed')
+
+# Numéro de séquence, historique et publication en une opération atomique :
+# l'ordre des numéros est celui de la publication
+_PUBLISH_SCRIPT = """
+local seq = redis.call('INCR', KEYS[1])
+local payload = '{"seq":' .. seq .. ',' .. string.sub(ARGV[1], 2)
+redis.call('RPUSH', KEYS[2], payload)
+redis.call('LTRIM', KEYS[2], -tonumber(ARGV[2]), -1)
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+redis.call('PUBLISH', KEYS[3], payload)
+return seq
+"""
+
+_redis = None
+_script = None
+
+
+def channel_name(investigation_id: str) -> str:
+    return f"osint:investigation:{investigation_id}:events"
+
+
+def history_key(investigation_id: str) -> str:
+    return f"osint:investigation:{investigation_id}:history"
+
+
+def _sequence_key(investigation_id: str) -> str:
+    return f"osint:investigation:{investigation_id}:seq"
+
+
+def _get_script():
+    global _redis, _script
+    if _script is None:
+        import redis
+        _redis = redis.from_url(REDIS_URL)
+        _script = _redis.register_script(_PUBLISH_SCRIPT)
+    return _script
+
+
+def publish_event(investigation_id: str, event_type: str, **data: Any) -> int:
+    """
+    Publie un événement d'avancement
+
+    Une erreur Redis est journalisée mais ne fait jamais échouer la tâche.
+
+    Returns:
+        Numéro de séquence de l'événement (0 si non publié)
+    """
+    investigation_id = str(investigation_id)
+    event = {
+        'type': event_type,
+        'investigation_id': investigation_id,
+        'ts': datetime.utcnow().isoformat(),
+        **data
+    }
+
+    try:
+        return int(_get_script()(
+            keys=[_sequence_key(investigation_id), history_key(investigation_id), channel_name(investigation_id)],
+            args=[json.dumps(event, default=str), EVENT_HISTORY, EVENT_TTL]
+        ))
+    except Exception as e:
+        logger.warning(f"⚠️  Progress event not published ({event_type}, {investigation_id}): {e}")
+        return 0
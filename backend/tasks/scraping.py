@@ -0,0 +1,298 @@
+"""
+Celery tasks - un scraper par tâche, résultats enregistrés en base
+"""
+import uuid
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Any, List
+
+from celery import chord, group
+
+from tasks.celery_app import celery_app
+from models.database import SessionLocal
+from models.models import Investigation
+from models.bulk import BulkWriter
+from graph.writer import GraphWriter
+from graph.identity_index import get_identity_index
+from tasks.progress import publish_event
+from scrapers.email_scraper import EmailScraper
+from scrapers.phone_scraper import PhoneScraper
+from scrapers.shodan_scraper import ShodanScraper
+from scrapers.username_scraper import UsernameScraper
+
+logger = logging.getLogger(__name__)
+
+
+class ScraperTaskError(Exception):
+    """Le scraper a échoué (la tâche sera retentée)"""
+
+
+# Retry avec backoff exponentiel (+ jitter) sur les erreurs de scraping
+RETRY_POLICY = {
+    'autoretry_for': (ScraperTaskError,),
+    'retry_backoff': 5,
+    'retry_backoff_max': 600,
+    'retry_jitter': True,
+    'max_retries': 5,
+}
+
+# Source et type de donnée enregistrés pour chaque tâche
+DATA_TYPES = {
+    'shodan': 'ip_scan',
+    'email': 'email_profile',
+    'holehe': 'accounts',
+    'phone': 'phone_info',
+    'username': 'accounts',
+}
+
+
+# Un event loop et des scrapers par process worker : le pool HTTP est
+# réutilisé d'une tâche à l'autre
+_loop = None
+_scrapers: Dict[str, Any] = {}
+
+
+def run_async(coro):
+    """Exécute une coroutine sur l'event loop du worker"""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(coro)
+
+
+def get_scraper(name: str):
+    """Instance de scraper partagée par les tâches du process"""
+    if name not in _scrapers:
+        factories = {
+            'shodan': ShodanScraper,
+            'email': lambda: EmailScraper(use_holehe=False),  # Holehe : tâche dédiée
+            'holehe': EmailScraper,
+            'phone': PhoneScraper,
+            'username': UsernameScraper,
+        }
+        _scrapers[name] = factories[name]()
+    return _scrapers[name]
+
+
+async def _stream_process(name: str, target: str, investigation_id: str) -> Dict[str, Any]:
+    """process_stream() : chaque résultat partiel est publié dès qu'il est trouvé"""
+    result = None
+    async for event in get_scraper(name).process_stream(target, include_raw=True):
+        if event['type'] == 'finding':
+            publish_event(investigation_id, 'finding', source=name, kind=event['kind'], data=event['data'])
+        else:
+            result = {k: v for k, v in event.items() if k != 'type'}
+    return result
+
+
+def _transient_errors(value: Any) -> List[str]:
+    """Erreurs marquées 'transient' par les scrapers (voir BaseScraper.source_error)"""
+    if isinstance(value, dict):
+        if value.get('transient'):
+            return [str(value.get('error'))]
+        return [error for item in value.values() for error in _transient_errors(item)]
+    if isinstance(value, list):
+        return [error for item in value for error in _transient_errors(item)]
+    return []
+
+
+def _process(name: str, target: str, investigation_id: str = None, can_retry: bool = True) -> Dict[str, Any]:
+    """
+    Lance le scraper et lève une erreur retentable en cas d'échec
+
+    Les scrapers rendent les pannes amont comme données ({'error': ...,
+    'transient': True}) : elles déclenchent aussi un retry (les sources qui
+    ont répondu sont relues depuis le cache). Au dernier essai, le résultat
+    partiel est enregistré plutôt que de faire échouer l'investigation.
+    """
+    if investigation_id:
+        publish_event(investigation_id, 'source_started', source=name)
+        result = run_async(_stream_process(name, target, investigation_id))
+    else:
+        result = run_async(get_scraper(name).process(target, include_raw=True))
+
+    if result['status'] != 'success':
+        if investigation_id:
+            publish_event(investigation_id, 'source_error', source=name, error=result.get('error'))
+        raise ScraperTaskError(result.get('error', 'Unknown error'))
+
+    transient = _transient_errors(result.get('raw_data'))
+    if transient and can_retry:
+        error = f"{name}: upstream unavailable ({'; '.join(transient)})"
+        if investigation_id:
+            publish_event(investigation_id, 'source_error', source=name, error=error)
+        raise ScraperTaskError(error)
+    return result
+
+
+# ═══════════════════════════════════════════════════════════════
+# TÂCHES DE SCRAPING
+# ═══════════════════════════════════════════════════════════════
+
+def _can_retry(task) -> bool:
+    return task.request.retries < task.max_retries
+
+
+@celery_app.task(bind=True, **RETRY_POLICY)
+def scrape_ip(self, ip_address: str, investigation_id: str = None) -> Dict[str, Any]:
+    """Shodan (file 'api')"""
+    return {'source': 'shodan', **_process('shodan', ip_address, investigation_id, _can_retry(self))}
+
+
+@celery_app.task(bind=True, **RETRY_POLICY)
+def scrape_email(self, email: str, investigation_id: str = None) -> Dict[str, Any]:
+    """HIBP, Hunter, EmailRep (file 'api')"""
+    return {'source': 'email', **_process('email', email, investigation_id, _can_retry(self))}
+
+
+@celery_app.task(bind=True, **RETRY_POLICY)
+def scrape_phone(self, phone_number: str, investigation_id: str = None) -> Dict[str, Any]:
+    """phonenumbers + Numverify (file 'api')"""
+    return {'source': 'phone', **_process('phone', phone_number, investigation_id, _can_retry(self))}
+
+
+@celery_app.task(bind=True, **RETRY_POLICY)
+def scrape_username(self, username: str, investigation_id: str = None) -> Dict[str, Any]:
+    """Sherlock (file 'tools')"""
+    return {'source': 'username', **_process('username', username, investigation_id, _can_retry(self))}
+
+
+@celery_app.task
+def find_email_accounts(email: str, investigation_id: str = None) -> Dict[str, Any]:
+    """Holehe (file 'tools') - une erreur Holehe n'empêche pas l'investigation"""
+    if investigation_id:
+        publish_event(investigation_id, 'source_started', source='holehe')
+    scraper = get_scraper('holehe')
+    accounts = run_async(scraper._find_accounts(email))
+    return {
+        'source': 'holehe',
+        'status': 'success',
+        'target': email,
+        'data': {'email': email, 'social_accounts': accounts}
+    }
+
+
+# Tâches lancées pour chaque type de cible
+TARGET_TASKS = {
+    'ip': [scrape_ip],
+    'email': [scrape_email, find_email_accounts],
+    'phone': [scrape_phone],
+    'username': [scrape_username],
+}
+
+
+# ═══════════════════════════════════════════════════════════════
+# PIPELINE D'INVESTIGATION
+# ═══════════════════════════════════════════════════════════════
+
+@celery_app.task
+def save_result(result: Dict[str, Any], investigation_id: str) -> Dict[str, Any]:
+    """Enregistre le résultat d'un scraper dans collected_data (payload brut dans raw_blobs)"""
+    data = result.get('data', {})
+
+    # Même chemin d'écriture que les imports en masse (blob dédupliqué,
+    # COPY sur PostgreSQL) ; écrit avant de publier la fin de la source
+    writer = BulkWriter()
+    writer.add_result(
+        uuid.UUID(investigation_id),
+        result['source'],
+        DATA_TYPES.get(result['source']),
+        raw_data=result.get('raw_data'),
+        processed_data=data,
+        risk_level=data.get('risk_level', 'unknown')
+    )
+    writer.flush()
+
+    # Graphe de relations : un lot UNWIND par résultat ; Neo4j indisponible
+    # n'empêche pas l'investigation
+    try:
+        with GraphWriter() as graph:
+            graph.add(data, investigation_id)
+    except Exception as e:
+        logger.warning(f"⚠️  Graph write failed for {investigation_id}: {e}")
+
+    # Index identifiant -> investigations (rapprochements entre investigations)
+    index = get_identity_index()
+    index.refresh()
+    index.add_result(investigation_id, data)
+    related = index.related(investigation_id)
+    if related:
+        logger.info(f"🔗 Investigation {investigation_id} shares identifiers with {len(related)} other(s)")
+
+    publish_event(investigation_id, 'source_completed', source=result['source'],
+                  risk_score=data.get('risk_score'), risk_level=data.get('risk_level'))
+
+    return {'source': result['source'], 'risk_score': data.get('risk_score', 0)}
+
+
+@celery_app.task
+def finalize_investigation(summaries: List[Dict[str, Any]], investigation_id: str):
+    """Marque l'investigation terminée avec le score de risque maximal"""
+    db = SessionLocal()
+    try:
+        investigation = db.get(Investigation, uuid.UUID(investigation_id))
+        investigation.risk_score = max((s.get('risk_score') or 0 for s in summaries), default=0)
+        investigation.status = 'completed'
+        investigation.updated_at = datetime.utcnow()
+        db.commit()
+        risk_score = investigation.risk_score
+    finally:
+        db.close()
+
+    publish_event(investigation_id, 'status', status='completed', risk_score=risk_score)
+
+
+@celery_app.task
+def mark_investigation_failed(request, exc, traceback, investigation_id: str):
+    """Errback : une tâche a épuisé ses retries"""
+    logger.error(f"❌ Investigation {investigation_id} failed: {exc}")
+    db = SessionLocal()
+    try:
+        investigation = db.get(Investigation, uuid.UUID(investigation_id))
+        investigation.status = 'failed'
+        investigation.updated_at = datetime.utcnow()
+        db.commit()
+    finally:
+        db.close()
+
+    publish_event(investigation_id, 'status', status='failed', error=str(exc))
+
+
+@celery_app.task
+def run_investigation(investigation_id: str):
+    """
+    Lance tous les scrapers d'une investigation en parallèle sur les workers
+
+    Chaque scraper est suivi de save_result ; finalize_investigation
+    s'exécute une fois toutes les branches terminées.
+    """
+    db = SessionLocal()
+    try:
+        investigation = db.get(Investigation, uuid.UUID(investigation_id))
+        target_tasks = TARGET_TASKS.get(investigation.target_type)
+
+        if not target_tasks:
+            investigation.status = 'failed'
+            db.commit()
+            publish_event(investigation_id, 'status', status='failed',
+                          error=f'Unsupported target type: {investigation.target_type}')
+            raise ValueError(f'Unsupported target type: {investigation.target_type}')
+
+        target = investigation.target_value
+        investigation.status = 'running'
+        db.commit()
+    finally:
+        db.close()
+
+    publish_event(investigation_id, 'status', status='running',
+                  sources=[task.name.rsplit('.', 1)[-1] for task in target_tasks])
+
+    branches = group(
+        task.s(target, investigation_id=investigation_id) | save_result.s(investigation_id)
+        for task in target_tasks
+    )
+    chord(branches)(
+        finalize_investigation.s(investigation_id).on_error(mark_investigation_failed.s(investigation_id))
+    )
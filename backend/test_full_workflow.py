@@ -5,7 +5,9 @@ Test complet : Investigation -> Scraping -> Stockage DB
 import asyncio
 from models.database import SessionLocal
 from models.models import Investigation, CollectedData, Alert
+from models.blobs import store_blob
 from scrapers.shodan_scraper import ShodanScraper
+from scrapers.http_client import close_http_client
 from datetime import datetime
 
 
@@ -41,7 +43,7 @@ async def test_full_workflow():
     # 3. Lancer le scraper Shodan
     print("\n🔍 Étape 2 : Lancement du scraper Shodan...")
     scraper = ShodanScraper()
-    result = await scraper.process('8.8.8.8')
+    result = await scraper.process('8.8.8.8', include_raw=True)
 
     if result['status'] == 'success':
         data = result['data']
@@ -59,7 +61,7 @@ async def test_full_workflow():
             investigation_id=investigation.id,
             source='shodan',
             data_type='ip_scan',
-            raw_data=result,
+            raw_hash=store_blob(db, result['raw_data']),  # Document Shodan compressé, dédupliqué
             processed_data=data,
             risk_level=data.get('risk_level', 'unknown'),
             ai_confidence=None,  # Pas encore d'IA
@@ -175,6 +177,7 @@ async def test_full_workflow():
         db.commit()
 
     db.close()
+    await close_http_client()
 
 
 if __name__ == "__main__":
@@ -7,15 +7,65 @@ Usage: python3 osint_person_search.py "John Doe" john.doe@example.com
 import os
 import sys
 import json
-import requests
+import time
+import asyncio
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
-from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Cache de réponses, pool HTTP, quotas et politiques partagés avec les scrapers du backend
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+from scrapers.cache import get_response_cache, make_cache_key  # noqa: E402
+from scrapers.http_client import get_http2_client, close_http_client  # noqa: E402
+from scrapers.policy import call_with_policy  # noqa: E402
+from scrapers.rate_limiter import get_rate_limiter  # noqa: E402
+from scrapers.virustotal_scraper import VirusTotalScraper  # noqa: E402
 
 # Charger les variables d'environnement
 load_dotenv()
 
+# Durée max d'une recherche sur une personne, toutes sources confondues (secondes)
+SEARCH_DEADLINE = float(os.getenv("OSINT_SEARCH_DEADLINE", 30))
+
+
+async def cached_get_json(source: str, url: str, params: Dict = None, headers: Dict = None,
+                          http=None) -> Tuple[int, Any]:
+    """
+    GET JSON via le cache de réponses (TTL par source)
+
+    Les réponses 200 et 404 ("rien trouvé") sont mises en cache, les erreurs non.
+    Timeout, retries (429/5xx, Retry-After) et circuit breaker suivent la
+    politique de la source (scrapers.policy).
+
+    Args:
+        http: Client HTTP (défaut : client HTTP/2 partagé du process)
+
+    Returns:
+        (status_code, corps JSON ou None)
+    """
+    http = http or get_http2_client()
+
+    async def attempt(timeout: float):
+        await get_rate_limiter().acquire(source)
+        return await http.get(url, params=params, headers=headers, timeout=timeout)
+
+    async def fetch() -> Dict:
+        response = await call_with_policy(source, attempt)
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        return {"status_code": response.status_code, "body": body}
+
+    entry = await get_response_cache().get_or_fetch(
+        source,
+        make_cache_key(url, params),
+        fetch,
+        cacheable=lambda e: e["status_code"] in (200, 404),
+        is_negative=lambda e: e["status_code"] == 404
+    )
+    return entry["status_code"], entry["body"]
+
 
 # ═══════════════════════════════════════════════════════════════
 # CLASSES API (réutilisées depuis api_examples.py)
@@ -23,11 +73,12 @@ load_dotenv()
 
 class ShodanAPI:
     """API Shodan pour scanner des IPs"""
-    def __init__(self):
+    def __init__(self, http=None):
         self.api_key = os.getenv("SHODAN_API_KEY")
         self.base_url = "https://api.shodan.io"
+        self.http = http or get_http2_client()
 
-    def search_ip(self, ip_address: str) -> Optional[Dict]:
+    async def search_ip(self, ip_address: str) -> Optional[Dict]:
         if not self.api_key:
             return {"error": "SHODAN_API_KEY manquante"}
 
@@ -35,9 +86,9 @@ class ShodanAPI:
         params = {"key": self.api_key}
 
         try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            status_code, data = await cached_get_json("shodan", url, params=params, http=self.http)
+            if status_code != 200:
+                return {"error": f"HTTP {status_code}"}
 
             return {
                 "ip": data.get("ip_str"),
@@ -55,11 +106,12 @@ class ShodanAPI:
 
 class HunterAPI:
     """API Hunter.io pour trouver des emails"""
-    def __init__(self):
+    def __init__(self, http=None):
         self.api_key = os.getenv("HUNTER_API_KEY")
         self.base_url = "https://api.hunter.io/v2"
+        self.http = http or get_http2_client()
 
-    def find_email(self, domain: str, first_name: str = None, last_name: str = None) -> Optional[Dict]:
+    async def find_email(self, domain: str, first_name: str = None, last_name: str = None) -> Optional[Dict]:
         if not self.api_key:
             return {"error": "HUNTER_API_KEY manquante"}
 
@@ -75,9 +127,9 @@ class HunterAPI:
             params["last_name"] = last_name
 
         try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            status_code, data = await cached_get_json("hunter", url, params=params, http=self.http)
+            if status_code != 200:
+                return {"error": f"HTTP {status_code}"}
 
             if data.get("data"):
                 return {
@@ -89,7 +141,7 @@ class HunterAPI:
         except Exception as e:
             return {"error": str(e)}
 
-    def verify_email(self, email: str) -> Optional[Dict]:
+    async def verify_email(self, email: str) -> Optional[Dict]:
         if not self.api_key:
             return {"error": "HUNTER_API_KEY manquante"}
 
@@ -100,9 +152,9 @@ class HunterAPI:
         }
 
         try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            status_code, data = await cached_get_json("hunter", url, params=params, http=self.http)
+            if status_code != 200:
+                return {"error": f"HTTP {status_code}"}
 
             if data.get("data"):
                 return {
@@ -119,11 +171,12 @@ class HunterAPI:
 
 class HaveIBeenPwnedAPI:
     """API HIBP pour vérifier les fuites de données"""
-    def __init__(self):
+    def __init__(self, http=None):
         self.api_key = os.getenv("HIBP_API_KEY")
         self.base_url = "https://haveibeenpwned.com/api/v3"
+        self.http = http or get_http2_client()
 
-    def check_email(self, email: str) -> Optional[Dict]:
+    async def check_email(self, email: str) -> Optional[Dict]:
         if not self.api_key:
             return {"error": "HIBP_API_KEY manquante"}
 
@@ -134,13 +187,13 @@ class HaveIBeenPwnedAPI:
         }
 
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            status_code, breaches = await cached_get_json("hibp", url, headers=headers, http=self.http)
 
-            if response.status_code == 404:
+            if status_code == 404:
                 return {"breached": False, "message": "Email non trouvé dans les fuites"}
 
-            response.raise_for_status()
-            breaches = response.json()
+            if status_code != 200:
+                return {"error": f"HTTP {status_code}"}
 
             return {
                 "breached": True,
@@ -161,11 +214,12 @@ class HaveIBeenPwnedAPI:
 
 class GitHubAPI:
     """API GitHub pour chercher des utilisateurs"""
-    def __init__(self):
+    def __init__(self, http=None):
         self.api_key = os.getenv("GITHUB_TOKEN")
         self.base_url = "https://api.github.com"
+        self.http = http or get_http2_client()
 
-    def search_user(self, username: str) -> Optional[Dict]:
+    async def search_user(self, username: str) -> Optional[Dict]:
         url = f"{self.base_url}/users/{username}"
         headers = {}
 
@@ -173,13 +227,13 @@ class GitHubAPI:
             headers["Authorization"] = f"token {self.api_key}"
 
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            status_code, data = await cached_get_json("github", url, headers=headers, http=self.http)
 
-            if response.status_code == 404:
+            if status_code == 404:
                 return {"error": "Utilisateur non trouvé"}
 
-            response.raise_for_status()
-            data = response.json()
+            if status_code != 200:
+                return {"error": f"HTTP {status_code}"}
 
             return {
                 "username": data.get("login"),
@@ -201,31 +255,28 @@ class GitHubAPI:
 
 class VirusTotalAPI:
     """API VirusTotal pour scanner des domaines"""
-    def __init__(self):
+    def __init__(self, http=None):
         self.api_key = os.getenv("VIRUSTOTAL_API_KEY")
-        self.base_url = "https://www.virustotal.com/api/v3"
+        self.scraper = VirusTotalScraper(http or get_http2_client())
 
-    def scan_domain(self, domain: str) -> Optional[Dict]:
+    async def scan_domain(self, domain: str) -> Optional[Dict]:
         if not self.api_key:
             return {"error": "VIRUSTOTAL_API_KEY manquante"}
 
-        url = f"{self.base_url}/domains/{domain}"
-        headers = {"x-apikey": self.api_key}
-
         try:
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-
-            stats = data.get("data", {}).get("attributes", {}).get("last_analysis_stats", {})
+            # Rapport existant seul : une réanalyse (quota de 4 req/min, polling)
+            # ne tient pas dans la deadline d'une recherche
+            data = self.scraper.parse(await self.scraper.scrape(domain, reanalyze=False))
+            if data.get("error"):
+                return {"error": data["error"]}
 
             return {
                 "domain": domain,
-                "malicious": stats.get("malicious", 0),
-                "suspicious": stats.get("suspicious", 0),
-                "harmless": stats.get("harmless", 0),
-                "undetected": stats.get("undetected", 0),
-                "is_safe": stats.get("malicious", 0) == 0
+                "malicious": data["malicious"],
+                "suspicious": data["suspicious"],
+                "harmless": data["harmless"],
+                "undetected": data["undetected"],
+                "is_safe": data["is_safe"]
             }
         except Exception as e:
             return {"error": str(e)}
@@ -238,17 +289,65 @@ class VirusTotalAPI:
 class OSINTSearchEngine:
     """Moteur de recherche OSINT pour agréger toutes les sources"""
 
-    def __init__(self):
-        self.shodan = ShodanAPI()
-        self.hunter = HunterAPI()
-        self.hibp = HaveIBeenPwnedAPI()
-        self.github = GitHubAPI()
-        self.virustotal = VirusTotalAPI()
-
-    def search_person(self, name: str = None, email: str = None, username: str = None, domain: str = None) -> Dict:
+    def __init__(self, deadline: float = SEARCH_DEADLINE, http=None):
+        """
+        Args:
+            deadline: Durée max d'une recherche (secondes) : les sources qui
+                n'ont pas répondu à temps sont marquées en échec
+            http: Client HTTP commun à toutes les API (défaut : client HTTP/2
+                partagé du process, connexions réutilisées entre recherches)
+        """
+        self.deadline = deadline
+        self.http = http or get_http2_client()
+        self.shodan = ShodanAPI(self.http)
+        self.hunter = HunterAPI(self.http)
+        self.hibp = HaveIBeenPwnedAPI(self.http)
+        self.github = GitHubAPI(self.http)
+        self.virustotal = VirusTotalAPI(self.http)
+
+    def _plan(self, name: str = None, email: str = None, username: str = None,
+              domain: str = None) -> Dict[str, Awaitable]:
+        """Sources à interroger pour cette cible (nom de la source -> coroutine)"""
+        sources = {}
+
+        # 1. Hunter.io - Vérifier l'email si fourni
+        if email:
+            sources["hunter_verify"] = self.hunter.verify_email(email)
+
+        # 2. Hunter.io - Chercher l'email depuis le nom + domaine
+        if name and domain:
+            name_parts = name.split()
+            first_name = name_parts[0] if len(name_parts) > 0 else None
+            last_name = name_parts[-1] if len(name_parts) > 1 else None
+            sources["hunter_find"] = self.hunter.find_email(domain, first_name, last_name)
+
+        # 3. HIBP - Vérifier les fuites de données
+        if email:
+            sources["hibp"] = self.hibp.check_email(email)
+
+        # 4. GitHub - Chercher l'utilisateur
+        if username:
+            sources["github"] = self.github.search_user(username)
+        elif email:
+            # Essayer avec la partie avant @ comme username
+            sources["github"] = self.github.search_user(email.split('@')[0])
+
+        # 5. VirusTotal - Scanner le domaine
+        if domain:
+            sources["virustotal"] = self.virustotal.scan_domain(domain)
+        elif email:
+            sources["virustotal"] = self.virustotal.scan_domain(email.split('@')[1])
+
+        return sources
+
+    async def search_person(self, name: str = None, email: str = None, username: str = None,
+                            domain: str = None) -> Dict:
         """
         Recherche OSINT complète sur une personne
 
+        Toutes les sources partent en même temps et sont collectées dans leur
+        ordre d'arrivée ; la recherche dure au plus self.deadline.
+
         Args:
             name: Nom complet (ex: "John Doe")
             email: Adresse email
@@ -266,54 +365,63 @@ class OSINTSearchEngine:
             "sources": {}
         }
 
-        tasks = []
-
-        # Préparer les tâches de recherche
-        with ThreadPoolExecutor(max_workers=5) as executor:
-
-            # 1. Hunter.io - Vérifier l'email si fourni
-            if email:
-                tasks.append(("hunter_verify", executor.submit(self.hunter.verify_email, email)))
-
-            # 2. Hunter.io - Chercher l'email depuis le nom + domaine
-            if name and domain:
-                name_parts = name.split()
-                first_name = name_parts[0] if len(name_parts) > 0 else None
-                last_name = name_parts[-1] if len(name_parts) > 1 else None
-                tasks.append(("hunter_find", executor.submit(self.hunter.find_email, domain, first_name, last_name)))
-
-            # 3. HIBP - Vérifier les fuites de données
-            if email:
-                tasks.append(("hibp", executor.submit(self.hibp.check_email, email)))
-
-            # 4. GitHub - Chercher l'utilisateur
-            if username:
-                tasks.append(("github", executor.submit(self.github.search_user, username)))
-            elif email:
-                # Essayer avec la partie avant @ comme username
-                possible_username = email.split('@')[0]
-                tasks.append(("github", executor.submit(self.github.search_user, possible_username)))
-
-            # 5. VirusTotal - Scanner le domaine
-            if domain:
-                tasks.append(("virustotal", executor.submit(self.virustotal.scan_domain, domain)))
-            elif email:
-                domain_from_email = email.split('@')[1]
-                tasks.append(("virustotal", executor.submit(self.virustotal.scan_domain, domain_from_email)))
-
-            # Collecter les résultats
-            for source, future in tasks:
-                try:
-                    result = future.result(timeout=15)
-                    if result and not result.get("error"):
-                        results["sources"][source] = result
-                    else:
-                        results["sources"][source] = {"status": "failed", "reason": result.get("error", "Unknown")}
-                except Exception as e:
-                    results["sources"][source] = {"status": "failed", "reason": str(e)}
-
+        sources = self._plan(name, email, username, domain)
+        tasks = {asyncio.ensure_future(coro): source for source, coro in sources.items()}
+        collected = {}
+
+        deadline = time.monotonic() + self.deadline
+        pending = set(tasks)
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                collected[tasks[task]] = self._source_result(task)
+
+        # Sources hors délai : annulées, la recherche ne les attend pas
+        for task in pending:
+            task.cancel()
+            collected[tasks[task]] = {"status": "failed", "reason": f"Deadline ({self.deadline:.0f}s) exceeded"}
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        # Ordre du plan (rapport stable d'un run à l'autre)
+        results["sources"] = {source: collected[source] for source in sources}
         return results
 
+    @staticmethod
+    def _source_result(task: asyncio.Task) -> Dict:
+        try:
+            result = task.result()
+        except Exception as e:
+            return {"status": "failed", "reason": str(e)}
+        if result and not result.get("error"):
+            return result
+        return {"status": "failed", "reason": (result or {}).get("error", "Unknown")}
+
+    async def search_people(self, people: List[Dict], max_concurrent: int = 10) -> List[Dict]:
+        """
+        Recherche une liste de personnes dans un seul event loop
+
+        Toutes les recherches partagent le pool HTTP (connexions réutilisées),
+        le cache et les quotas.
+
+        Args:
+            people: Cibles ({"name", "email", "username", "domain"})
+            max_concurrent: Personnes traitées en parallèle
+
+        Returns:
+            Liste de rapports (même ordre que people)
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def search(person: Dict) -> Dict:
+            async with semaphore:
+                return await self.search_person(**person)
+
+        return await asyncio.gather(*(search(person) for person in people))
+
 
 # ═══════════════════════════════════════════════════════════════
 # AFFICHAGE DES RÉSULTATS
@@ -471,13 +579,19 @@ def main():
     # Lancer la recherche
     engine = OSINTSearchEngine()
 
+    async def run() -> Dict:
+        try:
+            return await engine.search_person(
+                name=name,
+                email=email,
+                username=username,
+                domain=domain
+            )
+        finally:
+            await close_http_client()
+
     print("⏳ Interrogation des sources OSINT...")
-    results = engine.search_person(
-        name=name,
-        email=email,
-        username=username,
-        domain=domain
-    )
+    results = asyncio.run(run())
 
     # Afficher les résultats
     display_results(results)
@@ -485,6 +599,12 @@ def main():
     # Sauvegarder le rapport
     save_report(results)
 
+    # Statistiques du cache (chaque hit = une requête API économisée)
+    cache_stats = get_response_cache().get_stats()
+    saved = sum(s["hits"] + s["negative_hits"] for s in cache_stats.values())
+    if saved:
+        print(f"♻️  Cache: {saved} requête(s) API économisée(s)")
+
 
 if __name__ == "__main__":
     main()
@@ -7,11 +7,17 @@ Usage: python3 osint_social_search.py <username ou "Nom Complet">
 import os
 import sys
 import json
+import asyncio
 import subprocess
-import requests
+import aiohttp
 from datetime import datetime
-from typing import Dict, List
-from urllib.parse import quote_plus
+from typing import Dict, List, Optional
+from urllib.parse import quote_plus, urlparse
+
+# Runner de sous-process partagé avec les scrapers du backend
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+from scrapers.subprocess_runner import run_tool  # noqa: E402
+from scrapers.policy import get_policy  # noqa: E402
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -55,59 +61,158 @@ class SocialMediaSearcher:
         "Venmo": "https://venmo.com/{}",
     }
 
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+    def __init__(self, max_per_host: int = 4, max_connections: int = 100, timeout: float = None):
+        """
+        Args:
+            max_per_host: Requêtes simultanées max par plateforme
+            max_connections: Requêtes simultanées max au total
+            timeout: Timeout par requête (défaut : politique 'social')
+        """
+        self.max_per_host = max_per_host
+        self.max_connections = max_connections
+        self.timeout = timeout or get_policy('social').timeout
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        }
 
-    def check_url_exists(self, url: str) -> bool:
-        """Vérifie si une URL existe (code 200)"""
-        try:
-            response = self.session.head(url, timeout=5, allow_redirects=True)
-            # Codes valides : 200 (OK), 301/302 (redirect mais existe)
-            return response.status_code in [200, 301, 302]
-        except:
-            return False
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Pool de connexions partagé par toutes les recherches d'un même run"""
+        # Les files d'attente par plateforme sont gérées par _host_slot : le
+        # timeout ne compte pas l'attente d'une connexion libre du pool
+        self._host_slots = {}
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_per_host,
+            ttl_dns_cache=300
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=self.timeout, sock_read=self.timeout)
+        )
 
-    def search_username(self, username: str) -> Dict:
-        """
-        Cherche un username sur tous les réseaux sociaux
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).hostname or url
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.max_per_host)
+        return slot
 
-        Args:
-            username: Username à chercher
+    async def check_url_exists(self, session: aiohttp.ClientSession, url: str) -> Optional[bool]:
+        """
+        Vérifie si une URL existe (code 200)
 
         Returns:
-            Dict avec les profils trouvés
+            True/False, ou None si la plateforme n'a pas répondu (timeout,
+            erreur réseau) : ce n'est pas un « non trouvé »
         """
-        print(f"🔍 Recherche du username: {username}")
-        print(f"⏳ Test de {len(self.PLATFORMS)} plateformes...\n")
-
+        async with self._host_slot(url):
+            try:
+                async with session.head(url, allow_redirects=True) as response:
+                    # Codes valides : 200 (OK), 301/302 (redirect mais existe)
+                    return response.status in [200, 301, 302]
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                return None
+
+    async def _search_username(self, session: aiohttp.ClientSession, username: str, verbose: bool = True) -> Dict:
+        """Teste toutes les plateformes en parallèle pour un username"""
         results = {
             "username": username,
             "timestamp": datetime.now().isoformat(),
             "found": [],
-            "not_found": []
+            "not_found": [],
+            "errors": []
         }
 
-        for i, (platform, url_pattern) in enumerate(self.PLATFORMS.items(), 1):
-            url = url_pattern.format(username)
+        async def probe(platform: str, url: str):
+            return platform, url, await self.check_url_exists(session, url)
+
+        tasks = [
+            probe(platform, url_pattern.format(username))
+            for platform, url_pattern in self.PLATFORMS.items()
+        ]
+
+        found = {}
+        failed = set()
+        # Affichage au fil des réponses (ordre d'arrivée)
+        for i, task in enumerate(asyncio.as_completed(tasks), 1):
+            platform, url, exists = await task
 
-            print(f"[{i}/{len(self.PLATFORMS)}] {platform:20s} → ", end='', flush=True)
+            if verbose:
+                status = '⚠️  pas de réponse' if exists is None else '✅ TROUVÉ' if exists else '❌'
+                print(f"[{i}/{len(self.PLATFORMS)}] {platform:20s} → {status}")
 
-            if self.check_url_exists(url):
-                print(f"✅ TROUVÉ")
+            if exists:
+                found[platform] = url
+            elif exists is None:
+                failed.add(platform)
+
+        # Résultats dans l'ordre de PLATFORMS (rapport stable d'un run à l'autre)
+        for platform in self.PLATFORMS:
+            if platform in found:
                 results["found"].append({
                     "platform": platform,
-                    "url": url,
+                    "url": found[platform],
                     "username": username
                 })
+            elif platform in failed:
+                results["errors"].append(platform)
             else:
-                print(f"❌")
                 results["not_found"].append(platform)
 
         return results
 
+    def search_username(self, username: str) -> Dict:
+        """
+        Cherche un username sur tous les réseaux sociaux
+
+        Args:
+            username: Username à chercher
+
+        Returns:
+            Dict avec les profils trouvés
+        """
+        print(f"🔍 Recherche du username: {username}")
+        print(f"⏳ Test de {len(self.PLATFORMS)} plateformes...\n")
+
+        async def run():
+            async with self._create_session() as session:
+                return await self._search_username(session, username)
+
+        return asyncio.run(run())
+
+    async def search_usernames_async(self, usernames: List[str], max_concurrent_usernames: int = 50) -> List[Dict]:
+        """
+        Cherche une liste de usernames avec un seul pool de connexions
+
+        Args:
+            usernames: Usernames à chercher
+            max_concurrent_usernames: Usernames traités en parallèle
+
+        Returns:
+            Liste de résultats (même ordre que usernames)
+        """
+        semaphore = asyncio.Semaphore(max_concurrent_usernames)
+        done = 0
+
+        async with self._create_session() as session:
+
+            async def search(username: str) -> Dict:
+                nonlocal done
+                async with semaphore:
+                    result = await self._search_username(session, username, verbose=False)
+                done += 1
+                print(f"[{done}/{len(usernames)}] {username:30s} → {len(result['found'])} profil(s)")
+                return result
+
+            return await asyncio.gather(*(search(username) for username in usernames))
+
+    def search_usernames(self, usernames: List[str], max_concurrent_usernames: int = 50) -> List[Dict]:
+        """Version synchrone de search_usernames_async"""
+        print(f"🔍 Recherche de {len(usernames)} usernames sur {len(self.PLATFORMS)} plateformes")
+        return asyncio.run(self.search_usernames_async(usernames, max_concurrent_usernames))
+
 
 # ═══════════════════════════════════════════════════════════════
 # RECHERCHE AVEC SHERLOCK (si installé)
@@ -152,38 +257,57 @@ def run_sherlock(username: str) -> Dict:
     os.makedirs("sherlock_results", exist_ok=True)
     output_file = f"sherlock_results/{username}.txt"
 
+    found_profiles = []
+
+    def on_line(line: str):
+        # Affichage des profils dès que Sherlock les trouve
+        if line.startswith('[+]'):
+            found_profiles.append(line[3:].strip())
+            print(f"   ✅ {line[3:].strip()}")
+
     try:
-        # Lancer Sherlock
-        result = subprocess.run(
+        # Lancer Sherlock (tué proprement au bout de 2 minutes)
+        result = asyncio.run(run_tool(
             ['sherlock', username, '--output', output_file, '--timeout', '10'],
-            capture_output=True,
-            text=True,
-            timeout=120  # 2 minutes max
-        )
+            timeout=120,
+            on_line=on_line
+        ))
+
+        if result['timed_out']:
+            print("⏱️  Timeout - Sherlock a pris trop de temps")
+            if not found_profiles:
+                return None
+            print(f"🎯 {len(found_profiles)} profil(s) trouvé(s) avant le timeout\n")
+            return {
+                "status": "partial",
+                "output_file": None,
+                "profiles_found": len(found_profiles),
+                "profiles": found_profiles
+            }
 
-        if result.returncode == 0:
+        if result['returncode'] == 0:
             print(f"✅ Recherche Sherlock terminée!")
             print(f"📄 Résultats sauvegardés: {output_file}")
 
+            found_count = len(found_profiles)
+
             # Lire les résultats
             if os.path.exists(output_file):
                 with open(output_file, 'r') as f:
                     lines = f.readlines()
                     found_count = len([l for l in lines if l.strip() and not l.startswith('#')])
-                    print(f"🎯 {found_count} profil(s) trouvé(s) par Sherlock\n")
+            print(f"🎯 {found_count} profil(s) trouvé(s) par Sherlock\n")
 
             return {
                 "status": "success",
                 "output_file": output_file,
-                "profiles_found": found_count
+                "profiles_found": found_count,
+                "profiles": found_profiles
             }
         else:
-            print(f"❌ Erreur Sherlock: {result.stderr}")
+            print(f"❌ Erreur Sherlock: {result['stderr']}")
             return None
 
-    except subprocess.TimeoutExpired:
-        print("⏱️  Timeout - Sherlock a pris trop de temps")
-        return None
     except Exception as e:
         print(f"❌ Erreur: {e}")
         return None
@@ -254,11 +378,16 @@ def display_results(results: Dict, sherlock_results: Dict = None, dorks: List[st
     else:
         print(f"\n❌ Aucun profil trouvé avec ce username")
 
+    errors = results.get("errors", [])
+    if errors:
+        print(f"\n⚠️  Sans réponse (à revérifier) : {', '.join(errors)}")
+
     # Résultats Sherlock
-    if sherlock_results and sherlock_results.get("status") == "success":
+    if sherlock_results and sherlock_results.get("status") in ("success", "partial"):
         print(f"\n🔎 SHERLOCK:")
         print(f"   ✅ {sherlock_results.get('profiles_found', 0)} profils trouvés")
-        print(f"   📄 Rapport: {sherlock_results.get('output_file')}")
+        if sherlock_results.get("output_file"):
+            print(f"   📄 Rapport: {sherlock_results.get('output_file')}")
 
     # Google Dorks
     if dorks:
@@ -308,12 +437,30 @@ def main():
         print("❌ Usage:")
         print("   python3 osint_social_search.py <username>")
         print("   python3 osint_social_search.py \"Nom Complet\"")
+        print("   python3 osint_social_search.py --file usernames.txt")
         print("\n📌 Exemples:")
         print("   python3 osint_social_search.py johndoe")
         print("   python3 osint_social_search.py elonmusk")
         print('   python3 osint_social_search.py "Elon Musk"')
         sys.exit(1)
 
+    # Mode liste : un username par ligne, un seul pool de connexions
+    if sys.argv[1] == '--file' and len(sys.argv) > 2:
+        with open(sys.argv[2], 'r', encoding='utf-8') as f:
+            usernames = [line.strip() for line in f if line.strip()]
+
+        searcher = SocialMediaSearcher()
+        all_results = searcher.search_usernames(usernames)
+
+        filename = f"social_report_batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(all_results, f, indent=2, ensure_ascii=False)
+
+        total_found = sum(len(r["found"]) for r in all_results)
+        print(f"\n✅ {len(usernames)} usernames testés - {total_found} profil(s) trouvé(s)")
+        print(f"💾 Rapport sauvegardé: {filename}")
+        return
+
     query = sys.argv[1]
 
     # Déterminer si c'est un nom ou un username
@@ -5,6 +5,8 @@ Nécessite: pip install requests python-dotenv
 """
 
 import os
+import time
+import base64
 import requests
 from dotenv import load_dotenv
 from typing import Dict, Optional
@@ -170,12 +172,16 @@ class VirusTotalAPI:
         self.api_key = os.getenv("VIRUSTOTAL_API_KEY")
         self.base_url = "https://www.virustotal.com/api/v3"
 
-    def scan_url(self, url: str) -> Optional[Dict]:
+    def scan_url(self, url: str, timeout: float = 300) -> Optional[Dict]:
         """
         Scan une URL pour détecter du malware
 
+        Le rapport existant est utilisé s'il existe ; sinon l'URL est soumise
+        et l'analyse est relue avec un délai croissant jusqu'à sa fin.
+
         Args:
             url: URL à scanner
+            timeout: Attente max de l'analyse (secondes)
 
         Returns:
             Dict avec résultats du scan ou None
@@ -185,37 +191,57 @@ class VirusTotalAPI:
             return None
 
         headers = {"x-apikey": self.api_key}
-
-        # Soumettre l'URL
-        submit_url = f"{self.base_url}/urls"
-        data = {"url": url}
+        url_id = base64.urlsafe_b64encode(url.encode()).decode().rstrip("=")
 
         try:
-            response = requests.post(submit_url, headers=headers, data=data)
+            # Rapport existant : pas de nouvelle soumission
+            report_response = requests.get(f"{self.base_url}/urls/{url_id}", headers=headers)
+            if report_response.status_code == 200:
+                attributes = report_response.json()["data"]["attributes"]
+                if attributes.get("last_analysis_date"):
+                    return self._format(url, attributes["last_analysis_stats"])
+            elif report_response.status_code != 404:
+                report_response.raise_for_status()
+
+            # Soumettre l'URL
+            response = requests.post(f"{self.base_url}/urls", headers=headers, data={"url": url})
             response.raise_for_status()
 
-            # Récupérer les résultats
+            # Attendre la fin de l'analyse (backoff : 10s, 15s, 22s... max 60s)
             analysis_id = response.json()["data"]["id"]
             analysis_url = f"{self.base_url}/analyses/{analysis_id}"
+            deadline = time.monotonic() + timeout
+            delay = 10
 
-            analysis_response = requests.get(analysis_url, headers=headers)
-            analysis_response.raise_for_status()
+            while time.monotonic() < deadline:
+                time.sleep(min(delay, max(0, deadline - time.monotonic())))
 
-            stats = analysis_response.json()["data"]["attributes"]["stats"]
+                analysis_response = requests.get(analysis_url, headers=headers)
+                analysis_response.raise_for_status()
+                attributes = analysis_response.json()["data"]["attributes"]
 
-            return {
-                "url": url,
-                "malicious": stats.get("malicious", 0),
-                "suspicious": stats.get("suspicious", 0),
-                "harmless": stats.get("harmless", 0),
-                "undetected": stats.get("undetected", 0),
-                "is_safe": stats.get("malicious", 0) == 0
-            }
+                if attributes.get("status") == "completed":
+                    return self._format(url, attributes["stats"])
+                delay = min(delay * 1.5, 60)
+
+            print(f"⏱️  Analyse VirusTotal non terminée après {timeout}s")
+            return None
 
         except Exception as e:
             print(f"❌ Erreur VirusTotal: {e}")
             return None
 
+    @staticmethod
+    def _format(url: str, stats: Dict) -> Dict:
+        return {
+            "url": url,
+            "malicious": stats.get("malicious", 0),
+            "suspicious": stats.get("suspicious", 0),
+            "harmless": stats.get("harmless", 0),
+            "undetected": stats.get("undetected", 0),
+            "is_safe": stats.get("malicious", 0) == 0
+        }
+
 
 # ═══════════════════════════════════════════════════════════════
 # EXEMPLES D'UTILISATION